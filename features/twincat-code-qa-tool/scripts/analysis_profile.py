@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT QA 분석 프로파일러
+단계/파일별 wall·CPU 시간과 읽은 바이트, (선택) 규칙별 시간·호출 수와 정규식 호출 수를 모아 리포트 JSON 블록으로 출력
+규칙 호출 측정값으로 파일별 규칙 시간 예산(RuleBudget)도 적용
+"""
+
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter, process_time
+from typing import Callable, Dict, Iterator, List, Optional
+
+from rule_budget import RuleBudget
+
+# 리포트에 싣는 느린 파일 수
+TOP_FILES = 20
+
+# 시간 값 반올림 자릿수 (마이크로초)
+TIME_DIGITS = 6
+
+
+@dataclass
+class TimingStat:
+    """단계/파일 하나의 측정값"""
+    wall: float = 0.0
+    cpu: float = 0.0
+    bytes: int = 0
+    regex_calls: int = 0
+
+
+@dataclass
+class RuleStat:
+    """QA 규칙 하나의 누적 측정값 (라인 단위로 수만 번 호출되므로 wall 시간만 잼)"""
+    wall: float = 0.0
+    calls: int = 0
+    regex_calls: int = 0
+
+
+class CountingRegex:
+    """re 모듈 함수 대리자 - 누적 호출 수만 셈 (구간별 호출 수는 측정 전후 차이로 계산)"""
+
+    __slots__ = ('calls',)
+
+    def __init__(self):
+        self.calls = 0
+
+    def search(self, pattern, string, flags=0):
+        self.calls += 1
+        return re.search(pattern, string, flags)
+
+    def match(self, pattern, string, flags=0):
+        self.calls += 1
+        return re.match(pattern, string, flags)
+
+    def findall(self, pattern, string, flags=0):
+        self.calls += 1
+        return re.findall(pattern, string, flags)
+
+    def sub(self, pattern, repl, string, count=0, flags=0):
+        self.calls += 1
+        return re.sub(pattern, repl, string, count=count, flags=flags)
+
+
+def _call(rule_id: str, func: Callable, *args):
+    """규칙 측정/예산이 모두 없는 경우의 timed() - 그대로 호출"""
+    return func(*args)
+
+
+class AnalysisProfiler:
+    """분석 한 번의 프로파일
+
+    phase()/file() 는 항상 측정합니다 (파일당 한 번이라 부담 없음).
+    규칙 검사는 timed() 로 감싸 호출하고 정규식은 self.regex 로 호출하는데, 라인마다 호출되므로
+    규칙별 통계는 rules=True 일 때만 모읍니다 (끄면 timed() 는 그대로 호출, regex 는 re 모듈 그대로).
+    budget 을 주면 timed_budget() 이 호출 시간을 예산에 누적하고, 예산을 넘긴 규칙은 현재 파일에서 None 을 돌려줍니다.
+    라인 규칙은 RuleBudget.uses_budget() 이 참인 라인에서만 timed_budget() 으로 호출합니다.
+    """
+
+    def __init__(self, rules: bool = False, budget: Optional[RuleBudget] = None):
+        self.rules_enabled = rules
+        self.budget = budget
+        self.phases: Dict[str, TimingStat] = {}
+        self.files: Dict[str, TimingStat] = {}
+        self.rules: Dict[str, RuleStat] = {}
+        self.bytes_read = 0
+        self._counter: Optional[CountingRegex] = CountingRegex() if rules else None
+        self.regex = self._counter or re
+        if not rules:
+            self.timed = _call
+        # 규칙 측정 중에는 timed() 가 예산도 함께 누적
+        self.timed_budget = self.timed if rules else self._timed_budget if budget else _call
+
+    @property
+    def regex_calls(self) -> int:
+        return self._counter.calls if self._counter else 0
+
+    @contextmanager
+    def _measure(self, stat: TimingStat) -> Iterator[TimingStat]:
+        regex = self.regex_calls
+        wall, cpu = perf_counter(), process_time()
+        try:
+            yield stat
+        finally:
+            stat.wall += perf_counter() - wall
+            stat.cpu += process_time() - cpu
+            stat.regex_calls += self.regex_calls - regex
+
+    def phase(self, name: str):
+        """분석 단계 측정 (collect, files, global, report)"""
+        return self._measure(self.phases.setdefault(name, TimingStat()))
+
+    def file(self, path: str, size: int = 0):
+        """파일 하나의 분석 측정 (size: 읽은 바이트)"""
+        stat = self.files.setdefault(path, TimingStat())
+        stat.bytes += size
+        self.bytes_read += size
+        if self.budget:
+            self.budget.start_file(path)
+        return self._measure(stat)
+
+    def timed(self, rule_id: str, func: Callable, *args):
+        """규칙 검사 함수 호출 → 결과 (시간/호출 수/정규식 호출 수를 rule_id 에 누적)"""
+        budget = self.budget
+        if budget and rule_id in budget.exhausted:
+            return None
+        stat = self.rules.get(rule_id)
+        if stat is None:
+            stat = self.rules[rule_id] = RuleStat()
+        counter = self._counter
+        calls = counter.calls
+        started = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = perf_counter() - started
+            stat.wall += elapsed
+            stat.calls += 1
+            stat.regex_calls += counter.calls - calls
+            if budget:
+                budget.charge(rule_id, elapsed)
+
+    def _timed_budget(self, rule_id: str, func: Callable, *args):
+        """규칙별 통계 없이 예산만 적용하는 timed() (규칙 측정을 끈 경우의 timed_budget)"""
+        budget = self.budget
+        if rule_id in budget.exhausted:
+            return None
+        started = perf_counter()
+        try:
+            return func(*args)
+        finally:
+            budget.charge(rule_id, perf_counter() - started)
+
+    @contextmanager
+    def rule(self, rule_id: str) -> Iterator[None]:
+        """파일 단위 규칙처럼 함수로 빼기 어려운 검사 구간 측정"""
+        if not self.rules_enabled:
+            yield
+            return
+        stat = self.rules.setdefault(rule_id, RuleStat())
+        calls = self.regex_calls
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            stat.wall += perf_counter() - started
+            stat.calls += 1
+            stat.regex_calls += self.regex_calls - calls
+
+    def to_dict(self, top_files: int = TOP_FILES) -> Dict:
+        """리포트 profile 블록 (규칙/파일은 느린 순, 규칙 측정을 끄면 rules 는 빈 dict)"""
+        slowest = sorted(self.files.items(), key=lambda item: item[1].wall, reverse=True)[:top_files]
+        return {
+            "phases": {
+                name: {"wall_s": round(stat.wall, TIME_DIGITS), "cpu_s": round(stat.cpu, TIME_DIGITS),
+                       "regex_calls": stat.regex_calls}
+                for name, stat in self.phases.items()
+            },
+            "rules": {
+                rule_id: {"wall_s": round(stat.wall, TIME_DIGITS), "calls": stat.calls,
+                          "regex_calls": stat.regex_calls}
+                for rule_id, stat in sorted(self.rules.items(), key=lambda item: item[1].wall, reverse=True)
+            },
+            "slowest_files": [
+                {"path": path, "wall_s": round(stat.wall, TIME_DIGITS), "cpu_s": round(stat.cpu, TIME_DIGITS),
+                 "bytes": stat.bytes, "regex_calls": stat.regex_calls}
+                for path, stat in slowest
+            ],
+            "totals": {
+                "wall_s": round(sum(stat.wall for stat in self.phases.values()), TIME_DIGITS),
+                "cpu_s": round(sum(stat.cpu for stat in self.phases.values()), TIME_DIGITS),
+                "files": len(self.files),
+                "bytes_read": self.bytes_read,
+                "regex_calls": self.regex_calls,
+                "rules_profiled": self.rules_enabled,
+            },
+        }
+
+
+def format_profile(profile: Dict, top: int = 10) -> List[str]:
+    """profile 블록 → 콘솔 요약 라인"""
+    totals = profile['totals']
+    lines = [f"총 {totals['wall_s']:.3f}s (CPU {totals['cpu_s']:.3f}s), 파일 {totals['files']}개, "
+             f"{totals['bytes_read']:,} bytes"
+             + (f", 정규식 {totals['regex_calls']:,}회" if totals.get('rules_profiled') else "")]
+    lines += [f"  단계 {name}: {stat['wall_s']:.3f}s (CPU {stat['cpu_s']:.3f}s)"
+              for name, stat in profile['phases'].items()]
+    lines += [f"  규칙 {rule_id}: {stat['wall_s']:.3f}s / {stat['calls']:,}회 (정규식 {stat['regex_calls']:,}회)"
+              for rule_id, stat in list(profile['rules'].items())[:top]]
+    lines += [f"  파일 {item['path']}: {item['wall_s']:.3f}s ({item['bytes']:,} bytes)"
+              for item in profile['slowest_files'][:top]]
+    return lines
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT 배치 비교 분석 스크립트
+하나의 Source(골든 프로젝트)를 한 번만 인덱싱하여 여러 Target(장비별 변형)과 병렬 비교
+"""
+
+import io
+import sys
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime
+
+from analyze_real_project import TwinCATQAAnalyzer
+from project_index import ProjectIndex
+
+# 워커 프로세스별 Source 인덱스 (initializer 로 한 번만 전달)
+_SOURCE_INDEX: Optional[ProjectIndex] = None
+
+
+def _init_worker(source_index: ProjectIndex):
+    global _SOURCE_INDEX
+    _SOURCE_INDEX = source_index
+
+
+def _compare_variant(name: str, target_path: str) -> Tuple[str, Dict]:
+    """워커: 공유 Source 인덱스와 Target 하나 비교 (개별 진행 출력은 숨김)"""
+    with redirect_stdout(io.StringIO()):
+        analyzer = TwinCATQAAnalyzer(str(_SOURCE_INDEX.root), target_path, old_index=_SOURCE_INDEX)
+        report = analyzer.analyze()
+    return name, report
+
+
+def variant_names(target_paths: List[str]) -> List[str]:
+    """Target 경로 → 변형 이름 ('PM1=경로' 형식 또는 폴더명, 중복 시 번호 부여)"""
+    names = []
+    seen: Counter = Counter()
+    for target in target_paths:
+        name = target.split('=', 1)[0] if '=' in target else Path(target).name
+        seen[name] += 1
+        names.append(name if seen[name] == 1 else f"{name}#{seen[name]}")
+    return names
+
+
+class TwinCATBatchComparer:
+    """TwinCAT 배치 비교 분석기 (Source 1개 : Target N개)"""
+
+    def __init__(self, source_path: str, target_paths: List[str], max_workers: Optional[int] = None):
+        self.source_path = Path(source_path)
+        self.names = variant_names(target_paths)
+        self.targets = {
+            name: target.split('=', 1)[1] if '=' in target else target
+            for name, target in zip(self.names, target_paths)
+        }
+        self.max_workers = max_workers
+        self.source_index = ProjectIndex(source_path)
+        self.reports: Dict[str, Dict] = {}
+
+    def analyze(self) -> Dict:
+        """전체 분석 실행"""
+        print(f"[배치 분석 시작] {datetime.now()}")
+        print(f"  Source: {self.source_path}")
+        print(f"  Target: {len(self.targets)}개 ({', '.join(self.names)})")
+        print()
+
+        # 1. Source 한 번만 인덱싱 (해시, 섹션, 변수 테이블)
+        print("[1/3] Source 인덱싱 중...")
+        self.source_index.build()
+        for indexed in self.source_index.files.values():
+            indexed.variables  # 워커에 전달하기 전에 변수 테이블 파싱
+        print(f"  - 파일: {len(self.source_index.files)}개")
+        print()
+
+        # 2. Target 별 병렬 비교
+        print("[2/3] Target 병렬 비교 중...")
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(self.source_index,)) as pool:
+            futures = [pool.submit(_compare_variant, name, path) for name, path in self.targets.items()]
+            for future in futures:
+                name, report = future.result()
+                self.reports[name] = report
+                s = report['summary']
+                print(f"  - {name}: 파일 변경 {s['total_files_changed']}개, QA 이슈 {s['total_qa_issues']}개")
+        print()
+
+        # 3. 매트릭스 리포트
+        return self._generate_report()
+
+    def _generate_report(self) -> Dict:
+        """변형별 차이 매트릭스 리포트 생성"""
+        print("[3/3] 매트릭스 리포트 생성 중...")
+
+        cells: Dict[str, Dict[str, Dict]] = {}
+        for name in self.names:
+            report = self.reports[name]
+            var_counts = Counter(vc['file'] for vc in report['variable_changes'])
+            issue_counts = Counter(issue['file'] for issue in report['qa_issues'])
+            for fc in report['file_changes']:
+                cells.setdefault(fc['path'], {})[name] = {
+                    "type": fc['type'],
+                    "old_path": fc['old_path'],
+                    "variables": var_counts.get(fc['path'], 0),
+                    "issues": issue_counts.get(fc['path'], 0)
+                }
+
+        # 여러 변형에서 갈라진 파일부터
+        matrix = [
+            {"path": path, "divergent_variants": len(row), "cells": row}
+            for path, row in sorted(cells.items(), key=lambda x: (-len(x[1]), x[0]))
+        ]
+
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "source_folder": str(self.source_path),
+            "variants": self.names,
+            "target_folders": self.targets,
+            "summary": {
+                "total_variants": len(self.names),
+                "total_source_files": len(self.source_index.files),
+                "divergent_files": len(matrix),
+                "common_divergent_files": len([row for row in matrix if row['divergent_variants'] == len(self.names)]),
+                "by_variant": {name: self.reports[name]['summary'] for name in self.names},
+            },
+            "matrix": matrix
+        }
+
+
+def generate_markdown_report(report: Dict) -> str:
+    """배치 비교 Markdown 리포트 (변형 x 파일 매트릭스)"""
+    names = report['variants']
+    md = []
+    md.append("# TwinCAT Batch Compare Report")
+    md.append("")
+    md.append(f"**분석 일시**: {report['generated_at']}")
+    md.append(f"**Source**: `{report['source_folder']}`")
+    md.append(f"**Target**: {len(names)}개")
+    md.append("")
+
+    s = report['summary']
+    md.append("## 📊 변형별 요약")
+    md.append("")
+    md.append("| 변형 | 파일 변경 | 추가 | 삭제 | 수정 | 이동 | 변수 변경 | QA 이슈 | 🔴 Critical |")
+    md.append("|------|-----------|------|------|------|------|-----------|---------|-------------|")
+    for name in names:
+        v = s['by_variant'][name]
+        md.append(f"| {name} | {v['total_files_changed']} | {v['files_added']} | {v['files_deleted']} | "
+                  f"{v['files_modified']} | {v.get('files_renamed', 0)} | {v['total_variable_changes']} | "
+                  f"{v['total_qa_issues']} | {v['critical_issues']} |")
+    md.append("")
+
+    md.append("## 🗺️ 차이 매트릭스")
+    md.append("")
+    md.append(f"갈라진 파일 {s['divergent_files']}개 (모든 변형 공통: {s['common_divergent_files']}개)")
+    md.append("")
+    md.append("범례: ➕ 추가, ➖ 삭제, 📝 수정, 🔀 이동, · 동일 (괄호: QA 이슈 수)")
+    md.append("")
+    md.append("| 파일 | " + " | ".join(names) + " |")
+    md.append("|------|" + "|".join("---" for _ in names) + "|")
+    icons = {"Added": "➕", "Deleted": "➖", "Modified": "📝", "Renamed": "🔀"}
+    for row in report['matrix']:
+        cells = []
+        for name in names:
+            cell = row['cells'].get(name)
+            if not cell:
+                cells.append("·")
+            else:
+                icon = icons.get(cell['type'], "?")
+                cells.append(f"{icon} ({cell['issues']})" if cell['issues'] else icon)
+        md.append(f"| `{row['path']}` | " + " | ".join(cells) + " |")
+    md.append("")
+
+    return '\n'.join(md)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("사용법: python analyze_batch.py <source> <target|이름=target> [<target> ...]")
+        sys.exit(1)
+
+    comparer = TwinCATBatchComparer(sys.argv[1], sys.argv[2:])
+    report = comparer.analyze()
+
+    output_dir = Path(__file__).parent.parent / "output"
+    output_dir.mkdir(exist_ok=True)
+
+    json_path = output_dir / "batch_compare_report.json"
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"JSON 리포트 저장: {json_path}")
+
+    md_path = output_dir / "batch_compare_report.md"
+    with open(md_path, 'w', encoding='utf-8') as f:
+        f.write(generate_markdown_report(report))
+    print(f"Markdown 리포트 저장: {md_path}")
+
+    print("\n" + "="*60)
+    print("분석 완료!")
+    print("="*60)
+    print(f"변형 {report['summary']['total_variants']}개, 갈라진 파일 {report['summary']['divergent_files']}개")
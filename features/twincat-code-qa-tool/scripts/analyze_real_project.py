@@ -7,14 +7,21 @@ TwinCAT 프로젝트 QA 분석 스크립트
 
 import os
 import re
-import hashlib
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Set, FrozenSet, Iterable
 from datetime import datetime
 import json
 
+from analysis_profile import AnalysisProfiler
+from pou_units import unit_at
+from project_index import IndexedFile, ProjectIndex, build_indexes
+from rule_budget import RuleBudget, skipped_checks_markdown
+from source_encoding import decode_source
+from st_declaration import VariableDecl, VariableTable, diff_variable_tables
+from st_similarity import normalize_tokens, pair_renames, shingles
+
 @dataclass
 class QAIssue:
     """QA 이슈"""
@@ -25,14 +32,19 @@ class QAIssue:
     message: str
     code_snippet: str = ""
     suggestion: str = ""
+    unit: str = ""  # Method/Action/Property/Transition 이름 (본문이면 빈 값)
+    unit_line: int = 0  # 단위 안에서의 라인
+    side: str = ""  # 3-way 충돌 구간 이슈가 나온 쪽 (Ours/Theirs)
 
 @dataclass
 class FileChange:
     """파일 변경 정보"""
     file_path: str
-    change_type: str  # Added, Deleted, Modified
+    change_type: str  # Added, Deleted, Modified, Renamed
     old_size: int = 0
     new_size: int = 0
+    old_path: str = ""  # Renamed: 이전 경로
+    similarity: float = 0.0  # Renamed: 내용 유사도 (1.0 = 동일)
     changes: List[str] = field(default_factory=list)
 
 @dataclass
@@ -40,21 +52,52 @@ class VariableChange:
     """변수 변경 정보"""
     file_path: str
     var_name: str
-    change_type: str  # Added, Deleted, TypeChanged, InitialValueChanged
+    change_type: str  # Added, Deleted, Renamed, TypeChanged, InitialValueChanged, ScopeChanged, AddressChanged
+    scope: str = ""  # VAR, VAR_INPUT, VAR_GLOBAL ...
+    old_name: str = ""  # Renamed: 이전 변수명
     old_type: str = ""
     new_type: str = ""
     old_value: str = ""
     new_value: str = ""
 
+@dataclass
+class RenameContext:
+    """변수 이름 변경 감지용 파일 문맥 (파일당 한 번 구성)"""
+    order: List[VariableDecl]  # 선언 순서
+    positions: Dict[int, int]  # id(선언) → 선언 순서 인덱스
+    tokens: List[str]  # 정규화된 ST 토큰
+    occurrences: Dict[str, List[int]]  # 후보 변수명 → ST 토큰 위치
+
+    @classmethod
+    def build(cls, variables: VariableTable, st_code: str, candidates: List[VariableDecl]) -> 'RenameContext':
+        """선언 위치 맵과 후보 변수명의 토큰 위치를 한 번의 순회로 수집"""
+        order = list(variables.values())
+        tokens = normalize_tokens(st_code)
+        occurrences: Dict[str, List[int]] = {v.name.upper(): [] for v in candidates}
+        for i, tok in enumerate(tokens):
+            found = occurrences.get(tok)
+            if found is not None:
+                found.append(i)
+        return cls(order, {id(decl): i for i, decl in enumerate(order)}, tokens, occurrences)
+
 class TwinCATQAAnalyzer:
     """TwinCAT 프로젝트 QA 분석기"""
 
-    def __init__(self, old_path: str, new_path: str):
+    def __init__(self, old_path: str, new_path: str,
+                 old_index: Optional[ProjectIndex] = None, new_index: Optional[ProjectIndex] = None,
+                 budget: Optional[RuleBudget] = None):
         self.old_path = Path(old_path)
         self.new_path = Path(new_path)
+        # 미리 만든 인덱스를 넘기면 재스캔/재해시 없이 재사용
+        self.old_index = old_index or ProjectIndex(old_path)
+        self.new_index = new_index or ProjectIndex(new_path)
         self.file_changes: List[FileChange] = []
         self.variable_changes: List[VariableChange] = []
         self.qa_issues: List[QAIssue] = []
+        # 파일별 규칙 시간 예산 + 라인 길이 제한 (넘으면 건너뛰고 skipped_checks 에 기록)
+        self.budget = budget or RuleBudget()
+        # 단계별 시간 (비교 분석은 규칙별 측정 없음)
+        self.profiler = AnalysisProfiler(budget=self.budget)
 
     def analyze(self) -> Dict:
         """전체 분석 실행"""
@@ -63,122 +106,275 @@ class TwinCATQAAnalyzer:
         print(f"  새 버전: {self.new_path}")
         print()
 
+        profiler = self.profiler
+
+        # 0. 두 트리 인덱싱 (한 번 읽기로 해시 + 섹션 추출)
+        with profiler.phase('index'):
+            pending = [index for index in (self.old_index, self.new_index) if not index.built]
+            if pending:
+                build_indexes(pending)
+
         # 1. 파일 변경 감지
-        self._detect_file_changes()
+        with profiler.phase('changes'):
+            self._detect_file_changes()
 
         # 2. 변수 변경 분석
-        self._analyze_variable_changes()
+        with profiler.phase('variables'):
+            self._analyze_variable_changes()
 
         # 3. QA 규칙 적용
-        self._apply_qa_rules()
+        with profiler.phase('rules'):
+            self._apply_qa_rules()
 
         # 4. 결과 반환
-        return self._generate_report()
+        with profiler.phase('report'):
+            report = self._generate_report()
+        report["profile"] = profiler.to_dict()
+        return report
 
     def _detect_file_changes(self):
         """파일 변경 감지"""
         print("[1/4] 파일 변경 감지 중...")
 
-        extensions = {'.TcPOU', '.TcGVL', '.TcDUT', '.plcproj'}
-        old_files = self._get_files(self.old_path, extensions)
-        new_files = self._get_files(self.new_path, extensions)
+        old_rel = self.old_index.files
+        new_rel = self.new_index.files
+
+        added = set(new_rel.keys()) - set(old_rel.keys())
+        deleted = set(old_rel.keys()) - set(new_rel.keys())
 
-        old_rel = {self._relative_path(f, self.old_path): f for f in old_files}
-        new_rel = {self._relative_path(f, self.new_path): f for f in new_files}
+        # 이동/이름 변경된 파일 (추가+삭제 쌍)
+        for old_rel_path, new_rel_path, similarity in self._detect_file_renames(old_rel, new_rel, deleted, added):
+            added.discard(new_rel_path)
+            deleted.discard(old_rel_path)
+            self.file_changes.append(FileChange(
+                file_path=new_rel_path,
+                change_type="Renamed",
+                old_size=old_rel[old_rel_path].size,
+                new_size=new_rel[new_rel_path].size,
+                old_path=old_rel_path,
+                similarity=round(similarity, 3)
+            ))
 
         # 추가된 파일
-        for rel_path in set(new_rel.keys()) - set(old_rel.keys()):
+        for rel_path in added:
             self.file_changes.append(FileChange(
                 file_path=rel_path,
                 change_type="Added",
-                new_size=new_rel[rel_path].stat().st_size
+                new_size=new_rel[rel_path].size
             ))
 
         # 삭제된 파일
-        for rel_path in set(old_rel.keys()) - set(new_rel.keys()):
+        for rel_path in deleted:
             self.file_changes.append(FileChange(
                 file_path=rel_path,
                 change_type="Deleted",
-                old_size=old_rel[rel_path].stat().st_size
+                old_size=old_rel[rel_path].size
             ))
 
         # 수정된 파일
         for rel_path in set(old_rel.keys()) & set(new_rel.keys()):
-            old_hash = self._file_hash(old_rel[rel_path])
-            new_hash = self._file_hash(new_rel[rel_path])
-            if old_hash != new_hash:
+            if old_rel[rel_path].digest != new_rel[rel_path].digest:
                 self.file_changes.append(FileChange(
                     file_path=rel_path,
                     change_type="Modified",
-                    old_size=old_rel[rel_path].stat().st_size,
-                    new_size=new_rel[rel_path].stat().st_size
+                    old_size=old_rel[rel_path].size,
+                    new_size=new_rel[rel_path].size
                 ))
 
         print(f"  - 추가: {len([f for f in self.file_changes if f.change_type == 'Added'])}개")
         print(f"  - 삭제: {len([f for f in self.file_changes if f.change_type == 'Deleted'])}개")
         print(f"  - 수정: {len([f for f in self.file_changes if f.change_type == 'Modified'])}개")
+        print(f"  - 이동/이름 변경: {len([f for f in self.file_changes if f.change_type == 'Renamed'])}개")
         print()
 
+    def _detect_file_renames(self, old_rel: Dict[str, IndexedFile], new_rel: Dict[str, IndexedFile],
+                             deleted: Set[str], added: Set[str]) -> List[Tuple[str, str, float]]:
+        """삭제/추가 파일 쌍에서 이동·이름 변경 감지 (동일 해시 → MinHash/LSH 유사도)"""
+        renames: List[Tuple[str, str, float]] = []
+        if not deleted or not added:
+            return renames
+
+        # 1) 내용이 동일한 단순 이동
+        deleted_by_hash: Dict[str, List[str]] = {}
+        for rel_path in sorted(deleted):
+            deleted_by_hash.setdefault(old_rel[rel_path].digest, []).append(rel_path)
+        remaining_added = []
+        for rel_path in sorted(added):
+            candidates = deleted_by_hash.get(new_rel[rel_path].digest)
+            if candidates:
+                renames.append((candidates.pop(0), rel_path, 1.0))
+            else:
+                remaining_added.append(rel_path)
+        paired_old = {old for old, _, _ in renames}
+        remaining_deleted = [p for p in sorted(deleted) if p not in paired_old]
+
+        # 2) 정규화된 섹션 유사도 (확장자가 같은 파일끼리만)
+        for ext in {Path(p).suffix for p in remaining_added}:
+            old_sets = {p: self._content_shingles(old_rel[p]) for p in remaining_deleted if Path(p).suffix == ext}
+            new_sets = {p: self._content_shingles(new_rel[p]) for p in remaining_added if Path(p).suffix == ext}
+            renames.extend(pair_renames(old_sets, new_sets))
+
+        return renames
+
+    def _content_shingles(self, indexed: IndexedFile) -> FrozenSet[int]:
+        """파일의 선언부+구현부 정규화 shingle 집합 (섹션이 없는 .plcproj 는 전체 내용)"""
+        code = indexed.declaration + '\n' + indexed.st_code
+        if not code.strip():
+            code = decode_source(indexed.path.read_bytes(), indexed.encoding)[0]
+        return shingles(normalize_tokens(code))
+
     def _analyze_variable_changes(self):
         """변수 변경 분석"""
         print("[2/4] 변수 변경 분석 중...")
 
         for fc in self.file_changes:
-            if fc.change_type == "Modified":
-                old_file = self.old_path / fc.file_path
-                new_file = self.new_path / fc.file_path
-
-                old_vars = self._extract_variables(old_file)
-                new_vars = self._extract_variables(new_file)
-
-                # 추가된 변수
-                for var_name in set(new_vars.keys()) - set(old_vars.keys()):
-                    self.variable_changes.append(VariableChange(
-                        file_path=fc.file_path,
-                        var_name=var_name,
-                        change_type="Added",
-                        new_type=new_vars[var_name].get('type', ''),
-                        new_value=new_vars[var_name].get('value', '')
-                    ))
-
-                # 삭제된 변수
-                for var_name in set(old_vars.keys()) - set(new_vars.keys()):
+            if fc.change_type in ("Modified", "Renamed"):
+                old_file = self.old_index.files[fc.old_path or fc.file_path]
+                new_file = self.new_index.files[fc.file_path]
+                old_vars, old_st = old_file.variables, old_file.st_code
+                new_vars, new_st = new_file.variables, new_file.st_code
+
+                # 변수 테이블 키 병합 (추가/삭제/변경을 한 번에)
+                added_vars: List[VariableDecl] = []
+                deleted_vars: List[VariableDecl] = []
+                for _, old_var, new_var in diff_variable_tables(old_vars, new_vars):
+                    if old_var is None:
+                        added_vars.append(new_var)
+                    elif new_var is None:
+                        deleted_vars.append(old_var)
+                    else:
+                        change = self._classify_variable_change(fc.file_path, old_var, new_var)
+                        if change:
+                            self.variable_changes.append(change)
+
+                # 이름 변경된 변수 (추가+삭제 쌍)
+                renamed = self._detect_variable_renames(old_vars, old_st, deleted_vars,
+                                                        new_vars, new_st, added_vars)
+                for old_var, new_var in renamed:
                     self.variable_changes.append(VariableChange(
                         file_path=fc.file_path,
-                        var_name=var_name,
-                        change_type="Deleted",
-                        old_type=old_vars[var_name].get('type', ''),
-                        old_value=old_vars[var_name].get('value', '')
+                        var_name=new_var.name,
+                        change_type="Renamed",
+                        scope=new_var.scope,
+                        old_name=old_var.name,
+                        old_type=old_var.var_type,
+                        new_type=new_var.var_type,
+                        old_value=old_var.initial_value,
+                        new_value=new_var.initial_value
                     ))
+                renamed_old = {id(old_var) for old_var, _ in renamed}
+                renamed_new = {id(new_var) for _, new_var in renamed}
 
-                # 변경된 변수
-                for var_name in set(old_vars.keys()) & set(new_vars.keys()):
-                    old_var = old_vars[var_name]
-                    new_var = new_vars[var_name]
-
-                    if old_var.get('type') != new_var.get('type'):
-                        self.variable_changes.append(VariableChange(
-                            file_path=fc.file_path,
-                            var_name=var_name,
-                            change_type="TypeChanged",
-                            old_type=old_var.get('type', ''),
-                            new_type=new_var.get('type', '')
-                        ))
-                    elif old_var.get('value') != new_var.get('value'):
-                        self.variable_changes.append(VariableChange(
-                            file_path=fc.file_path,
-                            var_name=var_name,
-                            change_type="InitialValueChanged",
-                            old_value=old_var.get('value', ''),
-                            new_value=new_var.get('value', '')
-                        ))
+                for old_var in deleted_vars:
+                    if id(old_var) not in renamed_old:
+                        self.variable_changes.append(self._classify_variable_change(fc.file_path, old_var, None))
+                for new_var in added_vars:
+                    if id(new_var) not in renamed_new:
+                        self.variable_changes.append(self._classify_variable_change(fc.file_path, None, new_var))
 
         print(f"  - 변수 추가: {len([v for v in self.variable_changes if v.change_type == 'Added'])}개")
         print(f"  - 변수 삭제: {len([v for v in self.variable_changes if v.change_type == 'Deleted'])}개")
+        print(f"  - 변수 이름 변경: {len([v for v in self.variable_changes if v.change_type == 'Renamed'])}개")
         print(f"  - 타입 변경: {len([v for v in self.variable_changes if v.change_type == 'TypeChanged'])}개")
         print(f"  - 초기값 변경: {len([v for v in self.variable_changes if v.change_type == 'InitialValueChanged'])}개")
+        print(f"  - 스코프/주소 변경: {len([v for v in self.variable_changes if v.change_type in ('ScopeChanged', 'AddressChanged')])}개")
         print()
 
+    def _classify_variable_change(self, file_path: str, old_var: Optional[VariableDecl],
+                                  new_var: Optional[VariableDecl]) -> Optional[VariableChange]:
+        """변수 선언 쌍 → 변경 정보"""
+        if old_var is None:
+            return VariableChange(
+                file_path=file_path,
+                var_name=new_var.name,
+                change_type="Added",
+                scope=new_var.scope,
+                new_type=new_var.var_type,
+                new_value=new_var.initial_value
+            )
+        if new_var is None:
+            return VariableChange(
+                file_path=file_path,
+                var_name=old_var.name,
+                change_type="Deleted",
+                scope=old_var.scope,
+                old_type=old_var.var_type,
+                old_value=old_var.initial_value
+            )
+        if old_var.var_type != new_var.var_type:
+            return VariableChange(
+                file_path=file_path,
+                var_name=new_var.name,
+                change_type="TypeChanged",
+                scope=new_var.scope,
+                old_type=old_var.var_type,
+                new_type=new_var.var_type
+            )
+        if old_var.initial_value != new_var.initial_value:
+            return VariableChange(
+                file_path=file_path,
+                var_name=new_var.name,
+                change_type="InitialValueChanged",
+                scope=new_var.scope,
+                old_value=old_var.initial_value,
+                new_value=new_var.initial_value
+            )
+        if old_var.scope != new_var.scope:
+            return VariableChange(
+                file_path=file_path,
+                var_name=new_var.name,
+                change_type="ScopeChanged",
+                scope=new_var.scope,
+                old_value=old_var.scope,
+                new_value=new_var.scope
+            )
+        if old_var.address != new_var.address:
+            return VariableChange(
+                file_path=file_path,
+                var_name=new_var.name,
+                change_type="AddressChanged",
+                scope=new_var.scope,
+                old_value=old_var.address,
+                new_value=new_var.address
+            )
+        return None
+
+    def _detect_variable_renames(self, old_vars: VariableTable, old_st: str, deleted_vars: List[VariableDecl],
+                                 new_vars: VariableTable, new_st: str,
+                                 added_vars: List[VariableDecl]) -> List[Tuple[VariableDecl, VariableDecl]]:
+        """삭제/추가 변수 쌍에서 이름 변경 감지 (같은 타입끼리, 선언 위치와 사용 문맥 유사도)"""
+        if not deleted_vars or not added_vars:
+            return []
+
+        old_context = RenameContext.build(old_vars, old_st, deleted_vars)
+        new_context = RenameContext.build(new_vars, new_st, added_vars)
+
+        pairs: List[Tuple[VariableDecl, VariableDecl]] = []
+        for var_type in sorted({v.var_type.upper() for v in added_vars}):
+            # 변수 테이블 안에서 고유한 대문자 이름을 키로 사용 (동점 매칭 순서가 실행마다 같도록)
+            old_by_name = {v.name.upper(): v for v in deleted_vars if v.var_type.upper() == var_type}
+            new_by_name = {v.name.upper(): v for v in added_vars if v.var_type.upper() == var_type}
+            old_sets = {name: self._variable_shingles(v, old_context) for name, v in old_by_name.items()}
+            new_sets = {name: self._variable_shingles(v, new_context) for name, v in new_by_name.items()}
+            for old_name, new_name, _ in pair_renames(old_sets, new_sets):
+                pairs.append((old_by_name[old_name], new_by_name[new_name]))
+        return pairs
+
+    def _variable_shingles(self, decl: VariableDecl, context: RenameContext) -> FrozenSet[int]:
+        """변수명을 치환한 선언 위치 + 사용 문맥 shingle 집합 (위치는 미리 구한 맵에서 조회)"""
+        order, st_tokens = context.order, context.tokens
+        index = context.positions[id(decl)]
+        prev_name = order[index - 1].name.upper() if index > 0 else ''
+        next_name = order[index + 1].name.upper() if index + 1 < len(order) else ''
+        tokens = ['$DECL', decl.scope, decl.var_type.upper(), decl.initial_value.upper(), prev_name, next_name]
+
+        name = decl.name.upper()
+        for i in context.occurrences.get(name, ()):
+            window = st_tokens[max(0, i - 3):i + 4]
+            tokens.append('$USE')
+            tokens.extend('$V' if t == name else t for t in window)
+        return shingles(tokens)
+
     def _apply_qa_rules(self):
         """QA 규칙 적용"""
         print("[3/4] QA 규칙 적용 중...")
@@ -186,8 +382,12 @@ class TwinCATQAAnalyzer:
         # 변경된 파일에 대해 QA 규칙 적용
         for fc in self.file_changes:
             if fc.change_type in ("Added", "Modified"):
-                new_file = self.new_path / fc.file_path
-                self._check_qa_rules(new_file, fc.file_path)
+                self._check_qa_rules(self.new_index.files[fc.file_path], fc.file_path)
+            elif fc.change_type == "Renamed" and fc.similarity < 1.0:
+                # 이동된 파일은 이전 버전에 없던 라인만 검사
+                old_st = self.old_index.files[fc.old_path].st_code
+                known_lines = {line.strip() for line in old_st.split('\n')}
+                self._check_qa_rules(self.new_index.files[fc.file_path], fc.file_path, known_lines)
 
         # 변수 변경에 대한 QA 검사
         self._check_variable_qa_rules()
@@ -201,97 +401,122 @@ class TwinCATQAAnalyzer:
         print(f"  - Info: {info}개")
         print()
 
-    def _check_qa_rules(self, file_path: Path, rel_path: str):
-        """파일에 QA 규칙 적용"""
+    def _check_qa_rules(self, indexed: IndexedFile, rel_path: str, known_lines: Optional[Set[str]] = None):
+        """파일에 QA 규칙 적용 (known_lines 에 포함된 라인은 건너뜀)"""
         try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-
-            # XML에서 ST 코드 추출
-            st_code = self._extract_st_code(content)
+            st_code = indexed.st_code
 
             if not st_code:
                 return
 
             lines = st_code.split('\n')
+            first = len(self.qa_issues)
+            with self.profiler.file(rel_path):
+                self._check_qa_lines(
+                    ((line_num, line) for line_num, line in enumerate(lines, 1)
+                     if known_lines is None or line.strip() not in known_lines),
+                    rel_path
+                )
+            self._attribute_units(indexed, first)
 
-            for line_num, line in enumerate(lines, 1):
-                # QA001: 초기화되지 않은 변수
-                if self._check_uninitialized_var(line):
-                    self.qa_issues.append(QAIssue(
-                        rule_id="QA001",
-                        severity="Critical",
-                        file_path=rel_path,
-                        line=line_num,
-                        message="초기화되지 않은 변수가 사용될 수 있습니다",
-                        code_snippet=line.strip(),
-                        suggestion="변수 선언 시 초기값을 명시하세요"
-                    ))
+        except Exception as e:
+            print(f"    경고: {rel_path} 분석 실패 - {e}")
 
-                # QA002: 위험한 타입 변환
-                type_issue = self._check_type_narrowing(line)
-                if type_issue:
-                    self.qa_issues.append(QAIssue(
-                        rule_id="QA002",
-                        severity="Critical",
-                        file_path=rel_path,
-                        line=line_num,
-                        message=f"위험한 타입 변환: {type_issue}",
-                        code_snippet=line.strip(),
-                        suggestion="LIMIT 함수를 사용하여 안전하게 변환하세요"
-                    ))
+    def _attribute_units(self, indexed: IndexedFile, first: int):
+        """first 이후 추가된 이슈에 Method/Action/Property/Transition 이름과 단위 기준 라인 표시"""
+        if len(indexed.units) < 2:
+            return
+        for issue in self.qa_issues[first:]:
+            unit = unit_at(indexed.units, 'ST', issue.line)
+            if unit is not None and not unit.is_body:
+                issue.unit = unit.name
+                issue.unit_line = issue.line - unit.st_start
+
+    def _check_qa_lines(self, numbered_lines: Iterable[Tuple[int, str]], rel_path: str):
+        """(라인 번호, 라인) 목록에 라인 단위 QA 규칙 적용"""
+        profiler, budget = self.profiler, self.budget
+        max_length = budget.max_line_length
+        for line_num, line in numbered_lines:
+            # 비정상적으로 긴 라인은 잘라서 검사 (정규식 규칙 정체 방지)
+            if len(line) > max_length:
+                line = budget.cap_line(line, line_num)
+            # 긴 라인만 규칙 호출 시간을 예산에 누적
+            timed = profiler.timed_budget if budget.uses_budget(line) else profiler.timed
+
+            # QA001: 초기화되지 않은 변수
+            if timed('QA001', self._check_uninitialized_var, line):
+                self.qa_issues.append(QAIssue(
+                    rule_id="QA001",
+                    severity="Critical",
+                    file_path=rel_path,
+                    line=line_num,
+                    message="초기화되지 않은 변수가 사용될 수 있습니다",
+                    code_snippet=line.strip(),
+                    suggestion="변수 선언 시 초기값을 명시하세요"
+                ))
 
-                # QA005: REAL 직접 비교
-                if self._check_real_comparison(line):
-                    self.qa_issues.append(QAIssue(
-                        rule_id="QA005",
-                        severity="Critical",
-                        file_path=rel_path,
-                        line=line_num,
-                        message="실수형(REAL/LREAL) 직접 비교 감지",
-                        code_snippet=line.strip(),
-                        suggestion="허용 오차(epsilon)를 사용한 비교로 변경하세요"
-                    ))
+            # QA002: 위험한 타입 변환
+            type_issue = timed('QA002', self._check_type_narrowing, line)
+            if type_issue:
+                self.qa_issues.append(QAIssue(
+                    rule_id="QA002",
+                    severity="Critical",
+                    file_path=rel_path,
+                    line=line_num,
+                    message=f"위험한 타입 변환: {type_issue}",
+                    code_snippet=line.strip(),
+                    suggestion="LIMIT 함수를 사용하여 안전하게 변환하세요"
+                ))
 
-                # QA007: 매직 넘버 사용
-                magic = self._check_magic_number(line)
-                if magic:
-                    self.qa_issues.append(QAIssue(
-                        rule_id="QA007",
-                        severity="Warning",
-                        file_path=rel_path,
-                        line=line_num,
-                        message=f"매직 넘버 사용: {magic}",
-                        code_snippet=line.strip(),
-                        suggestion="상수(CONSTANT)로 정의하여 사용하세요"
-                    ))
+            # QA005: REAL 직접 비교
+            if timed('QA005', self._check_real_comparison, line):
+                self.qa_issues.append(QAIssue(
+                    rule_id="QA005",
+                    severity="Critical",
+                    file_path=rel_path,
+                    line=line_num,
+                    message="실수형(REAL/LREAL) 직접 비교 감지",
+                    code_snippet=line.strip(),
+                    suggestion="허용 오차(epsilon)를 사용한 비교로 변경하세요"
+                ))
 
-                # QA010: 하드코딩된 타이머/카운터 값
-                if self._check_hardcoded_time(line):
-                    self.qa_issues.append(QAIssue(
-                        rule_id="QA010",
-                        severity="Warning",
-                        file_path=rel_path,
-                        line=line_num,
-                        message="하드코딩된 시간/카운터 값 감지",
-                        code_snippet=line.strip(),
-                        suggestion="파라미터 또는 상수로 정의하세요"
-                    ))
+            # QA007: 매직 넘버 사용
+            magic = timed('QA007', self._check_magic_number, line)
+            if magic:
+                self.qa_issues.append(QAIssue(
+                    rule_id="QA007",
+                    severity="Warning",
+                    file_path=rel_path,
+                    line=line_num,
+                    message=f"매직 넘버 사용: {magic}",
+                    code_snippet=line.strip(),
+                    suggestion="상수(CONSTANT)로 정의하여 사용하세요"
+                ))
 
-                # QA016: 명명 규칙 위반
-                naming = self._check_naming_convention(line)
-                if naming:
-                    self.qa_issues.append(QAIssue(
-                        rule_id="QA016",
-                        severity="Info",
-                        file_path=rel_path,
-                        line=line_num,
-                        message=f"명명 규칙 위반: {naming}",
-                        code_snippet=line.strip(),
-                        suggestion="TwinCAT 명명 규칙을 따르세요"
-                    ))
+            # QA010: 하드코딩된 타이머/카운터 값
+            if timed('QA010', self._check_hardcoded_time, line):
+                self.qa_issues.append(QAIssue(
+                    rule_id="QA010",
+                    severity="Warning",
+                    file_path=rel_path,
+                    line=line_num,
+                    message="하드코딩된 시간/카운터 값 감지",
+                    code_snippet=line.strip(),
+                    suggestion="파라미터 또는 상수로 정의하세요"
+                ))
 
-        except Exception as e:
-            print(f"    경고: {rel_path} 분석 실패 - {e}")
+            # QA016: 명명 규칙 위반
+            naming = timed('QA016', self._check_naming_convention, line)
+            if naming:
+                self.qa_issues.append(QAIssue(
+                    rule_id="QA016",
+                    severity="Info",
+                    file_path=rel_path,
+                    line=line_num,
+                    message=f"명명 규칙 위반: {naming}",
+                    code_snippet=line.strip(),
+                    suggestion="TwinCAT 명명 규칙을 따르세요"
+                ))
 
     def _check_variable_qa_rules(self):
         """변수 변경에 대한 QA 규칙"""
@@ -382,58 +607,6 @@ class TwinCATQAAnalyzer:
         new_size = type_sizes.get(new_type.upper(), 0)
         return old_size > new_size > 0
 
-    def _extract_variables(self, file_path: Path) -> Dict[str, Dict]:
-        """파일에서 변수 추출"""
-        variables = {}
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            st_code = self._extract_declaration(content)
-
-            if not st_code:
-                return variables
-
-            # VAR 블록 파싱
-            var_pattern = r'^\s*(\w+)\s*:\s*(\w+(?:\s*\[\d+\.\.\d+\])?)\s*(?::=\s*(.+?))?;'
-            for match in re.finditer(var_pattern, st_code, re.MULTILINE):
-                var_name = match.group(1)
-                var_type = match.group(2)
-                var_value = match.group(3) if match.group(3) else ''
-                variables[var_name] = {
-                    'type': var_type.strip(),
-                    'value': var_value.strip()
-                }
-        except Exception:
-            pass
-        return variables
-
-    def _extract_st_code(self, content: str) -> str:
-        """XML에서 ST 코드 추출"""
-        # <ST><![CDATA[...]]></ST>
-        pattern = r'<ST><!\[CDATA\[(.*?)\]\]></ST>'
-        matches = re.findall(pattern, content, re.DOTALL)
-        return '\n'.join(matches)
-
-    def _extract_declaration(self, content: str) -> str:
-        """XML에서 선언부 추출"""
-        pattern = r'<Declaration><!\[CDATA\[(.*?)\]\]></Declaration>'
-        matches = re.findall(pattern, content, re.DOTALL)
-        return '\n'.join(matches)
-
-    def _get_files(self, base_path: Path, extensions: set) -> List[Path]:
-        """지정된 확장자의 파일 목록"""
-        files = []
-        for ext in extensions:
-            files.extend(base_path.rglob(f'*{ext}'))
-        return files
-
-    def _relative_path(self, file_path: Path, base_path: Path) -> str:
-        """상대 경로 계산"""
-        return str(file_path.relative_to(base_path))
-
-    def _file_hash(self, file_path: Path) -> str:
-        """파일 해시 계산"""
-        return hashlib.md5(file_path.read_bytes()).hexdigest()
-
     def _generate_report(self) -> Dict:
         """리포트 생성"""
         print("[4/4] 리포트 생성 중...")
@@ -447,18 +620,22 @@ class TwinCATQAAnalyzer:
                 "files_added": len([f for f in self.file_changes if f.change_type == 'Added']),
                 "files_deleted": len([f for f in self.file_changes if f.change_type == 'Deleted']),
                 "files_modified": len([f for f in self.file_changes if f.change_type == 'Modified']),
+                "files_renamed": len([f for f in self.file_changes if f.change_type == 'Renamed']),
                 "total_variable_changes": len(self.variable_changes),
                 "total_qa_issues": len(self.qa_issues),
                 "critical_issues": len([i for i in self.qa_issues if i.severity == 'Critical']),
                 "warning_issues": len([i for i in self.qa_issues if i.severity == 'Warning']),
                 "info_issues": len([i for i in self.qa_issues if i.severity == 'Info']),
+                "skipped_checks": len(self.budget.skipped),
             },
             "file_changes": [
                 {
                     "path": fc.file_path,
                     "type": fc.change_type,
                     "old_size": fc.old_size,
-                    "new_size": fc.new_size
+                    "new_size": fc.new_size,
+                    "old_path": fc.old_path,
+                    "similarity": fc.similarity
                 }
                 for fc in self.file_changes
             ],
@@ -467,6 +644,8 @@ class TwinCATQAAnalyzer:
                     "file": vc.file_path,
                     "name": vc.var_name,
                     "type": vc.change_type,
+                    "scope": vc.scope,
+                    "old_name": vc.old_name,
                     "old_type": vc.old_type,
                     "new_type": vc.new_type,
                     "old_value": vc.old_value,
@@ -482,10 +661,12 @@ class TwinCATQAAnalyzer:
                     "line": issue.line,
                     "message": issue.message,
                     "code": issue.code_snippet,
-                    "suggestion": issue.suggestion
+                    "suggestion": issue.suggestion,
+                    **({"unit": issue.unit, "unit_line": issue.unit_line} if issue.unit else {}),
                 }
                 for issue in self.qa_issues
-            ]
+            ],
+            "skipped_checks": self.budget.to_records(),
         }
 
         return report
@@ -511,6 +692,7 @@ def generate_markdown_report(report: Dict) -> str:
     md.append(f"| 파일 추가 | {s['files_added']}개 |")
     md.append(f"| 파일 삭제 | {s['files_deleted']}개 |")
     md.append(f"| 파일 수정 | {s['files_modified']}개 |")
+    md.append(f"| 파일 이동/이름 변경 | {s.get('files_renamed', 0)}개 |")
     md.append(f"| 변수 변경 | {s['total_variable_changes']}개 |")
     md.append(f"| **QA 이슈 총계** | **{s['total_qa_issues']}개** |")
     md.append(f"| 🔴 Critical | {s['critical_issues']}개 |")
@@ -527,7 +709,11 @@ def generate_markdown_report(report: Dict) -> str:
         md.append("|------|------|------|--------|")
         for issue in critical_issues[:30]:  # 상위 30개
             file_name = Path(issue['file']).name
-            md.append(f"| {file_name} | {issue['line']} | {issue['rule_id']} | {issue['message']} |")
+            if issue.get('unit'):  # Method/Action 안 이슈는 단위 이름 + 단위 기준 라인
+                file_name, line = f"{file_name} › {issue['unit']}", issue['unit_line']
+            else:
+                line = issue['line']
+            md.append(f"| {file_name} | {line} | {issue['rule_id']} | {issue['message']} |")
         if len(critical_issues) > 30:
             md.append(f"| ... | ... | ... | *외 {len(critical_issues) - 30}개* |")
         md.append("")
@@ -541,7 +727,11 @@ def generate_markdown_report(report: Dict) -> str:
         md.append("|------|------|------|--------|")
         for issue in warning_issues[:30]:
             file_name = Path(issue['file']).name
-            md.append(f"| {file_name} | {issue['line']} | {issue['rule_id']} | {issue['message']} |")
+            if issue.get('unit'):  # Method/Action 안 이슈는 단위 이름 + 단위 기준 라인
+                file_name, line = f"{file_name} › {issue['unit']}", issue['unit_line']
+            else:
+                line = issue['line']
+            md.append(f"| {file_name} | {line} | {issue['rule_id']} | {issue['message']} |")
         if len(warning_issues) > 30:
             md.append(f"| ... | ... | ... | *외 {len(warning_issues) - 30}개* |")
         md.append("")
@@ -559,10 +749,25 @@ def generate_markdown_report(report: Dict) -> str:
     md.append("")
 
     for fc in report['file_changes']:
-        icon = {"Added": "➕", "Deleted": "➖", "Modified": "📝"}.get(fc['type'], "?")
-        md.append(f"- {icon} `{fc['path']}` ({fc['type']})")
+        icon = {"Added": "➕", "Deleted": "➖", "Modified": "📝", "Renamed": "🔀"}.get(fc['type'], "?")
+        if fc['type'] == 'Renamed':
+            md.append(f"- {icon} `{fc['old_path']}` → `{fc['path']}` ({fc['type']}, 유사도 {fc['similarity']:.0%})")
+        else:
+            md.append(f"- {icon} `{fc['path']}` ({fc['type']})")
     md.append("")
 
+    # 변수 이름 변경
+    renamed_vars = [v for v in report['variable_changes'] if v['type'] == 'Renamed']
+    if renamed_vars:
+        md.append("## 🔀 변수 이름 변경")
+        md.append("")
+        md.append("| 파일 | 이전 이름 | 새 이름 | 타입 |")
+        md.append("|------|-----------|---------|------|")
+        for vc in renamed_vars[:20]:
+            file_name = Path(vc['file']).name
+            md.append(f"| {file_name} | {vc['old_name']} | {vc['name']} | {vc['new_type']} |")
+        md.append("")
+
     # 변수 변경 (타입 변경만)
     type_changes = [v for v in report['variable_changes'] if v['type'] == 'TypeChanged']
     if type_changes:
@@ -575,6 +780,9 @@ def generate_markdown_report(report: Dict) -> str:
             md.append(f"| {file_name} | {vc['name']} | {vc['old_type']} | {vc['new_type']} |")
         md.append("")
 
+    # 건너뛴 검사 (규칙 시간 예산 초과, 라인 길이 제한)
+    md.extend(skipped_checks_markdown(report.get('skipped_checks', [])))
+
     return '\n'.join(md)
 
 
@@ -585,25 +793,17 @@ if __name__ == "__main__":
     OLD_PATH = r"D:\00.Comapre\pollux_hcds_ald_mirror\Src_Diff\PLC\PM1\PM1"
     NEW_PATH = r"D:\00.Comapre\pollux_hcds_ald_mirror_ffff\Src_Diff\PLC\PM1\PM1"
 
-    # 분석 실행
-    analyzer = TwinCATQAAnalyzer(OLD_PATH, NEW_PATH)
-    report = analyzer.analyze()
+    # 분석 실행 (공통 분석 API)
+    from qa_api import compare_projects
+    report = compare_projects(OLD_PATH, NEW_PATH).to_dict()
 
-    # JSON 저장
+    # JSON(+ .tcqa)/Markdown/SARIF 동시 저장
     output_dir = Path(r"D:\01. Vscode\Twincat\features\twincat-code-qa-tool\output")
     output_dir.mkdir(exist_ok=True)
 
-    json_path = output_dir / "qa_report.json"
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(report, f, ensure_ascii=False, indent=2)
-    print(f"\nJSON 리포트 저장: {json_path}")
-
-    # Markdown 저장
-    md_content = generate_markdown_report(report)
-    md_path = output_dir / "qa_report.md"
-    with open(md_path, 'w', encoding='utf-8') as f:
-        f.write(md_content)
-    print(f"Markdown 리포트 저장: {md_path}")
+    from report_pipeline import run_pipeline
+    print()
+    run_pipeline(report, output_dir, ('json', 'markdown', 'sarif'), stem="qa_report")
 
     # 콘솔 출력
     print("\n" + "="*60)
@@ -9,12 +9,19 @@ import os
 import re
 import sys
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict, replace
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from collections import defaultdict
 import json
 
+from analysis_profile import AnalysisProfiler, format_profile
+from project_files import MODE_PLCPROJ, MODE_WALK, FileListing, discover_project_files
+from pou_units import CodeUnit, SourceUnits, UnitCache, split_units, unit_digest
+from rule_budget import RuleBudget, skipped_checks_markdown
+from source_encoding import EncodingCache
+from st_declaration import EXTERNAL_SCOPES, VariableDecl, build_variable_table
+
 @dataclass
 class QAIssue:
     """QA 이슈"""
@@ -26,6 +33,28 @@ class QAIssue:
     message: str
     code_snippet: str = ""
     suggestion: str = ""
+    unit: str = ""  # Method/Action/Property/Transition 이름 (본문이면 빈 값)
+    unit_line: int = 0  # 단위 안에서의 라인 (line 은 파일 섹션 스트림 기준)
+
+@dataclass
+class UnitStats:
+    """분석 단위(POU 본문, Method/Action/Property/Transition) 통계"""
+    name: str
+    kind: str  # BODY, METHOD, ACTION, PROPERTY, GET, SET, TRANSITION
+    lines_of_code: int = 0
+    complexity: int = 0
+    max_nesting: int = 0
+    variable_count: int = 0
+    issue_count: int = 0
+
+@dataclass
+class UnitResult:
+    """단위 하나의 규칙 결과 (라인은 단위 기준, 단위 캐시에 그대로 저장)"""
+    stats: UnitStats
+    issues: List[Tuple[str, QAIssue]] = field(default_factory=list)  # (섹션, 이슈) - 섹션 ''은 단위 전체 이슈
+
+    def add(self, section: str, issue: QAIssue):
+        self.issues.append((section, issue))
 
 @dataclass
 class FileStats:
@@ -37,18 +66,32 @@ class FileStats:
     lines_of_code: int = 0
     lines_of_comment: int = 0
     variable_count: int = 0
-    complexity: int = 0  # 순환 복잡도 추정
+    complexity: int = 0  # 순환 복잡도 추정 (단위 합계)
+    units: List[UnitStats] = field(default_factory=list)
     issues: List[QAIssue] = field(default_factory=list)
 
 class TwinCATSingleProjectAnalyzer:
     """TwinCAT 단일 프로젝트 분석기"""
 
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, profile_rules: bool = False, budget: Optional[RuleBudget] = None,
+                 encodings: Optional[EncodingCache] = None, unit_cache: Optional[UnitCache] = None):
         self.project_path = Path(project_path)
         self.files: List[FileStats] = []
         self.qa_issues: List[QAIssue] = []
         self.global_vars: Dict[str, Dict] = {}
         self.functions: Dict[str, Dict] = {}
+        # 분석 대상 파일 목록 출처 (.plcproj Compile 항목 또는 폴더 탐색)
+        self.discovery = FileListing([], MODE_WALK)
+        # 경로별 감지 인코딩 (분석 세션이 주면 인덱스와 공유) + 인코딩별 파일 수
+        self.encodings = encodings if encodings is not None else EncodingCache()
+        self.encoding_counts: Dict[str, int] = defaultdict(int)
+        # 단위별 규칙 결과 캐시 (분석 세션이 주면 재분석 시 바뀐 단위만 규칙 실행)
+        self.unit_cache = unit_cache
+        # 파일별 규칙 시간 예산 + 라인 길이 제한 (넘으면 건너뛰고 skipped_checks 에 기록)
+        self.budget = budget or RuleBudget()
+        # 단계/파일별 시간 (profile_rules 면 규칙별 시간 + 정규식 호출 수, 정규식은 self.rx 로 호출)
+        self.profiler = AnalysisProfiler(rules=profile_rules, budget=self.budget)
+        self.rx = self.profiler.regex
 
     def analyze(self) -> Dict:
         """전체 분석 실행"""
@@ -59,51 +102,76 @@ class TwinCATSingleProjectAnalyzer:
         print(f"분석 시작: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print()
 
+        profiler = self.profiler
+
         # 1. 파일 수집
-        self._collect_files()
+        with profiler.phase('collect'):
+            self._collect_files()
 
         # 2. 각 파일 분석
-        self._analyze_files()
+        with profiler.phase('files'):
+            self._analyze_files()
 
         # 3. 전역 분석 (크로스 파일)
-        self._global_analysis()
+        with profiler.phase('global'):
+            self._global_analysis()
 
         # 4. 리포트 생성
-        return self._generate_report()
+        with profiler.phase('report'):
+            report = self._generate_report()
+        report["profile"] = profiler.to_dict()
+        return report
 
     def _collect_files(self):
         """분석할 파일 수집"""
         print("[1/4] 파일 수집 중...")
 
-        extensions = {'.TcPOU': 'POU', '.TcGVL': 'GVL', '.TcDUT': 'DUT'}
+        extensions = {'.tcpou': 'POU', '.tcgvl': 'GVL', '.tcdut': 'DUT'}
 
-        for ext, file_type in extensions.items():
-            for file_path in self.project_path.rglob(f'*{ext}'):
-                self.files.append(FileStats(
-                    file_path=str(file_path.relative_to(self.project_path)),
-                    file_type=file_type
-                ))
+        # .plcproj Compile 항목 (없으면 트리 한 번 순회), 유형 순서(POU → GVL → DUT)로 정렬
+        order = list(extensions.values())
+        self.discovery = discover_project_files(self.project_path, ('.TcPOU', '.TcGVL', '.TcDUT'))
+        for item in self.discovery.files:
+            self.files.append(FileStats(
+                file_path=item.rel_path,
+                file_type=extensions[item.path.suffix.lower()]
+            ))
+        self.files.sort(key=lambda f: order.index(f.file_type))
 
         print(f"  - TcPOU: {len([f for f in self.files if f.file_type == 'POU'])}개")
         print(f"  - TcGVL: {len([f for f in self.files if f.file_type == 'GVL'])}개")
         print(f"  - TcDUT: {len([f for f in self.files if f.file_type == 'DUT'])}개")
         print(f"  - 총: {len(self.files)}개")
+        if self.discovery.mode == MODE_PLCPROJ:
+            print(f"  - 파일 목록: {', '.join(self.discovery.project_files)} Compile 항목")
+            if self.discovery.missing:
+                print(f"  - 경고: 프로젝트에 있지만 없는 파일 {len(self.discovery.missing)}개")
+        else:
+            print(f"  - 파일 목록: 폴더 탐색 (.plcproj 없음)")
         print()
 
     def _analyze_files(self):
         """각 파일 분석"""
         print("[2/4] 파일별 분석 중...")
 
+        sources = {item.rel_path: item for item in self.discovery.files}
         for i, file_stat in enumerate(self.files):
-            full_path = self.project_path / file_stat.file_path
+            source = sources[file_stat.file_path]
             try:
-                content = full_path.read_text(encoding='utf-8', errors='ignore')
+                with self.profiler.file(file_stat.file_path, source.size):
+                    # bytes 로 한 번 읽고 인코딩 감지 (BOM/XML 선언 → UTF-8 → CP949)
+                    data = source.path.read_bytes()
+                    content, encoding = self.encodings.decode(str(source.path), source.size, source.mtime_ns, data)
+                    self.encoding_counts[encoding] += 1
+
+                    # 섹션 스트림 + 분석 단위 (한 번의 스캔)
+                    units = split_units(content)
 
-                # 기본 정보 추출
-                self._extract_file_info(file_stat, content)
+                    # 기본 정보 추출
+                    self._extract_file_info(file_stat, content, units)
 
-                # QA 규칙 적용
-                self._apply_qa_rules(file_stat, content)
+                    # QA 규칙 적용 (단위별)
+                    self._apply_qa_rules(file_stat, units)
 
             except Exception as e:
                 print(f"    경고: {file_stat.file_path} 분석 실패 - {e}")
@@ -112,16 +180,21 @@ class TwinCATSingleProjectAnalyzer:
             if (i + 1) % 20 == 0 or i == len(self.files) - 1:
                 print(f"  진행: {i+1}/{len(self.files)} ({(i+1)*100//len(self.files)}%)")
 
+        if self.unit_cache is not None:
+            cache = self.unit_cache
+            print(f"  단위 캐시: {cache.hits}개 재사용, {cache.misses}개 분석")
+            cache.prune()
         print()
 
-    def _extract_file_info(self, file_stat: FileStats, content: str):
+    def _extract_file_info(self, file_stat: FileStats, content: str, source: SourceUnits):
         """파일 정보 추출"""
         # POU 타입 및 이름 추출
         if file_stat.file_type == 'POU':
-            if match := re.search(r'<POU\s+Name="([^"]+)"[^>]*>', content):
+            if match := self.rx.search(r'<POU\s+Name="([^"]+)"[^>]*>', content):
                 file_stat.name = match.group(1)
 
-            declaration = self._extract_section(content, 'Declaration')
+            # 본문 선언부 기준 (메서드 선언/주석의 키워드 제외)
+            declaration = '\n'.join(source.unit_lines(source.units[0], 'Declaration'))
             if 'PROGRAM' in declaration:
                 file_stat.pou_type = 'PROGRAM'
             elif 'FUNCTION_BLOCK' in declaration:
@@ -130,118 +203,164 @@ class TwinCATSingleProjectAnalyzer:
                 file_stat.pou_type = 'FUNCTION'
 
         elif file_stat.file_type == 'GVL':
-            if match := re.search(r'<GVL\s+Name="([^"]+)"', content):
+            if match := self.rx.search(r'<GVL\s+Name="([^"]+)"', content):
                 file_stat.name = match.group(1)
 
         elif file_stat.file_type == 'DUT':
-            if match := re.search(r'<DUT\s+Name="([^"]+)"', content):
+            if match := self.rx.search(r'<DUT\s+Name="([^"]+)"', content):
                 file_stat.name = match.group(1)
 
-        # 코드 라인 수
-        st_code = self._extract_section(content, 'ST')
-        declaration = self._extract_section(content, 'Declaration')
-        all_code = declaration + '\n' + st_code
-
-        lines = all_code.split('\n')
+        # 코드 라인 수 (변수 수/복잡도는 단위별로 계산해 합산)
+        lines = source.lines('Declaration') + source.lines('ST')
         file_stat.lines_of_code = len([l for l in lines if l.strip() and not l.strip().startswith('//')])
         file_stat.lines_of_comment = len([l for l in lines if l.strip().startswith('//')])
 
-        # 변수 수
-        file_stat.variable_count = len(re.findall(r'^\s*\w+\s*:\s*\w+', all_code, re.MULTILINE))
-
-        # 순환 복잡도 추정 (분기문 수)
-        file_stat.complexity = len(re.findall(r'\b(IF|ELSIF|CASE|FOR|WHILE|REPEAT)\b', st_code, re.IGNORECASE))
-
-    def _apply_qa_rules(self, file_stat: FileStats, content: str):
-        """QA 규칙 적용"""
-        declaration = self._extract_section(content, 'Declaration')
-        st_code = self._extract_section(content, 'ST')
+    def _apply_qa_rules(self, file_stat: FileStats, source: SourceUnits):
+        """QA 규칙 적용 - 단위(본문, Method/Action/Property/Transition)마다 선언부/구현부 규칙을 따로 실행"""
+        for unit in source.units:
+            result = self._unit_result(file_stat, source, unit)
+            self._add_unit_result(file_stat, unit, result)
+
+        file_stat.variable_count = sum(u.variable_count for u in file_stat.units)
+        file_stat.complexity = sum(u.complexity for u in file_stat.units)
+
+        # 파일 전체 규칙
+        self._check_general_rules(file_stat)
+
+    def _unit_result(self, file_stat: FileStats, source: SourceUnits, unit: CodeUnit) -> UnitResult:
+        """단위 하나의 규칙 결과 (내용이 같으면 단위 캐시 재사용, 규칙 프로파일 중에는 항상 실행)"""
+        declaration = source.unit_lines(unit, 'Declaration')
+        st_lines = source.unit_lines(unit, 'ST')
+        cache = self.unit_cache if not self.profiler.rules_enabled else None
+        if cache is not None:
+            key = (file_stat.file_path, file_stat.file_type, unit.name,
+                   unit_digest('\n'.join(declaration), '\n'.join(st_lines)))
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        skipped = len(self.budget.skipped)
+        code_lines = [l for l in declaration + st_lines if l.strip() and not l.strip().startswith('//')]
+        result = UnitResult(UnitStats(
+            name=unit.name or file_stat.name,
+            kind=unit.kind,
+            lines_of_code=len(code_lines),
+            # 순환 복잡도 추정 (분기문 수)
+            complexity=len(self.rx.findall(r'\b(IF|ELSIF|CASE|FOR|WHILE|REPEAT)\b', '\n'.join(st_lines), re.IGNORECASE)),
+        ))
 
         # 선언부 분석
-        self._check_declaration_rules(file_stat, declaration)
+        self._check_declaration_rules(file_stat, result, declaration)
 
         # 구현부 분석
-        self._check_implementation_rules(file_stat, st_code)
+        self._check_implementation_rules(file_stat, result, st_lines, unit.st_start)
 
-        # 전체 코드 분석
-        self._check_general_rules(file_stat, declaration + '\n' + st_code)
+        # 단위 크기/복잡도
+        self._check_unit_rules(file_stat, result)
 
-    def _check_declaration_rules(self, file_stat: FileStats, declaration: str):
-        """선언부 QA 규칙"""
-        lines = declaration.split('\n')
+        result.stats.issue_count = len(result.issues)
+        # 시간 예산/라인 길이 제한으로 건너뛴 검사가 있으면 불완전한 결과라 저장하지 않음
+        if cache is not None and len(self.budget.skipped) == skipped and not self.budget.exhausted:
+            cache.put(key, result)
+        return result
+
+    def _add_unit_result(self, file_stat: FileStats, unit: CodeUnit, result: UnitResult):
+        """단위 결과 → 파일 이슈 (라인을 파일 섹션 스트림 기준으로 변환, 본문이 아니면 단위 이름 표시)"""
+        file_stat.units.append(result.stats)
+        name = '' if unit.is_body else unit.name
+        for section, issue in result.issues:
+            offset = unit.decl_start if section == 'Declaration' else unit.st_start if section == 'ST' else 0
+            line = issue.line + offset if section else 0
+            self._add_issue(file_stat, replace(issue, line=line, unit=name, unit_line=issue.line if name else 0))
+
+    def _check_declaration_rules(self, file_stat: FileStats, result: UnitResult, lines: List[str]):
+        """선언부 QA 규칙 (lines: 단위 선언부, 라인 번호는 단위 기준)"""
+        timed = self.profiler.timed
+
+        # 변수 테이블 (단위 선언부 단일 패스 파싱 - 메서드마다 지역 변수가 따로 있음)
+        variables = build_variable_table('\n'.join(lines))
+        result.stats.variable_count = len(variables)
+
+        for decl in variables.values():
+            line = lines[decl.line - 1] if 0 < decl.line <= len(lines) else ''
 
-        for line_num, line in enumerate(lines, 1):
             # QA001: 초기화되지 않은 변수 (Critical 타입만)
-            if self._is_uninitialized_critical_var(line):
-                self._add_issue(file_stat, QAIssue(
+            if timed('QA001', self._is_uninitialized_critical_var, decl):
+                result.add('Declaration', QAIssue(
                     rule_id="QA001",
                     severity="Critical",
                     category="Safety",
                     file_path=file_stat.file_path,
-                    line=line_num,
+                    line=decl.line,
                     message="초기화되지 않은 중요 변수 (REAL/LREAL/포인터)",
                     code_snippet=line.strip(),
                     suggestion="선언 시 초기값을 명시하세요: var : TYPE := 초기값;"
                 ))
 
             # QA003: 배열 선언 검사
-            if self._is_large_array(line):
-                self._add_issue(file_stat, QAIssue(
+            if timed('QA003', self._is_large_array, decl.var_type):
+                result.add('Declaration', QAIssue(
                     rule_id="QA003",
                     severity="Warning",
                     category="Performance",
                     file_path=file_stat.file_path,
-                    line=line_num,
+                    line=decl.line,
                     message="대용량 배열 선언 감지",
                     code_snippet=line.strip(),
                     suggestion="메모리 사용량을 검토하세요"
                 ))
 
             # QA004: 포인터 변수
-            if re.search(r':\s*POINTER\s+TO\b', line, re.IGNORECASE):
-                self._add_issue(file_stat, QAIssue(
+            if timed('QA004', self._is_pointer, decl.var_type):
+                result.add('Declaration', QAIssue(
                     rule_id="QA004",
                     severity="Warning",
                     category="Safety",
                     file_path=file_stat.file_path,
-                    line=line_num,
+                    line=decl.line,
                     message="포인터 변수 사용 - NULL 체크 필수",
                     code_snippet=line.strip(),
                     suggestion="사용 전 반드시 NULL 체크를 수행하세요"
                 ))
 
             # QA016: 명명 규칙 검사
-            naming_issue = self._check_naming(line, file_stat.file_type)
+            naming_issue = timed('QA016', self._check_naming, decl, file_stat.file_type)
             if naming_issue:
-                self._add_issue(file_stat, QAIssue(
+                result.add('Declaration', QAIssue(
                     rule_id="QA016",
                     severity="Info",
                     category="Style",
                     file_path=file_stat.file_path,
-                    line=line_num,
+                    line=decl.line,
                     message=f"명명 규칙: {naming_issue}",
                     code_snippet=line.strip(),
                     suggestion="헝가리안 표기법 또는 프로젝트 명명 규칙을 따르세요"
                 ))
 
-    def _check_implementation_rules(self, file_stat: FileStats, st_code: str):
-        """구현부 QA 규칙"""
-        lines = st_code.split('\n')
+    def _check_implementation_rules(self, file_stat: FileStats, result: UnitResult, lines: List[str], line_offset: int):
+        """구현부 QA 규칙 (lines: 단위 구현부, line_offset: 파일 ST 스트림에서 단위 시작 위치)"""
+        profiler, budget = self.profiler, self.budget
+        max_length = budget.max_line_length
 
-        # 중첩 깊이 추적
+        # 중첩 깊이 추적 (단위마다 새로 시작)
         nesting_depth = 0
         max_nesting = 0
 
         for line_num, line in enumerate(lines, 1):
-            # 중첩 깊이 계산
-            nesting_depth += len(re.findall(r'\b(IF|FOR|WHILE|CASE|REPEAT)\b', line, re.IGNORECASE))
-            nesting_depth -= len(re.findall(r'\b(END_IF|END_FOR|END_WHILE|END_CASE|UNTIL)\b', line, re.IGNORECASE))
+            # 비정상적으로 긴 라인은 잘라서 검사 (정규식 규칙 정체 방지)
+            if len(line) > max_length:
+                line = budget.cap_line(line, line_offset + line_num)
+            # 긴 라인만 규칙 호출 시간을 예산에 누적
+            timed = profiler.timed_budget if budget.uses_budget(line) else profiler.timed
+
+            # 중첩 깊이 계산 (예산 초과로 건너뛰면 변화 없음)
+            nesting_depth += timed('QA008', self._nesting_delta, line) or 0
             max_nesting = max(max_nesting, nesting_depth)
 
             # QA002: 타입 축소 변환
-            type_issue = self._check_type_narrowing(line)
+            type_issue = timed('QA002', self._check_type_narrowing, line)
             if type_issue:
-                self._add_issue(file_stat, QAIssue(
+                result.add('ST', QAIssue(
                     rule_id="QA002",
                     severity="Critical",
                     category="Safety",
@@ -253,8 +372,8 @@ class TwinCATSingleProjectAnalyzer:
                 ))
 
             # QA005: REAL 직접 비교
-            if self._check_real_comparison(line):
-                self._add_issue(file_stat, QAIssue(
+            if timed('QA005', self._check_real_comparison, line):
+                result.add('ST', QAIssue(
                     rule_id="QA005",
                     severity="Critical",
                     category="Safety",
@@ -266,8 +385,8 @@ class TwinCATSingleProjectAnalyzer:
                 ))
 
             # QA006: 0으로 나누기 가능성
-            if self._check_division_by_zero(line):
-                self._add_issue(file_stat, QAIssue(
+            if timed('QA006', self._check_division_by_zero, line):
+                result.add('ST', QAIssue(
                     rule_id="QA006",
                     severity="Critical",
                     category="Safety",
@@ -279,9 +398,9 @@ class TwinCATSingleProjectAnalyzer:
                 ))
 
             # QA007: 매직 넘버
-            magic = self._check_magic_number(line)
+            magic = timed('QA007', self._check_magic_number, line)
             if magic:
-                self._add_issue(file_stat, QAIssue(
+                result.add('ST', QAIssue(
                     rule_id="QA007",
                     severity="Warning",
                     category="Maintainability",
@@ -293,8 +412,8 @@ class TwinCATSingleProjectAnalyzer:
                 ))
 
             # QA010: 하드코딩된 시간값
-            if self._check_hardcoded_time(line):
-                self._add_issue(file_stat, QAIssue(
+            if timed('QA010', self._check_hardcoded_time, line):
+                result.add('ST', QAIssue(
                     rule_id="QA010",
                     severity="Warning",
                     category="Maintainability",
@@ -306,8 +425,8 @@ class TwinCATSingleProjectAnalyzer:
                 ))
 
             # QA011: 빈 예외 처리
-            if re.search(r'\bELSE\s*;', line, re.IGNORECASE):
-                self._add_issue(file_stat, QAIssue(
+            if timed('QA011', self._is_empty_else, line):
+                result.add('ST', QAIssue(
                     rule_id="QA011",
                     severity="Warning",
                     category="Safety",
@@ -319,8 +438,8 @@ class TwinCATSingleProjectAnalyzer:
                 ))
 
             # QA012: TODO/FIXME 주석
-            if re.search(r'(//|/\*)\s*(TODO|FIXME|XXX|HACK)', line, re.IGNORECASE):
-                self._add_issue(file_stat, QAIssue(
+            if timed('QA012', self._has_todo_marker, line):
+                result.add('ST', QAIssue(
                     rule_id="QA012",
                     severity="Info",
                     category="Maintainability",
@@ -332,21 +451,21 @@ class TwinCATSingleProjectAnalyzer:
                 ))
 
             # QA013: 주석 처리된 코드
-            if self._is_commented_code(line):
-                self._add_issue(file_stat, QAIssue(
+            if timed('QA013', self._is_commented_code, line):
+                result.add('ST', QAIssue(
                     rule_id="QA013",
                     severity="Info",
                     category="Maintainability",
                     file_path=file_stat.file_path,
                     line=line_num,
                     message="주석 처리된 코드",
-                    code_snippet=line.strip()[:80],
+                    code_snippet=line.strip(),
                     suggestion="불필요한 코드는 삭제하세요 (버전 관리 시스템 활용)"
                 ))
 
         # QA008: 과도한 중첩
         if max_nesting > 4:
-            self._add_issue(file_stat, QAIssue(
+            result.add('', QAIssue(
                 rule_id="QA008",
                 severity="Warning",
                 category="Maintainability",
@@ -355,35 +474,49 @@ class TwinCATSingleProjectAnalyzer:
                 message=f"과도한 중첩 깊이: {max_nesting}단계",
                 suggestion="함수 분리 또는 early return 패턴을 사용하세요"
             ))
+        result.stats.max_nesting = max_nesting
+
+    def _check_unit_rules(self, file_stat: FileStats, result: UnitResult):
+        """단위 크기/복잡도 규칙 (Method/Action 마다 따로 판단)"""
+        profiler = self.profiler
+        stats = result.stats
 
-    def _check_general_rules(self, file_stat: FileStats, all_code: str):
-        """전체 코드 규칙"""
         # QA009: 긴 함수/프로그램
-        if file_stat.lines_of_code > 500:
-            self._add_issue(file_stat, QAIssue(
+        with profiler.rule('QA009'):
+            long_code = stats.lines_of_code > 500
+        if long_code:
+            result.add('', QAIssue(
                 rule_id="QA009",
                 severity="Warning",
                 category="Maintainability",
                 file_path=file_stat.file_path,
                 line=0,
-                message=f"코드가 너무 깁니다: {file_stat.lines_of_code}줄",
+                message=f"코드가 너무 깁니다: {stats.lines_of_code}줄",
                 suggestion="500줄 이하로 분리를 권장합니다"
             ))
 
         # QA014: 높은 순환 복잡도
-        if file_stat.complexity > 15:
-            self._add_issue(file_stat, QAIssue(
+        with profiler.rule('QA014'):
+            complex_code = stats.complexity > 15
+        if complex_code:
+            result.add('', QAIssue(
                 rule_id="QA014",
                 severity="Warning",
                 category="Maintainability",
                 file_path=file_stat.file_path,
                 line=0,
-                message=f"높은 순환 복잡도: {file_stat.complexity}",
+                message=f"높은 순환 복잡도: {stats.complexity}",
                 suggestion="함수를 더 작은 단위로 분리하세요"
             ))
 
+    def _check_general_rules(self, file_stat: FileStats):
+        """파일 전체 규칙"""
+        profiler = self.profiler
+
         # QA015: 주석 부족
-        if file_stat.lines_of_code > 50 and file_stat.lines_of_comment < file_stat.lines_of_code * 0.1:
+        with profiler.rule('QA015'):
+            few_comments = file_stat.lines_of_code > 50 and file_stat.lines_of_comment < file_stat.lines_of_code * 0.1
+        if few_comments:
             self._add_issue(file_stat, QAIssue(
                 rule_id="QA015",
                 severity="Info",
@@ -445,6 +578,7 @@ class TwinCATSingleProjectAnalyzer:
                 "warning_count": len([i for i in self.qa_issues if i.severity == 'Warning']),
                 "info_count": len([i for i in self.qa_issues if i.severity == 'Info']),
                 "by_category": {k: len(v) for k, v in by_category.items()},
+                "skipped_checks": len(self.budget.skipped),
             },
             "files": [
                 {
@@ -454,7 +588,9 @@ class TwinCATSingleProjectAnalyzer:
                     "name": f.name,
                     "lines": f.lines_of_code,
                     "complexity": f.complexity,
-                    "issue_count": len([i for i in self.qa_issues if i.file_path == f.file_path])
+                    "issue_count": len([i for i in self.qa_issues if i.file_path == f.file_path]),
+                    # Method/Action/Property/Transition 이 있는 POU 만 단위별 통계 포함
+                    **({"units": [asdict(u) for u in f.units]} if len(f.units) > 1 else {}),
                 }
                 for f in self.files
             ],
@@ -475,63 +611,63 @@ class TwinCATSingleProjectAnalyzer:
                     "line": i.line,
                     "message": i.message,
                     "code": i.code_snippet,
-                    "suggestion": i.suggestion
+                    "suggestion": i.suggestion,
+                    **({"unit": i.unit, "unit_line": i.unit_line} if i.unit else {}),
                 }
                 for i in self.qa_issues
-            ]
+            ],
+            "skipped_checks": self.budget.to_records(),
+            "discovery": {**self.discovery.to_dict(), "encodings": dict(self.encoding_counts)},
         }
 
         return report
 
     # === Helper Methods ===
 
-    def _extract_section(self, content: str, section: str) -> str:
-        """XML에서 섹션 추출"""
-        pattern = rf'<{section}><!\[CDATA\[(.*?)\]\]></{section}>'
-        matches = re.findall(pattern, content, re.DOTALL)
-        return '\n'.join(matches)
-
     def _add_issue(self, file_stat: FileStats, issue: QAIssue):
         """이슈 추가"""
         self.qa_issues.append(issue)
         file_stat.issues.append(issue)
 
-    def _is_uninitialized_critical_var(self, line: str) -> bool:
-        """중요 타입의 초기화되지 않은 변수"""
-        pattern = r'^\s*\w+\s*:\s*(REAL|LREAL|POINTER)\b(?!.*:=)'
-        return bool(re.search(pattern, line, re.IGNORECASE))
+    def _is_uninitialized_critical_var(self, decl: VariableDecl) -> bool:
+        """중요 타입의 초기화되지 않은 변수 (외부에서 값이 주어지는 입력/주소 변수 제외)"""
+        if decl.initial_value or decl.address or decl.scope in EXTERNAL_SCOPES:
+            return False
+        return decl.base_type in ('REAL', 'LREAL', 'POINTER')
 
-    def _is_large_array(self, line: str) -> bool:
+    def _is_large_array(self, var_type: str) -> bool:
         """대용량 배열"""
-        match = re.search(r'ARRAY\s*\[\s*(\d+)\s*\.\.\s*(\d+)\s*\]', line, re.IGNORECASE)
+        match = self.rx.search(r'ARRAY\s*\[\s*(\d+)\s*\.\.\s*(\d+)\s*\]', var_type, re.IGNORECASE)
         if match:
             size = int(match.group(2)) - int(match.group(1)) + 1
             return size > 1000
         return False
 
-    def _check_naming(self, line: str, file_type: str) -> Optional[str]:
+    def _is_pointer(self, var_type: str) -> bool:
+        """포인터 타입"""
+        return bool(self.rx.match(r'POINTER\s+TO\b', var_type, re.IGNORECASE))
+
+    def _check_naming(self, decl: VariableDecl, file_type: str) -> Optional[str]:
         """명명 규칙 검사"""
-        match = re.search(r'^\s*(\w+)\s*:\s*(\w+)', line)
-        if match:
-            var_name = match.group(1)
-            var_type = match.group(2).upper()
-
-            # 상수는 예외
-            if var_name.isupper():
-                return None
-
-            # 헝가리안 표기법 검사
-            prefixes = {
-                'BOOL': 'b', 'INT': 'n', 'DINT': 'n', 'REAL': 'f', 'LREAL': 'f',
-                'STRING': 's', 'WORD': 'w', 'DWORD': 'dw', 'BYTE': 'by',
-                'POINTER': 'p', 'ARRAY': 'a', 'TIME': 't', 'TON': 'ton', 'TOF': 'tof'
-            }
-
-            expected_prefix = prefixes.get(var_type)
-            if expected_prefix and not var_name.lower().startswith(expected_prefix):
-                # FB, FC 같은 접두사는 허용
-                if not re.match(r'^(fb|fc|st|e|i|o|io)[A-Z_]', var_name, re.IGNORECASE):
-                    return f"'{var_name}'에 타입 접두사 '{expected_prefix}' 권장"
+        var_name = decl.name
+        var_type = decl.base_type
+
+        # 상수는 예외
+        if var_name.isupper():
+            return None
+
+        # 헝가리안 표기법 검사
+        prefixes = {
+            'BOOL': 'b', 'INT': 'n', 'DINT': 'n', 'REAL': 'f', 'LREAL': 'f',
+            'STRING': 's', 'WORD': 'w', 'DWORD': 'dw', 'BYTE': 'by',
+            'POINTER': 'p', 'ARRAY': 'a', 'TIME': 't', 'TON': 'ton', 'TOF': 'tof'
+        }
+
+        expected_prefix = prefixes.get(var_type)
+        if expected_prefix and not var_name.lower().startswith(expected_prefix):
+            # FB, FC 같은 접두사는 허용
+            if not self.rx.match(r'^(fb|fc|st|e|i|o|io)[A-Z_]', var_name, re.IGNORECASE):
+                return f"'{var_name}'에 타입 접두사 '{expected_prefix}' 권장"
         return None
 
     def _check_type_narrowing(self, line: str) -> Optional[str]:
@@ -548,7 +684,7 @@ class TwinCATSingleProjectAnalyzer:
             (r'DWORD_TO_BYTE\s*\(', 'DWORD→BYTE'),
         ]
         for pattern, desc in patterns:
-            if re.search(pattern, line, re.IGNORECASE):
+            if self.rx.search(pattern, line, re.IGNORECASE):
                 return desc
         return None
 
@@ -559,12 +695,12 @@ class TwinCATSingleProjectAnalyzer:
             return False
         # f, r 접두사 변수와 = 비교
         pattern = r'\b[fr]\w+\s*=\s*[fr]\w+\b|\b[fr]\w+\s*=\s*\d+\.\d+'
-        return bool(re.search(pattern, line, re.IGNORECASE))
+        return bool(self.rx.search(pattern, line, re.IGNORECASE))
 
     def _check_division_by_zero(self, line: str) -> bool:
         """0으로 나누기 가능성"""
         # 변수로 나누는 경우
-        if re.search(r'/\s*[a-zA-Z_]\w*\s*[;)]', line):
+        if self.rx.search(r'/\s*[a-zA-Z_]\w*\s*[;)]', line):
             # 직전에 0 체크가 없으면 위험
             return True
         return False
@@ -572,30 +708,43 @@ class TwinCATSingleProjectAnalyzer:
     def _check_magic_number(self, line: str) -> Optional[str]:
         """매직 넘버"""
         # 주석 제외
-        code = re.sub(r'//.*$', '', line)
-        code = re.sub(r'\(\*.*?\*\)', '', code)
+        code = self.rx.sub(r'//.*$', '', line)
+        code = self.rx.sub(r'\(\*.*?\*\)', '', code)
 
         # 배열 인덱스, 시간값 제외
-        code = re.sub(r'\[\s*\d+\s*\]', '', code)
-        code = re.sub(r'T#\d+\w+', '', code)
-        code = re.sub(r'#\d+', '', code)  # 16#FF 등
+        code = self.rx.sub(r'\[\s*\d+\s*\]', '', code)
+        code = self.rx.sub(r'T#\d+\w+', '', code)
+        code = self.rx.sub(r'#\d+', '', code)  # 16#FF 등
 
         # 2자리 이상 숫자
-        match = re.search(r'(?<![:\w#])\b(\d{3,})\b', code)
+        match = self.rx.search(r'(?<![:\w#])\b(\d{3,})\b', code)
         if match:
             return match.group(1)
         return None
 
+    def _nesting_delta(self, line: str) -> int:
+        """라인의 중첩 깊이 변화 (여는 제어문 - 닫는 제어문)"""
+        return (len(self.rx.findall(r'\b(IF|FOR|WHILE|CASE|REPEAT)\b', line, re.IGNORECASE))
+                - len(self.rx.findall(r'\b(END_IF|END_FOR|END_WHILE|END_CASE|UNTIL)\b', line, re.IGNORECASE)))
+
+    def _is_empty_else(self, line: str) -> bool:
+        """빈 ELSE 블록"""
+        return bool(self.rx.search(r'\bELSE\s*;', line, re.IGNORECASE))
+
+    def _has_todo_marker(self, line: str) -> bool:
+        """TODO/FIXME 주석"""
+        return bool(self.rx.search(r'(//|/\*)\s*(TODO|FIXME|XXX|HACK)', line, re.IGNORECASE))
+
     def _check_hardcoded_time(self, line: str) -> bool:
         """하드코딩된 시간"""
-        return bool(re.search(r'T#\d+(?:ms|s|m|h)', line, re.IGNORECASE))
+        return bool(self.rx.search(r'T#\d+(?:ms|s|m|h)', line, re.IGNORECASE))
 
     def _is_commented_code(self, line: str) -> bool:
         """주석 처리된 코드"""
         if line.strip().startswith('//'):
             code_part = line.strip()[2:].strip()
             # ST 키워드나 할당문이 있으면 코드로 판단
-            if re.search(r':=|;\s*$|\bIF\b|\bFOR\b|\bWHILE\b|\bEND_', code_part, re.IGNORECASE):
+            if self.rx.search(r':=|;\s*$|\bIF\b|\bFOR\b|\bWHILE\b|\bEND_', code_part, re.IGNORECASE):
                 return True
         return False
 
@@ -607,6 +756,18 @@ def generate_markdown_report(report: Dict) -> str:
     md.append("")
     md.append(f"**분석 일시**: {report['generated_at']}")
     md.append(f"**프로젝트 경로**: `{report['project_path']}`")
+    discovery = report.get('discovery')
+    if discovery:
+        source = (f"{', '.join(discovery['project_files'])} Compile 항목" if discovery['mode'] == 'plcproj'
+                  else "폴더 탐색")
+        md.append(f"**파일 목록**: {source}")
+        encodings = discovery.get('encodings', {})
+        if set(encodings) - {'utf-8'}:
+            md.append("**인코딩**: " + ", ".join(f"{name} {count}개" for name, count in sorted(encodings.items())))
+        if discovery['missing_files']:
+            md.append(f"**프로젝트에 등록됐지만 없는 파일**: {len(discovery['missing_files'])}개 - "
+                      + ", ".join(f"`{path}`" for path in discovery['missing_files'][:20])
+                      + (" ..." if len(discovery['missing_files']) > 20 else ""))
     md.append("")
 
     # 요약
@@ -651,7 +812,11 @@ def generate_markdown_report(report: Dict) -> str:
         md.append("|------|------|------|--------|")
         for issue in critical_issues[:50]:
             file_name = Path(issue['file']).name
-            md.append(f"| {file_name} | {issue['line']} | {issue['rule_id']} | {issue['message'][:50]} |")
+            if issue.get('unit'):  # Method/Action 안 이슈는 단위 이름 + 단위 기준 라인
+                file_name, line = f"{file_name} › {issue['unit']}", issue['unit_line']
+            else:
+                line = issue['line']
+            md.append(f"| {file_name} | {line} | {issue['rule_id']} | {issue['message'][:50]} |")
         if len(critical_issues) > 50:
             md.append(f"| ... | | | *외 {len(critical_issues) - 50}개* |")
         md.append("")
@@ -678,36 +843,74 @@ def generate_markdown_report(report: Dict) -> str:
             md.append(f"| {f['name']} | {f['pou_type']} | {f['lines']} | {f['complexity']} | {f['issue_count']} |")
         md.append("")
 
+    # 복잡도 높은 단위 (Method/Action/Property/Transition)
+    complex_units = sorted([u for f in report['files'] for u in f.get('units', [])
+                            if u['kind'] != 'BODY' and u['complexity'] > 10],
+                           key=lambda x: x['complexity'], reverse=True)[:10]
+    if complex_units:
+        md.append("## ⚠️ 복잡도 높은 단위 (Top 10)")
+        md.append("")
+        md.append("| 단위 | 종류 | 라인수 | 복잡도 | 최대 중첩 | 이슈수 |")
+        md.append("|------|------|--------|--------|-----------|--------|")
+        for u in complex_units:
+            md.append(f"| {u['name']} | {u['kind']} | {u['lines_of_code']} | {u['complexity']} | {u['max_nesting']} | {u['issue_count']} |")
+        md.append("")
+
+    # 건너뛴 검사 (규칙 시간 예산 초과, 라인 길이 제한)
+    md.extend(skipped_checks_markdown(report.get('skipped_checks', [])))
+
+    # 분석 프로파일
+    profile = report.get('profile')
+    if profile:
+        totals = profile['totals']
+        md.append("## ⏱️ 분석 프로파일")
+        md.append("")
+        md.append(f"총 {totals['wall_s']:.3f}s (CPU {totals['cpu_s']:.3f}s), 읽은 크기 {totals['bytes_read']:,} bytes"
+                  + (f", 정규식 호출 {totals['regex_calls']:,}회" if totals.get('rules_profiled') else ""))
+        md.append("")
+        md.append("| 단계 | Wall (s) | CPU (s) |")
+        md.append("|------|----------|---------|")
+        for name, stat in profile['phases'].items():
+            md.append(f"| {name} | {stat['wall_s']:.3f} | {stat['cpu_s']:.3f} |")
+        md.append("")
+        if profile['rules']:
+            md.append("| 규칙 ID | Wall (s) | 호출 수 | 정규식 호출 |")
+            md.append("|---------|----------|---------|-------------|")
+            for rule_id, stat in profile['rules'].items():
+                md.append(f"| {rule_id} | {stat['wall_s']:.3f} | {stat['calls']:,} | {stat['regex_calls']:,} |")
+            md.append("")
+        if profile['slowest_files']:
+            md.append("| 느린 파일 | Wall (s) | CPU (s) | 크기 (bytes) |")
+            md.append("|-----------|----------|---------|--------------|")
+            for f in profile['slowest_files'][:10]:
+                md.append(f"| {Path(f['path']).name} | {f['wall_s']:.3f} | {f['cpu_s']:.3f} | {f['bytes']:,} |")
+            md.append("")
+
     return '\n'.join(md)
 
 
 if __name__ == "__main__":
     # 경로 설정 (명령줄 인자 또는 기본값)
-    if len(sys.argv) > 1:
-        PROJECT_PATH = sys.argv[1]
+    # --profile-rules: 규칙별 시간/정규식 호출 수까지 측정 (라인 단위 측정이라 분석이 느려짐)
+    profile_rules = '--profile-rules' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--profile-rules']
+    if args:
+        PROJECT_PATH = args[0]
     else:
         PROJECT_PATH = r"D:\00.Comapre\pollux_hcds_ald_mirror_ffff\Src_Diff\PLC\PM1\PM1"
 
-    # 분석 실행
-    analyzer = TwinCATSingleProjectAnalyzer(PROJECT_PATH)
-    report = analyzer.analyze()
+    # 분석 실행 (공통 분석 API)
+    from qa_api import analyze_project
+    report = analyze_project(PROJECT_PATH, profile_rules=profile_rules).to_dict()
 
     # 출력 디렉토리
     output_dir = Path(r"D:\01. Vscode\Twincat\features\twincat-code-qa-tool\output")
     output_dir.mkdir(exist_ok=True)
 
-    # JSON 저장
-    json_path = output_dir / "single_project_qa_report.json"
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(report, f, ensure_ascii=False, indent=2)
-    print(f"\nJSON 리포트: {json_path}")
-
-    # Markdown 저장
-    md_content = generate_markdown_report(report)
-    md_path = output_dir / "single_project_qa_report.md"
-    with open(md_path, 'w', encoding='utf-8') as f:
-        f.write(md_content)
-    print(f"Markdown 리포트: {md_path}")
+    # JSON(+ .tcqa)/Markdown/SARIF 동시 저장
+    from report_pipeline import run_pipeline
+    print()
+    run_pipeline(report, output_dir, ('json', 'markdown', 'sarif'), stem="single_project_qa_report")
 
     # 요약 출력
     print("\n" + "="*60)
@@ -719,3 +922,8 @@ if __name__ == "__main__":
     print(f"  🔴 Critical: {s['critical_count']}개")
     print(f"  🟡 Warning: {s['warning_count']}개")
     print(f"  🔵 Info: {s['info_count']}개")
+    if report.get('profile'):
+        print()
+        print("분석 프로파일:")
+        for line in format_profile(report['profile']):
+            print(f"  {line}")
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT 솔루션 단위 QA 분석 스크립트
+.sln/.tsproj 에 포함된 PLC 프로젝트를 워커 프로세스에서 동시에 분석하고 프로젝트별 내역이 있는 통합 리포트 생성
+워커는 여러 프로젝트를 이어서 처리하므로 컴파일된 규칙 정규식(re 캐시)을 프로젝트 간에 재사용
+"""
+
+import io
+import sys
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime
+
+from analyze_single_project import TwinCATSingleProjectAnalyzer
+from plc_solution import PlcProject, find_plc_projects
+
+def _analyze_plc_project(name: str, project_path: str, profile_rules: bool) -> Tuple[str, Dict]:
+    """워커: PLC 프로젝트 하나 분석 (개별 진행 출력은 숨김)"""
+    with redirect_stdout(io.StringIO()):
+        report = TwinCATSingleProjectAnalyzer(project_path, profile_rules).analyze()
+    return name, report
+
+
+class TwinCATSolutionAnalyzer:
+    """TwinCAT 솔루션 분석기 (PLC 프로젝트 N개 동시 분석)"""
+
+    def __init__(self, solution_path: str, max_workers: Optional[int] = None, profile_rules: bool = False):
+        self.solution_path = Path(solution_path)
+        self.max_workers = max_workers
+        self.profile_rules = profile_rules
+        self.projects: List[PlcProject] = []
+        self.reports: Dict[str, Dict] = {}
+        self.errors: Dict[str, str] = {}
+
+    def analyze(self) -> Dict:
+        """전체 분석 실행"""
+        print(f"{'='*60}")
+        print(f"TwinCAT 솔루션 QA 분석")
+        print(f"{'='*60}")
+        print(f"분석 대상: {self.solution_path}")
+        print(f"분석 시작: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print()
+
+        # 1. PLC 프로젝트 목록
+        print("[1/3] PLC 프로젝트 수집 중...")
+        self.projects = find_plc_projects(self.solution_path)
+        for project in self.projects:
+            print(f"  - {project.name}: {project.root}")
+        print(f"  - 총: {len(self.projects)}개")
+        print()
+
+        # 2. 프로젝트별 병렬 분석 (끝나는 순서대로 진행 표시)
+        print("[2/3] 프로젝트 병렬 분석 중...")
+        if self.projects:
+            workers = min(self.max_workers or len(self.projects), len(self.projects))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(_analyze_plc_project, project.name, str(project.root), self.profile_rules): project.name
+                    for project in self.projects
+                }
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        self.reports[name] = future.result()[1]
+                    except Exception as e:
+                        self.errors[name] = str(e)
+                        print(f"  - {name}: 분석 실패 - {e}")
+                        continue
+                    s = self.reports[name]['summary']
+                    print(f"  - {name}: 파일 {s['total_files']}개, QA 이슈 {s['total_issues']}개 "
+                          f"(Critical {s['critical_count']}개)")
+        print()
+
+        # 3. 통합 리포트
+        return self._generate_report()
+
+    def _generate_report(self) -> Dict:
+        """프로젝트별 내역 + 솔루션 합계 리포트 생성"""
+        print("[3/3] 통합 리포트 생성 중...")
+
+        projects = []
+        issues = []
+        by_rule: Counter = Counter()
+        rule_matrix: Dict[str, Dict[str, int]] = {}
+        for project in self.projects:
+            entry = {
+                "name": project.name,
+                "plcproj": str(project.plcproj),
+                "tsproj": str(project.tsproj) if project.tsproj else None,
+                "project_path": str(project.root),
+            }
+            report = self.reports.get(project.name)
+            if report is None:
+                entry["error"] = self.errors.get(project.name, "분석되지 않음")
+                projects.append(entry)
+                continue
+            entry["summary"] = report['summary']
+            entry["issues_by_rule"] = {rule_id: stat['count'] for rule_id, stat in report['issues_by_rule'].items()}
+            entry["profile"] = report.get('profile', {}).get('totals', {})
+            entry["discovery"] = report.get('discovery', {})
+            projects.append(entry)
+
+            for rule_id, count in entry["issues_by_rule"].items():
+                by_rule[rule_id] += count
+                rule_matrix.setdefault(rule_id, {})[project.name] = count
+            # 이슈 경로는 솔루션 내 프로젝트 이름으로 구분
+            issues.extend({"project": project.name, **issue} for issue in report['issues'])
+
+        analyzed = [entry["summary"] for entry in projects if "summary" in entry]
+        severity_counts = Counter(issue['severity'] for issue in issues)
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "analysis_type": "solution",
+            "solution_path": str(self.solution_path),
+            "summary": {
+                "total_projects": len(self.projects),
+                "analyzed_projects": len(analyzed),
+                "failed_projects": len(self.errors),
+                "total_files": sum(s['total_files'] for s in analyzed),
+                "total_lines": sum(s['total_lines'] for s in analyzed),
+                "total_issues": len(issues),
+                "critical_count": severity_counts['Critical'],
+                "warning_count": severity_counts['Warning'],
+                "info_count": severity_counts['Info'],
+                "by_rule": dict(by_rule.most_common()),
+            },
+            "projects": projects,
+            "rule_matrix": rule_matrix,
+            "issues": issues,
+        }
+
+
+def generate_markdown_report(report: Dict) -> str:
+    """솔루션 Markdown 리포트 (프로젝트별 요약 + 규칙 x 프로젝트 매트릭스)"""
+    s = report['summary']
+    names = [p['name'] for p in report['projects'] if 'summary' in p]
+    md = []
+    md.append("# TwinCAT Solution QA Report")
+    md.append("")
+    md.append(f"**분석 일시**: {report['generated_at']}")
+    md.append(f"**솔루션**: `{report['solution_path']}`")
+    md.append(f"**PLC 프로젝트**: {s['total_projects']}개 (실패 {s['failed_projects']}개)")
+    md.append("")
+
+    md.append("## 📊 솔루션 요약")
+    md.append("")
+    md.append("| 항목 | 값 |")
+    md.append("|------|-----|")
+    md.append(f"| 총 파일 | {s['total_files']}개 |")
+    md.append(f"| 총 코드 라인 | {s['total_lines']:,}줄 |")
+    md.append(f"| 총 QA 이슈 | {s['total_issues']}개 |")
+    md.append(f"| 🔴 Critical | {s['critical_count']}개 |")
+    md.append(f"| 🟡 Warning | {s['warning_count']}개 |")
+    md.append(f"| 🔵 Info | {s['info_count']}개 |")
+    md.append("")
+
+    md.append("## 📁 프로젝트별 요약")
+    md.append("")
+    md.append("| 프로젝트 | 파일 | 코드 라인 | QA 이슈 | 🔴 Critical | 🟡 Warning | 🔵 Info | 분석 시간 |")
+    md.append("|----------|------|-----------|---------|-------------|------------|---------|-----------|")
+    for project in report['projects']:
+        if 'summary' not in project:
+            md.append(f"| {project['name']} | ❌ {project['error']} | | | | | | |")
+            continue
+        p = project['summary']
+        wall = project.get('profile', {}).get('wall_s')
+        md.append(f"| {project['name']} | {p['total_files']} | {p['total_lines']:,} | {p['total_issues']} | "
+                  f"{p['critical_count']} | {p['warning_count']} | {p['info_count']} | "
+                  f"{f'{wall:.2f}s' if wall is not None else '-'} |")
+    md.append("")
+
+    if report['rule_matrix']:
+        md.append("## 🗺️ 규칙 x 프로젝트")
+        md.append("")
+        md.append("| 규칙 | 합계 | " + " | ".join(names) + " |")
+        md.append("|------|------|" + "|".join("---" for _ in names) + "|")
+        for rule_id, total in s['by_rule'].items():
+            row = report['rule_matrix'].get(rule_id, {})
+            md.append(f"| {rule_id} | {total} | " + " | ".join(str(row.get(name, '·')) for name in names) + " |")
+        md.append("")
+
+    critical = [i for i in report['issues'] if i['severity'] == 'Critical']
+    if critical:
+        md.append("## 🔴 Critical 이슈")
+        md.append("")
+        for issue in critical[:50]:
+            md.append(f"- **[{issue['project']}] {issue['rule_id']}** `{issue['file']}:{issue['line']}` - {issue['message']}")
+        if len(critical) > 50:
+            md.append(f"- ... 외 {len(critical) - 50}개")
+        md.append("")
+
+    return '\n'.join(md)
+
+
+if __name__ == "__main__":
+    # 사용법: python analyze_solution.py <.sln|.tsproj|.plcproj|폴더> [--workers=N] [--profile-rules] [--output=폴더]
+    args = []
+    max_workers = None
+    profile_rules = False
+    output_dir = Path(__file__).parent.parent / "output"
+    for arg in sys.argv[1:]:
+        key, _, value = arg.partition('=')
+        if key == '--workers':
+            max_workers = int(value)
+        elif key == '--profile-rules':
+            profile_rules = True
+        elif key == '--output':
+            output_dir = Path(value)
+        else:
+            args.append(arg)
+
+    if len(args) != 1:
+        print("사용법: python analyze_solution.py <.sln|.tsproj|.plcproj|폴더> [--workers=N] [--profile-rules] [--output=폴더]")
+        sys.exit(1)
+
+    analyzer = TwinCATSolutionAnalyzer(args[0], max_workers=max_workers, profile_rules=profile_rules)
+    report = analyzer.analyze()
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    json_path = output_dir / "solution_qa_report.json"
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"JSON 리포트 저장: {json_path}")
+
+    md_path = output_dir / "solution_qa_report.md"
+    with open(md_path, 'w', encoding='utf-8') as f:
+        f.write(generate_markdown_report(report))
+    print(f"Markdown 리포트 저장: {md_path}")
+
+    print("\n" + "="*60)
+    print("분석 완료!")
+    print("="*60)
+    s = report['summary']
+    print(f"PLC 프로젝트 {s['analyzed_projects']}/{s['total_projects']}개, 파일 {s['total_files']}개")
+    print(f"총 QA 이슈: {s['total_issues']}개 (Critical {s['critical_count']}개)")
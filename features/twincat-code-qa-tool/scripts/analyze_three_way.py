@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT 3-way 비교 분석 스크립트
+공통 기준(base) 대비 Source(ours) / Target(theirs) 변경 분류 및 충돌 구간 QA
+"""
+
+import sys
+import json
+from difflib import SequenceMatcher
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime
+
+from analyze_real_project import TwinCATQAAnalyzer, QAIssue
+from project_index import ProjectIndex, IndexedFile, build_indexes
+from st_declaration import VariableDecl
+
+# 변경 주체
+SIDE_OURS = "Ours"          # Source 쪽에서만 변경
+SIDE_THEIRS = "Theirs"      # Target 쪽에서만 변경
+SIDE_BOTH = "Both"          # 양쪽에서 동일하게 변경
+SIDE_CONFLICT = "Conflict"  # 양쪽에서 서로 다르게 변경
+SIDE_MERGED = "Merged"      # 양쪽에서 서로 다른 구간을 변경 (충돌 없이 병합됨)
+
+# 3-way 병합 대상 섹션 (IndexedFile 속성)
+MERGE_SECTIONS = {'Declaration': 'declaration', 'ST': 'st_code'}
+
+
+@dataclass
+class ThreeWayFileChange:
+    """3-way 파일 변경 정보"""
+    file_path: str
+    side: str  # Ours, Theirs, Both, Merged, Conflict
+    ours_change: str = ""  # Added, Deleted, Modified (base 대비)
+    theirs_change: str = ""
+    conflict_count: int = 0
+
+
+@dataclass
+class ThreeWayVariableChange:
+    """3-way 변수 변경 정보"""
+    file_path: str
+    var_name: str
+    side: str
+    scope: str = ""
+    base_type: str = ""
+    ours_type: str = ""
+    theirs_type: str = ""
+    base_value: str = ""
+    ours_value: str = ""
+    theirs_value: str = ""
+
+
+@dataclass
+class MergeChunk:
+    """3-way 병합 구간"""
+    kind: str  # Stable, Ours, Theirs, Both, Conflict
+    base: List[str] = field(default_factory=list)
+    ours: List[str] = field(default_factory=list)
+    theirs: List[str] = field(default_factory=list)
+    ours_start: int = 0  # ours 섹션에서 구간 시작 인덱스 (0부터)
+    theirs_start: int = 0
+
+
+def _classify_side(base, ours, theirs) -> Optional[str]:
+    """base/ours/theirs 값 비교 → 변경 주체 (변경 없으면 None)"""
+    if ours == theirs:
+        return None if ours == base else SIDE_BOTH
+    if ours == base:
+        return SIDE_THEIRS
+    if theirs == base:
+        return SIDE_OURS
+    return SIDE_CONFLICT
+
+
+def _matched_lines(base: List[str], other: List[str]) -> Dict[int, int]:
+    """base 라인 인덱스 → other 라인 인덱스 (일치 라인만)"""
+    matcher = SequenceMatcher(None, base, other, autojunk=False)
+    mapping = {}
+    for block in matcher.get_matching_blocks():
+        for k in range(block.size):
+            mapping[block.a + k] = block.b + k
+    return mapping
+
+
+def merge3(base: List[str], ours: List[str], theirs: List[str]) -> List[MergeChunk]:
+    """라인 단위 diff3 병합"""
+    ours_map = _matched_lines(base, ours)
+    theirs_map = _matched_lines(base, theirs)
+
+    chunks: List[MergeChunk] = []
+    b = o = t = 0
+    anchors = [i for i in range(len(base)) if i in ours_map and i in theirs_map]
+    for i in anchors + [len(base)]:
+        if i < len(base):
+            oi, ti = ours_map[i], theirs_map[i]
+            if oi < o or ti < t:
+                continue
+        else:
+            oi, ti = len(ours), len(theirs)
+
+        base_part, ours_part, theirs_part = base[b:i], ours[o:oi], theirs[t:ti]
+        if base_part or ours_part or theirs_part:
+            kind = _classify_side(base_part, ours_part, theirs_part) or "Stable"
+            chunks.append(MergeChunk(kind, base_part, ours_part, theirs_part, o, t))
+
+        if i < len(base):
+            if chunks and chunks[-1].kind == "Stable":
+                chunks[-1].base.append(base[i])
+            else:
+                chunks.append(MergeChunk("Stable", [base[i]]))
+        b, o, t = i + 1, oi + 1, ti + 1
+
+    return chunks
+
+
+def render_merged(chunks: List[MergeChunk]) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """병합 결과 라인 목록과 충돌 구간 (시작, 끝 라인 번호, 1부터) 반환"""
+    lines: List[str] = []
+    conflicts: List[Tuple[int, int]] = []
+    for chunk in chunks:
+        if chunk.kind == "Stable":
+            lines.extend(chunk.base)
+        elif chunk.kind == SIDE_THEIRS:
+            lines.extend(chunk.theirs)
+        elif chunk.kind in (SIDE_OURS, SIDE_BOTH):
+            lines.extend(chunk.ours)
+        else:
+            start = len(lines) + 1
+            lines.append('<<<<<<< source')
+            lines.extend(chunk.ours)
+            lines.append('=======')
+            lines.extend(chunk.theirs)
+            lines.append('>>>>>>> target')
+            conflicts.append((start, len(lines)))
+    return lines, conflicts
+
+
+class TwinCATThreeWayAnalyzer(TwinCATQAAnalyzer):
+    """TwinCAT 3-way 비교 분석기 (base, source, target)"""
+
+    def __init__(self, base_path: str, source_path: str, target_path: str):
+        super().__init__(source_path, target_path)
+        self.base_path = Path(base_path)
+        self.base_index = ProjectIndex(base_path)
+        self.ours_index = self.old_index
+        self.theirs_index = self.new_index
+        self.three_way_changes: List[ThreeWayFileChange] = []
+        self.three_way_variables: List[ThreeWayVariableChange] = []
+        self.conflicts: List[Dict] = []
+        # 충돌 파일의 섹션별 병합 결과
+        self.merges: Dict[str, Dict[str, List[MergeChunk]]] = {}
+
+    def analyze(self) -> Dict:
+        """전체 분석 실행"""
+        print(f"[3-way 분석 시작] {datetime.now()}")
+        print(f"  Base: {self.base_path}")
+        print(f"  Source: {self.old_path}")
+        print(f"  Target: {self.new_path}")
+        print()
+
+        # 1. 세 트리 동시 스캔/해시
+        print("[1/4] 세 트리 스캔 및 해시 중...")
+        build_indexes([self.base_index, self.ours_index, self.theirs_index])
+        print(f"  - Base: {len(self.base_index.files)}개, Source: {len(self.ours_index.files)}개, "
+              f"Target: {len(self.theirs_index.files)}개")
+        print()
+
+        # 2. 파일 변경 분류
+        self._classify_file_changes()
+
+        # 3. 변수 변경 분류
+        self._classify_variable_changes()
+
+        # 4. 충돌 구간 병합 및 QA
+        self._check_conflicts()
+
+        return self._generate_report()
+
+    def _classify_file_changes(self):
+        """파일 단위 변경 주체 분류"""
+        print("[2/4] 파일 변경 분류 중...")
+
+        all_paths = set(self.base_index.files) | set(self.ours_index.files) | set(self.theirs_index.files)
+        for rel_path in sorted(all_paths):
+            base = self.base_index.get(rel_path)
+            ours = self.ours_index.get(rel_path)
+            theirs = self.theirs_index.get(rel_path)
+
+            side = _classify_side(*(f.digest if f else None for f in (base, ours, theirs)))
+            if side is None:
+                continue
+
+            change = ThreeWayFileChange(
+                file_path=rel_path,
+                side=side,
+                ours_change=self._change_type(base, ours),
+                theirs_change=self._change_type(base, theirs)
+            )
+            if side == SIDE_CONFLICT:
+                # 양쪽 모두 바뀐 파일은 섹션별로 병합해 보고 실제 충돌 구간이 없으면 병합됨으로 분류
+                # (섹션이 없는 파일 - .plcproj 등 - 은 파일 단위 충돌로 유지)
+                merges = self._merge_sections(base, ours, theirs)
+                change.conflict_count = sum(
+                    1 for chunks in merges.values() for chunk in chunks if chunk.kind == SIDE_CONFLICT
+                )
+                if change.conflict_count:
+                    self.merges[rel_path] = merges
+                elif any(chunk.kind != "Stable" for chunks in merges.values() for chunk in chunks):
+                    change.side = SIDE_MERGED
+            self.three_way_changes.append(change)
+
+        for side in (SIDE_OURS, SIDE_THEIRS, SIDE_BOTH, SIDE_MERGED, SIDE_CONFLICT):
+            print(f"  - {side}: {len([c for c in self.three_way_changes if c.side == side])}개")
+        print()
+
+    def _classify_variable_changes(self):
+        """변경 파일의 변수 단위 변경 주체 분류"""
+        print("[3/4] 변수 변경 분류 중...")
+
+        empty: Dict[str, VariableDecl] = {}
+        for fc in self.three_way_changes:
+            tables = [
+                index.files[fc.file_path].variables if fc.file_path in index.files else empty
+                for index in (self.base_index, self.ours_index, self.theirs_index)
+            ]
+            for key in sorted(set(tables[0]) | set(tables[1]) | set(tables[2])):
+                base, ours, theirs = (table.get(key) for table in tables)
+                side = _classify_side(*(self._decl_signature(d) for d in (base, ours, theirs)))
+                if side is None:
+                    continue
+                named = ours or theirs or base
+                self.three_way_variables.append(ThreeWayVariableChange(
+                    file_path=fc.file_path,
+                    var_name=named.name,
+                    side=side,
+                    scope=named.scope,
+                    base_type=base.var_type if base else '',
+                    ours_type=ours.var_type if ours else '',
+                    theirs_type=theirs.var_type if theirs else '',
+                    base_value=base.initial_value if base else '',
+                    ours_value=ours.initial_value if ours else '',
+                    theirs_value=theirs.initial_value if theirs else ''
+                ))
+
+        for side in (SIDE_OURS, SIDE_THEIRS, SIDE_BOTH, SIDE_CONFLICT):
+            print(f"  - {side}: {len([v for v in self.three_way_variables if v.side == side])}개")
+        print()
+
+    def _check_conflicts(self):
+        """충돌 파일 병합 후 충돌 구간에만 QA 규칙 적용"""
+        print("[4/4] 충돌 구간 병합 및 QA 적용 중...")
+
+        for fc in self.three_way_changes:
+            if fc.file_path not in self.merges:
+                continue
+            with self.profiler.file(fc.file_path):
+                for section, chunks in self.merges[fc.file_path].items():
+                    for chunk in chunks:
+                        if chunk.kind == SIDE_CONFLICT:
+                            self._check_conflict_chunk(fc.file_path, section, chunk)
+
+        # 충돌 변수의 타입 축소
+        for vc in self.three_way_variables:
+            if vc.side != SIDE_CONFLICT:
+                continue
+            for side_type in (vc.ours_type, vc.theirs_type):
+                if self._is_type_narrowing(vc.base_type, side_type):
+                    self.qa_issues.append(QAIssue(
+                        rule_id="QA002",
+                        severity="Critical",
+                        file_path=vc.file_path,
+                        line=0,
+                        message=f"충돌 변수 '{vc.var_name}'의 타입이 {vc.base_type}에서 {side_type}로 축소됨",
+                        suggestion="병합 시 데이터 손실 가능성을 검토하세요"
+                    ))
+
+        print(f"  - 충돌 구간: {len(self.conflicts)}개")
+        print(f"  - QA 이슈: {len(self.qa_issues)}개")
+        print()
+
+    def _check_conflict_chunk(self, rel_path: str, section: str, chunk: MergeChunk):
+        """충돌 구간 기록 + 양쪽 구간 라인에 각각 QA 적용 (라인 번호는 각 쪽 섹션 기준)"""
+        self.conflicts.append({
+            "file": rel_path,
+            "section": section,
+            "ours_start": chunk.ours_start + 1,
+            "ours_end": chunk.ours_start + len(chunk.ours),
+            "theirs_start": chunk.theirs_start + 1,
+            "theirs_end": chunk.theirs_start + len(chunk.theirs),
+            "merged": '\n'.join(render_merged([chunk])[0])
+        })
+        # 라인 규칙은 구현부 대상
+        if section != 'ST':
+            return
+        for side, index, lines, start in ((SIDE_OURS, self.ours_index, chunk.ours, chunk.ours_start),
+                                          (SIDE_THEIRS, self.theirs_index, chunk.theirs, chunk.theirs_start)):
+            first = len(self.qa_issues)
+            self._check_qa_lines(((start + k + 1, line) for k, line in enumerate(lines)), rel_path)
+            for issue in self.qa_issues[first:]:
+                issue.side = side
+            if rel_path in index.files:
+                self._attribute_units(index.files[rel_path], first)
+
+    def _merge_sections(self, base: Optional[IndexedFile], ours: Optional[IndexedFile],
+                        theirs: Optional[IndexedFile]) -> Dict[str, List[MergeChunk]]:
+        """선언부/구현부 각각 3-way 병합 (없는 파일/섹션은 빈 목록)"""
+        merges = {}
+        for section, attr in MERGE_SECTIONS.items():
+            texts = [getattr(f, attr) if f else '' for f in (base, ours, theirs)]
+            if not any(texts):
+                continue
+            merges[section] = merge3(*(text.split('\n') if text else [] for text in texts))
+        return merges
+
+    def _change_type(self, base: Optional[IndexedFile], other: Optional[IndexedFile]) -> str:
+        """base 대비 변경 종류"""
+        if base is None:
+            return "Added" if other else ""
+        if other is None:
+            return "Deleted"
+        return "Modified" if base.digest != other.digest else ""
+
+    def _decl_signature(self, decl: Optional[VariableDecl]) -> Optional[Tuple[str, str, str, str]]:
+        """변수 비교 기준 (타입, 초기값, 스코프, 주소)"""
+        if decl is None:
+            return None
+        return decl.var_type, decl.initial_value, decl.scope, decl.address
+
+    def _generate_report(self) -> Dict:
+        """리포트 생성"""
+        def count(items, side):
+            return len([i for i in items if i.side == side])
+
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "base_folder": str(self.base_path),
+            "source_folder": str(self.old_path),
+            "target_folder": str(self.new_path),
+            "summary": {
+                "total_files_changed": len(self.three_way_changes),
+                "files_ours": count(self.three_way_changes, SIDE_OURS),
+                "files_theirs": count(self.three_way_changes, SIDE_THEIRS),
+                "files_both": count(self.three_way_changes, SIDE_BOTH),
+                "files_merged": count(self.three_way_changes, SIDE_MERGED),
+                "files_conflict": count(self.three_way_changes, SIDE_CONFLICT),
+                "total_variable_changes": len(self.three_way_variables),
+                "variables_ours": count(self.three_way_variables, SIDE_OURS),
+                "variables_theirs": count(self.three_way_variables, SIDE_THEIRS),
+                "variables_both": count(self.three_way_variables, SIDE_BOTH),
+                "variables_conflict": count(self.three_way_variables, SIDE_CONFLICT),
+                "conflict_sections": len(self.conflicts),
+                "total_qa_issues": len(self.qa_issues),
+                "critical_issues": len([i for i in self.qa_issues if i.severity == 'Critical']),
+                "warning_issues": len([i for i in self.qa_issues if i.severity == 'Warning']),
+                "info_issues": len([i for i in self.qa_issues if i.severity == 'Info']),
+            },
+            "file_changes": [
+                {
+                    "path": fc.file_path,
+                    "side": fc.side,
+                    "ours_change": fc.ours_change,
+                    "theirs_change": fc.theirs_change,
+                    "conflict_count": fc.conflict_count
+                }
+                for fc in self.three_way_changes
+            ],
+            "variable_changes": [
+                {
+                    "file": vc.file_path,
+                    "name": vc.var_name,
+                    "side": vc.side,
+                    "scope": vc.scope,
+                    "base_type": vc.base_type,
+                    "ours_type": vc.ours_type,
+                    "theirs_type": vc.theirs_type,
+                    "base_value": vc.base_value,
+                    "ours_value": vc.ours_value,
+                    "theirs_value": vc.theirs_value
+                }
+                for vc in self.three_way_variables
+            ],
+            "conflicts": self.conflicts,
+            "qa_issues": [
+                {
+                    "rule_id": issue.rule_id,
+                    "severity": issue.severity,
+                    "file": issue.file_path,
+                    "line": issue.line,
+                    "message": issue.message,
+                    "code": issue.code_snippet,
+                    "suggestion": issue.suggestion,
+                    **({"side": issue.side} if issue.side else {}),
+                    **({"unit": issue.unit, "unit_line": issue.unit_line} if issue.unit else {}),
+                }
+                for issue in self.qa_issues
+            ],
+            "skipped_checks": self.budget.to_records(),
+        }
+
+
+def generate_markdown_report(report: Dict) -> str:
+    """3-way Markdown 리포트 생성"""
+    md = []
+    md.append("# TwinCAT 3-way Compare QA Report")
+    md.append("")
+    md.append(f"**분석 일시**: {report['generated_at']}")
+    md.append(f"**Base**: `{report['base_folder']}`")
+    md.append(f"**Source (ours)**: `{report['source_folder']}`")
+    md.append(f"**Target (theirs)**: `{report['target_folder']}`")
+    md.append("")
+
+    s = report['summary']
+    md.append("## 📊 요약")
+    md.append("")
+    md.append("| 항목 | 파일 | 변수 |")
+    md.append("|------|------|------|")
+    md.append(f"| Source만 변경 (Ours) | {s['files_ours']}개 | {s['variables_ours']}개 |")
+    md.append(f"| Target만 변경 (Theirs) | {s['files_theirs']}개 | {s['variables_theirs']}개 |")
+    md.append(f"| 양쪽 동일 변경 (Both) | {s['files_both']}개 | {s['variables_both']}개 |")
+    md.append(f"| 양쪽 다른 구간 변경, 자동 병합 (Merged) | {s.get('files_merged', 0)}개 | - |")
+    md.append(f"| **충돌 (Conflict)** | **{s['files_conflict']}개** | **{s['variables_conflict']}개** |")
+    md.append("")
+    md.append(f"충돌 구간 {s['conflict_sections']}개에서 QA 이슈 {s['total_qa_issues']}개 "
+              f"(🔴 {s['critical_issues']} / 🟡 {s['warning_issues']} / 🔵 {s['info_issues']})")
+    md.append("")
+
+    conflict_files = [fc for fc in report['file_changes'] if fc['side'] == SIDE_CONFLICT]
+    if conflict_files:
+        md.append("## ⚔️ 충돌 파일")
+        md.append("")
+        md.append("| 파일 | Source | Target | 충돌 구간 |")
+        md.append("|------|--------|--------|-----------|")
+        for fc in conflict_files:
+            md.append(f"| `{fc['path']}` | {fc['ours_change']} | {fc['theirs_change']} | {fc['conflict_count']} |")
+        md.append("")
+
+    conflict_vars = [vc for vc in report['variable_changes'] if vc['side'] == SIDE_CONFLICT]
+    if conflict_vars:
+        md.append("## ⚔️ 충돌 변수")
+        md.append("")
+        md.append("| 파일 | 변수명 | Base | Source | Target |")
+        md.append("|------|--------|------|--------|--------|")
+        for vc in conflict_vars[:50]:
+            file_name = Path(vc['file']).name
+            md.append(f"| {file_name} | {vc['name']} | {vc['base_type']} {vc['base_value']} | "
+                      f"{vc['ours_type']} {vc['ours_value']} | {vc['theirs_type']} {vc['theirs_value']} |")
+        md.append("")
+
+    if report['qa_issues']:
+        md.append("## 🔍 충돌 구간 QA 이슈")
+        md.append("")
+        md.append("| 파일 | 쪽 | 라인 | 규칙 | 심각도 | 메시지 |")
+        md.append("|------|----|------|------|--------|--------|")
+        for issue in report['qa_issues'][:50]:
+            file_name = Path(issue['file']).name
+            md.append(f"| {file_name} | {issue.get('side', '-')} | {issue['line']} | {issue['rule_id']} | "
+                      f"{issue['severity']} | {issue['message']} |")
+        md.append("")
+
+    md.append("## 📁 변경 파일 목록")
+    md.append("")
+    icons = {SIDE_OURS: "⬅️", SIDE_THEIRS: "➡️", SIDE_BOTH: "↔️", SIDE_MERGED: "🔀", SIDE_CONFLICT: "⚔️"}
+    for fc in report['file_changes']:
+        md.append(f"- {icons.get(fc['side'], '?')} `{fc['path']}` ({fc['side']})")
+    md.append("")
+
+    return '\n'.join(md)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        print("사용법: python analyze_three_way.py <base> <source> <target> [output_dir]")
+        sys.exit(1)
+
+    analyzer = TwinCATThreeWayAnalyzer(sys.argv[1], sys.argv[2], sys.argv[3])
+    report = analyzer.analyze()
+
+    output_dir = Path(sys.argv[4]) if len(sys.argv) > 4 else Path(__file__).parent.parent / "output"
+    output_dir.mkdir(exist_ok=True)
+
+    json_path = output_dir / "three_way_qa_report.json"
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"JSON 리포트 저장: {json_path}")
+
+    md_path = output_dir / "three_way_qa_report.md"
+    with open(md_path, 'w', encoding='utf-8') as f:
+        f.write(generate_markdown_report(report))
+    print(f"Markdown 리포트 저장: {md_path}")
+
+    s = report['summary']
+    print("\n" + "="*60)
+    print("분석 완료!")
+    print("="*60)
+    print(f"충돌 파일: {s['files_conflict']}개, 충돌 변수: {s['variables_conflict']}개")
+    print(f"충돌 구간 QA 이슈: {s['total_qa_issues']}개")
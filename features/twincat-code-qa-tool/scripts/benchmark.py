@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT QA 분석기 벤치마크
+합성 프로젝트에 단일 분석/비교 분석/리포트 생성을 반복 실행하고 처리량(files/s, lines/s), 최대 RSS,
+단계별 시간을 결과 JSON 으로 기록 (실행마다 새 프로세스를 띄워 메모리/캐시가 섞이지 않게 함)
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from synthetic_project import SyntheticProject, SyntheticSpec, generate_project, generate_revision
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 결과 파일 형식 버전
+RESULTS_FORMAT = 1
+
+BENCHMARK_CASES = ('single', 'compare', 'reports')
+
+# 리포트 생성 벤치마크 형식 (report_pipeline 렌더러 이름)
+REPORT_FORMATS = ('json', 'markdown', 'html', 'detailed-md', 'csv', 'sarif')
+
+# 결과 파일 기본 위치 (run-performance-benchmark.ps1 과 같은 폴더)
+RESULTS_DIR = Path(__file__).resolve().parent.parent / "benchmark-results"
+
+# 리포트 벤치마크 입력 (단일 분석 결과를 한 번 저장해 두고 재사용)
+SINGLE_REPORT_FILE = "single_report.json"
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    """벤치마크 실행 조건"""
+    spec: SyntheticSpec = SyntheticSpec()
+    cases: Tuple[str, ...] = BENCHMARK_CASES
+    repeat: int = 3
+    change_ratio: float = 0.1  # 비교 분석 Target 의 변경 파일 비율
+    profile_rules: bool = False  # 단일 분석 규칙별 시간까지 측정
+    report_formats: Tuple[str, ...] = REPORT_FORMATS
+
+
+@dataclass
+class BenchmarkWorkspace:
+    """벤치마크 입력 경로"""
+    root: str
+    source: SyntheticProject
+    target: Optional[SyntheticProject] = None
+    single_report: str = ""
+
+
+# === 측정 도구 ===
+
+def _windows_peak_rss() -> int:
+    """Windows PeakWorkingSetSize (bytes)"""
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t),
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb)
+    return counters.PeakWorkingSetSize
+
+
+def peak_rss_mb() -> Optional[float]:
+    """현재 프로세스의 최대 RSS (MiB, 측정할 수 없으면 None)"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 는 bytes, Linux 는 KiB
+        return round(peak / (1 << 20) if sys.platform == 'darwin' else peak / (1 << 10), 1)
+    if sys.platform == 'win32':
+        return round(_windows_peak_rss() / (1 << 20), 1)
+    return None
+
+
+def git_revision() -> str:
+    """스크립트 저장소의 현재 커밋 (작업 트리 변경이 있으면 '+dirty')"""
+    cwd = Path(__file__).resolve().parent
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=cwd,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no', '.'], cwd=cwd,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return revision + ('+dirty' if dirty else '')
+
+
+# === 벤치마크 케이스 (워커 프로세스에서 실행) ===
+
+def _case_single(workspace: BenchmarkWorkspace, config: BenchmarkConfig) -> Dict:
+    """단일 프로젝트 분석"""
+    from analyze_single_project import TwinCATSingleProjectAnalyzer
+    report = TwinCATSingleProjectAnalyzer(workspace.source.root, config.profile_rules).analyze()
+    profile = report['profile']
+    return {
+        "issues": len(report['issues']),
+        "phases": {name: stat['wall_s'] for name, stat in profile['phases'].items()},
+        "rules": {rule_id: stat['wall_s'] for rule_id, stat in profile['rules'].items()},
+        "regex_calls": profile['totals']['regex_calls'],
+    }
+
+
+def _case_compare(workspace: BenchmarkWorkspace, config: BenchmarkConfig) -> Dict:
+    """Source → Target 비교 분석 (인덱싱 포함)"""
+    from analyze_real_project import TwinCATQAAnalyzer
+    report = TwinCATQAAnalyzer(workspace.source.root, workspace.target.root).analyze()
+    return {
+        "issues": len(report['qa_issues']),
+        "phases": {name: stat['wall_s'] for name, stat in report['profile']['phases'].items()},
+    }
+
+
+def _case_reports(workspace: BenchmarkWorkspace, config: BenchmarkConfig) -> Dict:
+    """저장된 단일 분석 리포트 → 각 형식 (형식별 시간을 단계로 기록, 로드 시간 제외)"""
+    from report_pipeline import RENDERERS, PipelineOptions, supported_formats
+    from report_store import load_report_file
+    report = load_report_file(workspace.single_report)
+    options = PipelineOptions(project_path=workspace.source.root)
+    phases = {}
+    with tempfile.TemporaryDirectory(prefix='tcqa_bench_') as output_dir:
+        for name in supported_formats(report, config.report_formats):
+            started = time.perf_counter()
+            renderer = RENDERERS[name]
+            renderer.render(report, Path(output_dir) / renderer.file_name.format(stem='bench'), options)
+            phases[name] = round(time.perf_counter() - started, 6)
+    return {"issues": len(report['issues']), "phases": phases}
+
+
+BENCHMARK_RUNNERS: Dict[str, Callable[[BenchmarkWorkspace, BenchmarkConfig], Dict]] = {
+    'single': _case_single,
+    'compare': _case_compare,
+    'reports': _case_reports,
+}
+
+
+def _run_case(case: str, workspace: BenchmarkWorkspace, config: BenchmarkConfig) -> Dict:
+    """워커: 케이스 한 번 실행 → 측정값 (분석기 진행 출력은 버림)"""
+    base_rss = peak_rss_mb()
+    wall, cpu = time.perf_counter(), time.process_time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = BENCHMARK_RUNNERS[case](workspace, config)
+    return {
+        "wall_s": round(time.perf_counter() - wall, 6),
+        "cpu_s": round(time.process_time() - cpu, 6),
+        "base_rss_mb": base_rss,
+        "peak_rss_mb": peak_rss_mb(),
+        **result,
+    }
+
+
+# === 실행 ===
+
+def prepare_workspace(root, config: BenchmarkConfig) -> BenchmarkWorkspace:
+    """합성 프로젝트 (조건이 같으면 재사용) + 리포트 벤치마크용 단일 분석 결과"""
+    root = Path(root)
+    workspace = BenchmarkWorkspace(str(root), generate_project(root / "source", config.spec))
+    if 'compare' in config.cases:
+        workspace.target = generate_revision(root / "target", config.spec, config.change_ratio)
+    if 'reports' in config.cases:
+        from analyze_single_project import TwinCATSingleProjectAnalyzer
+        from report_store import store_path_for, write_report_store
+        report_path = root / SINGLE_REPORT_FILE
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = TwinCATSingleProjectAnalyzer(workspace.source.root).analyze()
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False)
+        write_report_store(report, store_path_for(report_path))
+        workspace.single_report = str(report_path)
+    return workspace
+
+
+def _case_size(case: str, workspace: BenchmarkWorkspace) -> Tuple[int, int]:
+    """처리량 기준 (파일 수, 라인 수) - 비교 분석은 두 트리 합"""
+    projects = [workspace.source]
+    if case == 'compare':
+        projects.append(workspace.target)
+    return sum(p.files for p in projects), sum(p.lines for p in projects)
+
+
+def summarize_runs(runs: List[Dict], files: int, lines: int) -> Dict:
+    """반복 실행 요약 (중앙값 기준)"""
+    walls = [run['wall_s'] for run in runs]
+    median = statistics.median(walls)
+    peaks = [run['peak_rss_mb'] for run in runs if run['peak_rss_mb'] is not None]
+    return {
+        "wall_s_median": round(median, 6),
+        "wall_s_min": round(min(walls), 6),
+        "wall_s_stdev": round(statistics.stdev(walls), 6) if len(walls) > 1 else 0.0,
+        "files_per_s": round(files / median, 1) if median else None,
+        "lines_per_s": round(lines / median, 1) if median else None,
+        "peak_rss_mb": max(peaks) if peaks else None,
+    }
+
+
+def run_benchmark(config: BenchmarkConfig, workdir) -> Dict:
+    """벤치마크 전체 실행 → 결과 dict"""
+    unknown = [case for case in config.cases if case not in BENCHMARK_RUNNERS]
+    if unknown:
+        raise ValueError(f"알 수 없는 벤치마크: {', '.join(unknown)} (지원: {', '.join(BENCHMARK_RUNNERS)})")
+
+    print("[1/2] 합성 프로젝트 준비 중...")
+    started = time.perf_counter()
+    workspace = prepare_workspace(workdir, config)
+    print(f"  - Source: {workspace.source.files}개 파일, {workspace.source.lines:,}줄")
+    if workspace.target:
+        print(f"  - Target: {workspace.target.files}개 파일, {workspace.target.lines:,}줄")
+    print(f"  - 준비: {time.perf_counter() - started:.2f}s")
+    print()
+
+    print(f"[2/2] 벤치마크 실행 중 ({config.repeat}회 반복)...")
+    cases = {}
+    # 실행마다 새 프로세스 (spawn: 부모 메모리를 물려받지 않아 최대 RSS 가 실행 단위로 측정됨)
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as pool:
+        for case in config.cases:
+            runs = []
+            for _ in range(config.repeat):
+                runs.append(pool.submit(_run_case, case, workspace, config).result())
+            files, lines = _case_size(case, workspace)
+            cases[case] = {"files": files, "lines": lines, "runs": runs,
+                           "summary": summarize_runs(runs, files, lines)}
+            s = cases[case]['summary']
+            print(f"  - {case}: {s['wall_s_median']:.3f}s (중앙값), {s['files_per_s']} files/s, "
+                  f"{s['lines_per_s']} lines/s, 최대 RSS {s['peak_rss_mb']} MiB")
+    print()
+
+    return {
+        "format": RESULTS_FORMAT,
+        "created_at": datetime.now().isoformat(),
+        "revision": git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {**asdict(config), "spec": asdict(config.spec)},
+        "projects": {
+            "source": asdict(workspace.source),
+            **({"target": asdict(workspace.target)} if workspace.target else {}),
+        },
+        "cases": cases,
+    }
+
+
+def write_results(results: Dict, path=None) -> Path:
+    """결과 JSON 저장 (경로를 주지 않으면 benchmark-results/benchmark_<시각>.json)"""
+    if path is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    path = Path(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return path
+
+
+# 명령줄 옵션 → SyntheticSpec 필드
+SPEC_OPTIONS = {
+    '--files': ('files', int),
+    '--density': ('issue_density', float),
+    '--lines': ('lines_per_pou', int),
+    '--nesting': ('nesting_depth', int),
+    '--case-branches': ('case_branches', int),
+    '--giant-case': ('giant_case_ratio', float),
+    '--seed': ('seed', int),
+}
+
+
+if __name__ == "__main__":
+    # 사용법: python benchmark.py [--files=N] [--density=F] [--lines=N] [--nesting=N] [--case-branches=N]
+    #         [--giant-case=F] [--seed=N] [--repeat=N] [--cases=single,compare,reports] [--change-ratio=F]
+    #         [--profile-rules] [--workdir=DIR] [--output=PATH]
+    spec_args = {}
+    config_args = {}
+    workdir = Path(tempfile.gettempdir()) / "twincat_qa_benchmark"
+    output = None
+    for arg in sys.argv[1:]:
+        key, _, value = arg.partition('=')
+        if key in SPEC_OPTIONS:
+            name, convert = SPEC_OPTIONS[key]
+            spec_args[name] = convert(value)
+        elif key == '--repeat':
+            config_args['repeat'] = int(value)
+        elif key == '--cases':
+            config_args['cases'] = tuple(case for case in value.split(',') if case)
+        elif key == '--change-ratio':
+            config_args['change_ratio'] = float(value)
+        elif key == '--profile-rules':
+            config_args['profile_rules'] = True
+        elif key == '--workdir':
+            workdir = Path(value)
+        elif key == '--output':
+            output = value
+        else:
+            print(f"알 수 없는 옵션: {arg}")
+            sys.exit(1)
+
+    config = BenchmarkConfig(spec=SyntheticSpec(**spec_args), **config_args)
+    print(f"{'='*60}")
+    print("TwinCAT QA 벤치마크")
+    print(f"{'='*60}")
+    print(f"작업 폴더: {workdir}")
+    print(f"규모: {config.spec.files}개 파일, 이슈 밀도 {config.spec.issue_density}, 시드 {config.spec.seed}")
+    print()
+
+    results = run_benchmark(config, workdir)
+    print(f"결과 파일: {write_results(results, output)}")
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT QA 벤치마크 회귀 판정
+두 벤치마크 결과(benchmark.py)의 반복 실행값으로 케이스/단계/규칙별 시간과 최대 RSS 의 변화 비율 신뢰구간을 구하고,
+구간 전체가 허용 한계를 넘는 항목만 회귀로 판정 (단일 측정값 비교로 인한 오탐 방지)
+케이스 안의 지표 여러 개를 동시에 검정하므로 신뢰수준은 Bonferroni 보정, 시간은 절대 변화량 하한도 적용
+"""
+
+import json
+import math
+import statistics
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from statistics import NormalDist
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# 기본 신뢰수준
+CONFIDENCE = 0.95
+
+# 회귀로 보는 최소 변화 비율 (시간/메모리)
+TIME_THRESHOLD = 0.05
+MEMORY_THRESHOLD = 0.05
+
+# 기준 결과에서 이보다 짧은 단계/규칙은 측정 잡음이 커서 판정 제외 (초)
+MIN_SECONDS = 0.01
+
+# 회귀/개선으로 보는 최소 시간 변화량 (중앙값 차이, 초) - 비율만 크고 실제 차이는 미미한 경우 제외
+MIN_SLOWDOWN = 0.01
+
+# 로그 변환 시 0 값 하한
+_FLOOR = 1e-9
+
+# 판정 결과
+REGRESSION = 'regression'
+IMPROVEMENT = 'improvement'
+UNCHANGED = 'unchanged'
+INCONCLUSIVE = 'inconclusive'  # 반복 수 부족 또는 신뢰구간이 허용 한계에 걸침
+
+
+@dataclass
+class MetricComparison:
+    """지표 하나의 비교 결과 (ratio = 새 결과 / 기준 결과)"""
+    case: str
+    metric: str  # wall, peak_rss, phase:<이름>, rule:<ID>
+    base_median: float
+    new_median: float
+    ratio: float
+    ratio_low: float
+    ratio_high: float
+    status: str
+
+
+def t_quantile(p: float, df: float) -> float:
+    """Student t 분포 분위수 (df>=2 는 Cornish-Fisher 전개, 그 미만은 df=1 정확값으로 보수적으로)"""
+    if df < 2:
+        return math.tan(math.pi * (p - 0.5))
+    z = NormalDist().inv_cdf(p)
+    return (z
+            + (z ** 3 + z) / (4 * df)
+            + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3)
+            + (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / (92160 * df ** 4))
+
+
+def ratio_interval(base: Sequence[float], new: Sequence[float],
+                   confidence: float = CONFIDENCE) -> Optional[Tuple[float, float, float]]:
+    """두 표본의 기하평균 비율(new/base)과 신뢰구간 (로그값에 Welch t 구간)
+
+    실행 시간은 오른쪽 꼬리가 긴 분포라 로그 변환 후 비교합니다. 양쪽 모두 2회 미만이면 None.
+    """
+    if len(base) < 2 or len(new) < 2:
+        return None
+    log_base = [math.log(max(value, _FLOOR)) for value in base]
+    log_new = [math.log(max(value, _FLOOR)) for value in new]
+    diff = statistics.fmean(log_new) - statistics.fmean(log_base)
+    var_base = statistics.variance(log_base) / len(log_base)
+    var_new = statistics.variance(log_new) / len(log_new)
+    se = math.sqrt(var_base + var_new)
+    if se == 0:
+        return math.exp(diff), math.exp(diff), math.exp(diff)
+    # Welch–Satterthwaite 자유도
+    df = se ** 4 / (var_base ** 2 / (len(log_base) - 1) + var_new ** 2 / (len(log_new) - 1))
+    margin = t_quantile(0.5 + confidence / 2, df) * se
+    return math.exp(diff), math.exp(diff - margin), math.exp(diff + margin)
+
+
+def classify(low: float, high: float, threshold: float, delta: Optional[float] = None,
+             min_delta: float = 0.0) -> str:
+    """신뢰구간 → 판정 (구간 전체가 한계 밖이고, delta 가 주어지면 절대 변화량도 min_delta 이상일 때만 회귀/개선)"""
+    if low > 1 + threshold:
+        return REGRESSION if delta is None or delta >= min_delta else UNCHANGED
+    if high < 1 - threshold:
+        return IMPROVEMENT if delta is None or -delta >= min_delta else UNCHANGED
+    if low >= 1 - threshold and high <= 1 + threshold:
+        return UNCHANGED
+    return INCONCLUSIVE
+
+
+def _metric_samples(runs: List[Dict]) -> Iterator[Tuple[str, List[float]]]:
+    """실행 기록 → (지표 이름, 실행별 값) - 모든 실행에 있는 지표만"""
+    yield 'wall', [run['wall_s'] for run in runs]
+    if all(run.get('peak_rss_mb') is not None for run in runs):
+        yield 'peak_rss', [run['peak_rss_mb'] for run in runs]
+    for group, prefix in (('phases', 'phase'), ('rules', 'rule')):
+        names = set.intersection(*(set(run.get(group) or {}) for run in runs)) if runs else set()
+        for name in sorted(names):
+            yield f"{prefix}:{name}", [run[group][name] for run in runs]
+
+
+def compare_results(base: Dict, new: Dict, confidence: float = CONFIDENCE,
+                    time_threshold: float = TIME_THRESHOLD, memory_threshold: float = MEMORY_THRESHOLD,
+                    min_seconds: float = MIN_SECONDS, min_slowdown: float = MIN_SLOWDOWN) -> List[MetricComparison]:
+    """두 벤치마크 결과의 공통 케이스/지표 비교
+
+    케이스마다 판정하는 지표 m 개에 Bonferroni 보정 신뢰수준 1 - (1 - confidence) / m 을 적용해
+    케이스 전체의 오탐 확률을 1 - confidence 이하로 유지합니다.
+    """
+    comparisons = []
+    for case in base['cases']:
+        if case not in new['cases']:
+            continue
+        new_samples = dict(_metric_samples(new['cases'][case]['runs']))
+        metrics = []
+        for metric, base_values in _metric_samples(base['cases'][case]['runs']):
+            new_values = new_samples.get(metric)
+            if new_values is None:
+                continue
+            if metric != 'peak_rss' and statistics.median(base_values) < min_seconds:
+                continue
+            metrics.append((metric, base_values, new_values))
+
+        case_confidence = 1 - (1 - confidence) / max(len(metrics), 1)
+        for metric, base_values, new_values in metrics:
+            base_median, new_median = statistics.median(base_values), statistics.median(new_values)
+            interval = ratio_interval(base_values, new_values, case_confidence)
+            if interval is None:
+                ratio = new_median / max(base_median, _FLOOR)
+                comparisons.append(MetricComparison(case, metric, base_median, new_median,
+                                                    ratio, ratio, ratio, INCONCLUSIVE))
+                continue
+            ratio, low, high = interval
+            if metric == 'peak_rss':
+                status = classify(low, high, memory_threshold)
+            else:
+                status = classify(low, high, time_threshold, new_median - base_median, min_slowdown)
+            comparisons.append(MetricComparison(case, metric, base_median, new_median, ratio, low, high, status))
+    return comparisons
+
+
+def config_mismatches(base: Dict, new: Dict) -> List[str]:
+    """비교 의미가 없어지는 조건 차이 (합성 프로젝트 조건, 반복 외 실행 조건)"""
+    keys = [key for key in base.get('config', {}) if key != 'repeat']
+    return [key for key in keys if base['config'].get(key) != new.get('config', {}).get(key)]
+
+
+def format_comparison(item: MetricComparison) -> str:
+    """비교 결과 한 줄"""
+    unit = 'MiB' if item.metric == 'peak_rss' else 's'
+    icon = {REGRESSION: '🔴', IMPROVEMENT: '🟢', UNCHANGED: '⚪', INCONCLUSIVE: '🟡'}[item.status]
+    return (f"{icon} {item.case:8} {item.metric:24} {item.base_median:10.4f}{unit} → {item.new_median:10.4f}{unit}  "
+            f"x{item.ratio:.3f} [{item.ratio_low:.3f}, {item.ratio_high:.3f}]  {item.status}")
+
+
+if __name__ == "__main__":
+    # 사용법: python benchmark_compare.py <기준 결과.json> <새 결과.json> [--confidence=0.95] [--threshold=0.05]
+    #         [--memory-threshold=0.05] [--min-time=0.01] [--min-slowdown=0.01] [--output=비교.json] [--all]
+    # 회귀가 하나라도 있으면 종료 코드 1 (CI 게이트)
+    options = {}
+    args = []
+    output = None
+    show_all = False
+    for arg in sys.argv[1:]:
+        key, _, value = arg.partition('=')
+        if key == '--confidence':
+            options['confidence'] = float(value)
+        elif key == '--threshold':
+            options['time_threshold'] = float(value)
+        elif key == '--memory-threshold':
+            options['memory_threshold'] = float(value)
+        elif key == '--min-time':
+            options['min_seconds'] = float(value)
+        elif key == '--min-slowdown':
+            options['min_slowdown'] = float(value)
+        elif key == '--output':
+            output = value
+        elif key == '--all':
+            show_all = True
+        else:
+            args.append(arg)
+
+    if len(args) != 2:
+        print("사용법: python benchmark_compare.py <기준 결과.json> <새 결과.json> [--confidence=0.95] "
+              "[--threshold=0.05] [--memory-threshold=0.05] [--min-time=0.01] [--min-slowdown=0.01] "
+              "[--output=비교.json] [--all]")
+        sys.exit(2)
+
+    base, new = (json.loads(Path(path).read_text(encoding='utf-8')) for path in args)
+    print(f"기준: {args[0]} ({base.get('revision') or '-'}), 비교: {args[1]} ({new.get('revision') or '-'})")
+    mismatches = config_mismatches(base, new)
+    if mismatches:
+        print(f"⚠️ 실행 조건이 다릅니다: {', '.join(mismatches)} - 결과 비교가 정확하지 않을 수 있습니다")
+    print()
+
+    comparisons = compare_results(base, new, **options)
+    for item in comparisons:
+        if show_all or item.status != UNCHANGED:
+            print(format_comparison(item))
+
+    counts = {status: sum(1 for item in comparisons if item.status == status)
+              for status in (REGRESSION, IMPROVEMENT, INCONCLUSIVE, UNCHANGED)}
+    print()
+    print(f"회귀 {counts[REGRESSION]}, 개선 {counts[IMPROVEMENT]}, 판단 보류 {counts[INCONCLUSIVE]}, "
+          f"변화 없음 {counts[UNCHANGED]} (지표 {len(comparisons)}개)")
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({"base": args[0], "new": args[1], "config_mismatches": mismatches, "counts": counts,
+                       "comparisons": [asdict(item) for item in comparisons]}, f, ensure_ascii=False, indent=2)
+
+    sys.exit(1 if counts[REGRESSION] else 0)
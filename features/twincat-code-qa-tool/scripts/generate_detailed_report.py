@@ -9,44 +9,65 @@ TwinCAT QA 상세 리포트 생성기
 """
 
 import json
+import hashlib
 import html
+import re
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from array import array
+from collections.abc import Sequence
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from report_store import load_report_file
+from rule_catalog import rule_info
+from source_context import CONTEXT_LINES, ContextLine, SourceContext
+from st_highlight import highlight_st
+
+# 스트리밍 기록 시 파일 버퍼 크기
+WRITE_BUFFER_SIZE = 1 << 20
+
+# 이스케이프된 코드 조각/파일명 캐시 크기 (같은 라인이 수백 파일에 반복되는 리포트 대비)
+SNIPPET_CACHE_SIZE = 1 << 16
+
+# 상세 리포트가 사용하는 테이블/컬럼 (.tcqa 에서는 이 컬럼만 읽음)
+DETAILED_REPORT_TABLES = {
+    'issues': ('severity', 'rule_id', 'file', 'line', 'message', 'code', 'suggestion'),
+    'files': ('name', 'pou_type', 'lines', 'complexity', 'issue_count'),
+}
+
 
 def load_report(json_path: str) -> dict:
-    """JSON 리포트 로드"""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """리포트 로드 - issues 는 요소 단위로 읽어 바로 IssueTable 로 압축 (전체 이슈 dict 목록을 만들지 않음)
 
-def generate_detailed_html_report(report: dict, project_path: str) -> str:
-    """상세 HTML 리포트 생성"""
+    .tcqa 또는 옆에 최신 .tcqa 가 있는 JSON 은 필요한 컬럼만 읽습니다.
+    """
+    return load_report_file(json_path, DETAILED_REPORT_TABLES, consumers={'issues': IssueTable.from_issues})
 
-    # 파일별 이슈 그룹핑
-    issues_by_file = defaultdict(list)
-    for issue in report['issues']:
-        issues_by_file[issue['file']].append(issue)
 
-    # 규칙별 이슈 그룹핑
-    issues_by_rule = defaultdict(list)
-    for issue in report['issues']:
-        issues_by_rule[issue['rule_id']].append(issue)
+@lru_cache(maxsize=SNIPPET_CACHE_SIZE)
+def escape_html(text: str) -> str:
+    """HTML 이스케이프 (반복되는 메시지/코드는 캐시)"""
+    return html.escape(text)
 
-    # 심각도별 그룹핑
-    issues_by_severity = defaultdict(list)
-    for issue in report['issues']:
-        issues_by_severity[issue['severity']].append(issue)
 
-    s = report['summary']
+@lru_cache(maxsize=SNIPPET_CACHE_SIZE)
+def snippet_html(code: str, limit: Optional[int] = None) -> str:
+    """코드 조각 → <code> 안에 넣을 ST 구문 강조 HTML (limit 글자까지)"""
+    return highlight_st(code[:limit])
 
-    html_content = f'''<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>TwinCAT QA 상세 분석 리포트</title>
-    <style>
-        :root {{
+
+@lru_cache(maxsize=SNIPPET_CACHE_SIZE)
+def file_name_html(file_path: str) -> str:
+    """파일 경로 → 이스케이프된 파일명"""
+    return escape_html(Path(file_path).name)
+
+
+# 모든 페이지 공통 스타일 (분할 모드에서는 report.css 로 한 번만 기록)
+REPORT_CSS = '''
+        :root {
             --critical-color: #dc3545;
             --warning-color: #ffc107;
             --info-color: #17a2b8;
@@ -56,78 +77,78 @@ def generate_detailed_html_report(report: dict, project_path: str) -> str:
             --text-primary: #eee;
             --text-secondary: #aaa;
             --border-color: #0f3460;
-        }}
+        }
 
-        * {{ box-sizing: border-box; margin: 0; padding: 0; }}
+        * { box-sizing: border-box; margin: 0; padding: 0; }
 
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             background: var(--bg-dark);
             color: var(--text-primary);
             line-height: 1.6;
-        }}
+        }
 
-        .container {{
+        .container {
             max-width: 1400px;
             margin: 0 auto;
             padding: 20px;
-        }}
+        }
 
-        header {{
+        header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             padding: 30px;
             border-radius: 10px;
             margin-bottom: 30px;
             box-shadow: 0 4px 15px rgba(0,0,0,0.3);
-        }}
+        }
 
-        header h1 {{
+        header h1 {
             font-size: 2em;
             margin-bottom: 10px;
-        }}
+        }
 
-        header .meta {{
+        header .meta {
             opacity: 0.9;
             font-size: 0.9em;
-        }}
+        }
 
-        .summary-grid {{
+        .summary-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin-bottom: 30px;
-        }}
+        }
 
-        .summary-card {{
+        .summary-card {
             background: var(--bg-card);
             border-radius: 10px;
             padding: 20px;
             text-align: center;
             border: 1px solid var(--border-color);
-        }}
+        }
 
-        .summary-card.critical {{ border-left: 4px solid var(--critical-color); }}
-        .summary-card.warning {{ border-left: 4px solid var(--warning-color); }}
-        .summary-card.info {{ border-left: 4px solid var(--info-color); }}
+        .summary-card.critical { border-left: 4px solid var(--critical-color); }
+        .summary-card.warning { border-left: 4px solid var(--warning-color); }
+        .summary-card.info { border-left: 4px solid var(--info-color); }
 
-        .summary-card .number {{
+        .summary-card .number {
             font-size: 2.5em;
             font-weight: bold;
             margin-bottom: 5px;
-        }}
+        }
 
-        .summary-card.critical .number {{ color: var(--critical-color); }}
-        .summary-card.warning .number {{ color: var(--warning-color); }}
-        .summary-card.info .number {{ color: var(--info-color); }}
+        .summary-card.critical .number { color: var(--critical-color); }
+        .summary-card.warning .number { color: var(--warning-color); }
+        .summary-card.info .number { color: var(--info-color); }
 
-        .tabs {{
+        .tabs {
             display: flex;
             gap: 10px;
             margin-bottom: 20px;
             flex-wrap: wrap;
-        }}
+        }
 
-        .tab-btn {{
+        .tab-btn {
             padding: 10px 20px;
             background: var(--bg-card);
             border: 1px solid var(--border-color);
@@ -135,94 +156,94 @@ def generate_detailed_html_report(report: dict, project_path: str) -> str:
             color: var(--text-primary);
             cursor: pointer;
             transition: all 0.3s;
-        }}
+        }
 
-        .tab-btn:hover, .tab-btn.active {{
+        .tab-btn:hover, .tab-btn.active {
             background: #667eea;
             border-color: #667eea;
-        }}
+        }
 
-        .tab-content {{
+        .tab-content {
             display: none;
-        }}
+        }
 
-        .tab-content.active {{
+        .tab-content.active {
             display: block;
-        }}
+        }
 
-        .section {{
+        .section {
             background: var(--bg-card);
             border-radius: 10px;
             padding: 20px;
             margin-bottom: 20px;
             border: 1px solid var(--border-color);
-        }}
+        }
 
-        .section h2 {{
+        .section h2 {
             color: #667eea;
             margin-bottom: 15px;
             padding-bottom: 10px;
             border-bottom: 1px solid var(--border-color);
-        }}
+        }
 
-        .section h3 {{
+        .section h3 {
             color: var(--text-primary);
             margin: 15px 0 10px 0;
             font-size: 1.1em;
-        }}
+        }
 
-        .issue-card {{
+        .issue-card {
             background: rgba(0,0,0,0.2);
             border-radius: 8px;
             padding: 15px;
             margin-bottom: 15px;
             border-left: 4px solid var(--border-color);
-        }}
+        }
 
-        .issue-card.critical {{ border-left-color: var(--critical-color); }}
-        .issue-card.warning {{ border-left-color: var(--warning-color); }}
-        .issue-card.info {{ border-left-color: var(--info-color); }}
+        .issue-card.critical { border-left-color: var(--critical-color); }
+        .issue-card.warning { border-left-color: var(--warning-color); }
+        .issue-card.info { border-left-color: var(--info-color); }
 
-        .issue-header {{
+        .issue-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 10px;
             flex-wrap: wrap;
             gap: 10px;
-        }}
+        }
 
-        .issue-title {{
+        .issue-title {
             font-weight: bold;
             display: flex;
             align-items: center;
             gap: 10px;
-        }}
+        }
 
-        .badge {{
+        .badge {
             padding: 3px 10px;
             border-radius: 12px;
             font-size: 0.8em;
             font-weight: bold;
-        }}
+        }
 
-        .badge.critical {{ background: var(--critical-color); }}
-        .badge.warning {{ background: var(--warning-color); color: #000; }}
-        .badge.info {{ background: var(--info-color); }}
+        .badge.critical { background: var(--critical-color); }
+        .badge.warning { background: var(--warning-color); color: #000; }
+        .badge.info { background: var(--info-color); }
 
-        .issue-location {{
+        .issue-location {
             color: var(--text-secondary);
             font-size: 0.9em;
-        }}
+        }
 
-        .issue-message {{
+        .issue-message {
             margin: 10px 0;
             padding: 10px;
             background: rgba(0,0,0,0.3);
             border-radius: 5px;
-        }}
+        }
 
-        .code-block {{
+        .code-block {
             background: #0d1117;
             border-radius: 5px;
             padding: 15px;
@@ -231,43 +252,57 @@ def generate_detailed_html_report(report: dict, project_path: str) -> str:
             font-family: 'Consolas', 'Monaco', monospace;
             font-size: 0.9em;
             line-height: 1.5;
-        }}
+        }
 
-        .code-block .line-number {{
+        .code-block .line-number {
             color: #6e7681;
             user-select: none;
             padding-right: 15px;
             min-width: 50px;
             display: inline-block;
             text-align: right;
-        }}
+        }
 
-        .code-block .highlight {{
+        .code-block .highlight {
             background: rgba(220, 53, 69, 0.3);
             display: block;
             margin: 0 -15px;
             padding: 0 15px;
-        }}
+        }
+
+        .code-block .context-line {
+            display: block;
+            white-space: pre;
+        }
+
+        /* ST 구문 강조 */
+        .st-kw { color: #c792ea; font-weight: 600; }
+        .st-type { color: #89ddff; }
+        .st-num { color: #f78c6c; }
+        .st-str { color: #c3e88d; }
+        .st-cmt { color: #7f8c98; font-style: italic; }
+        .st-pragma { color: #ffcb6b; }
+        .st-addr { color: #82aaff; }
 
-        .suggestion {{
+        .suggestion {
             background: rgba(40, 167, 69, 0.1);
             border: 1px solid var(--success-color);
             border-radius: 5px;
             padding: 10px;
             margin-top: 10px;
-        }}
+        }
 
-        .suggestion-title {{
+        .suggestion-title {
             color: var(--success-color);
             font-weight: bold;
             margin-bottom: 5px;
-        }}
+        }
 
-        .file-tree {{
+        .file-tree {
             font-family: monospace;
-        }}
+        }
 
-        .file-item {{
+        .file-item {
             padding: 8px 15px;
             border-bottom: 1px solid var(--border-color);
             display: flex;
@@ -275,116 +310,186 @@ def generate_detailed_html_report(report: dict, project_path: str) -> str:
             align-items: center;
             cursor: pointer;
             transition: background 0.2s;
-        }}
+        }
 
-        .file-item:hover {{
+        .file-item:hover {
             background: rgba(102, 126, 234, 0.1);
-        }}
+        }
 
-        .file-name {{
+        a.file-item {
+            color: inherit;
+            text-decoration: none;
+        }
+
+        .file-name {
             color: var(--text-primary);
-        }}
+        }
 
-        .file-issues {{
+        .file-issues {
             display: flex;
             gap: 10px;
-        }}
+        }
 
-        .issue-count {{
+        .issue-count {
             padding: 2px 8px;
             border-radius: 10px;
             font-size: 0.8em;
-        }}
+        }
 
-        .issue-count.critical {{ background: var(--critical-color); }}
-        .issue-count.warning {{ background: var(--warning-color); color: #000; }}
-        .issue-count.info {{ background: var(--info-color); }}
+        .issue-count.critical { background: var(--critical-color); }
+        .issue-count.warning { background: var(--warning-color); color: #000; }
+        .issue-count.info { background: var(--info-color); }
 
-        .rule-table {{
+        .rule-table {
             width: 100%;
             border-collapse: collapse;
-        }}
+        }
 
-        .rule-table th, .rule-table td {{
+        .rule-table th, .rule-table td {
             padding: 12px;
             text-align: left;
             border-bottom: 1px solid var(--border-color);
-        }}
+        }
 
-        .rule-table th {{
+        .rule-table th {
             background: rgba(0,0,0,0.3);
             color: #667eea;
-        }}
+        }
 
-        .rule-table tr:hover {{
+        .rule-table tr:hover {
             background: rgba(102, 126, 234, 0.1);
-        }}
+        }
 
-        .filter-bar {{
+        .filter-bar {
             display: flex;
             gap: 10px;
             margin-bottom: 20px;
             flex-wrap: wrap;
-        }}
+        }
 
-        .filter-bar select, .filter-bar input {{
+        .filter-bar select, .filter-bar input {
             padding: 8px 12px;
             background: var(--bg-card);
             border: 1px solid var(--border-color);
             border-radius: 5px;
             color: var(--text-primary);
-        }}
+        }
 
-        .progress-bar {{
+        .progress-bar {
             height: 20px;
             background: rgba(0,0,0,0.3);
             border-radius: 10px;
             overflow: hidden;
             display: flex;
-        }}
+        }
 
-        .progress-segment {{
+        .progress-segment {
             height: 100%;
             transition: width 0.3s;
-        }}
+        }
 
-        .progress-segment.critical {{ background: var(--critical-color); }}
-        .progress-segment.warning {{ background: var(--warning-color); }}
-        .progress-segment.info {{ background: var(--info-color); }}
+        .progress-segment.critical { background: var(--critical-color); }
+        .progress-segment.warning { background: var(--warning-color); }
+        .progress-segment.info { background: var(--info-color); }
 
-        .collapsible {{
+        .collapsible {
             cursor: pointer;
-        }}
+        }
 
-        .collapsible-content {{
+        .collapsible-content {
             max-height: 0;
             overflow: hidden;
             transition: max-height 0.3s ease-out;
-        }}
+        }
 
-        .collapsible-content.expanded {{
+        .collapsible-content.expanded {
             max-height: none;
-        }}
+        }
 
-        .expand-btn {{
+        .expand-btn {
             background: none;
             border: none;
             color: #667eea;
             cursor: pointer;
             padding: 5px 10px;
-        }}
+        }
 
-        @media (max-width: 768px) {{
-            .summary-grid {{
+        .virtual-list {
+            height: 70vh;
+            overflow-y: auto;
+            position: relative;
+            border: 1px solid var(--border-color);
+            border-radius: 8px;
+        }
+
+        .virtual-window {
+            position: absolute;
+            left: 0;
+            right: 0;
+        }
+
+        .virtual-row {
+            height: 76px;
+            padding: 8px 15px;
+            border-bottom: 1px solid var(--border-color);
+            border-left: 4px solid var(--border-color);
+            overflow: hidden;
+        }
+
+        .virtual-row.critical { border-left-color: var(--critical-color); }
+        .virtual-row.warning { border-left-color: var(--warning-color); }
+        .virtual-row.info { border-left-color: var(--info-color); }
+
+        .virtual-row .row-head {
+            display: flex;
+            gap: 10px;
+            align-items: center;
+            white-space: nowrap;
+        }
+
+        .virtual-row .row-code {
+            font-family: 'Consolas', 'Monaco', monospace;
+            font-size: 0.85em;
+            color: var(--text-secondary);
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+        }
+
+        .virtual-count {
+            color: var(--text-secondary);
+            margin-bottom: 10px;
+        }
+
+        @media (max-width: 768px) {
+            .summary-grid {
                 grid-template-columns: 1fr 1fr;
-            }}
-        }}
-    </style>
+            }
+        }
+'''
+
+
+def _page_head(title: str, css_href: str = None) -> str:
+    """<head> 및 컨테이너 시작 (css_href 가 있으면 외부 스타일시트 링크)"""
+    style = f'<link rel="stylesheet" href="{css_href}">' if css_href else f'<style>{REPORT_CSS}    </style>'
+    return f'''<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{html.escape(title)}</title>
+    {style}
 </head>
 <body>
     <div class="container">
-        <header>
-            <h1>🔍 TwinCAT QA 상세 분석 리포트</h1>
+'''
+
+
+def _summary_html(report: dict, title: str) -> str:
+    """헤더 + 요약 카드 + 이슈 분포"""
+    s = report['summary']
+    return f'''        <header>
+            <h1>🔍 {title}</h1>
             <div class="meta">
                 <div>📁 프로젝트: {html.escape(report['project_path'])}</div>
                 <div>📅 분석 일시: {report['generated_at']}</div>
@@ -427,6 +532,202 @@ def generate_detailed_html_report(report: dict, project_path: str) -> str:
             </div>
         </div>
 
+'''
+
+
+# 파일 목록 필터 / 펼치기 스크립트 (단일 페이지, 분할 인덱스/파일 페이지 공용)
+FILE_LIST_SCRIPT = '''
+        function filterFiles() {
+            const search = document.getElementById('file-search').value.toLowerCase();
+            const severity = document.getElementById('severity-filter').value;
+
+            document.querySelectorAll('.file-item').forEach(item => {
+                const fileName = item.dataset.filename.toLowerCase();
+                const hasCritical = item.dataset.critical > 0;
+                const hasWarning = item.dataset.warning > 0;
+                const hasInfo = item.dataset.info > 0;
+
+                let show = fileName.includes(search);
+
+                if (severity === 'critical') show = show && hasCritical;
+                else if (severity === 'warning') show = show && hasWarning;
+                else if (severity === 'info') show = show && hasInfo;
+
+                item.style.display = show ? 'flex' : 'none';
+            });
+        }
+
+        function toggleCollapse(id) {
+            const content = document.getElementById(id);
+            content.classList.toggle('expanded');
+        }
+'''
+
+# 분할 모드 기본 페이지당 파일 수
+SHARD_FILES_PER_PAGE = 1
+
+
+def generate_detailed_html_report(report: dict, project_path: str, context_lines: int = CONTEXT_LINES) -> str:
+    """상세 HTML 리포트 생성 (문자열)"""
+    return ''.join(iter_detailed_html_report(report, project_path, context_lines))
+
+
+def write_detailed_html_report(report: dict, project_path: str, html_path,
+                               context_lines: int = CONTEXT_LINES) -> Path:
+    """상세 HTML 리포트를 섹션 단위로 파일에 바로 기록 (전체 문서를 메모리에 만들지 않음)"""
+    html_path = Path(html_path)
+    with open(html_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.writelines(iter_detailed_html_report(report, project_path, context_lines))
+    return html_path
+
+
+def shard_pages(file_paths, files_per_page: int = SHARD_FILES_PER_PAGE) -> List[Tuple[str, List[str]]]:
+    """파일 경로 → [(페이지 파일명, [파일 경로...])] (경로 순으로 files_per_page 개씩)"""
+    paths = sorted(file_paths)
+    return [
+        (f"page-{number:04d}.html", paths[start:start + files_per_page])
+        for number, start in enumerate(range(0, len(paths), max(files_per_page, 1)), 1)
+    ]
+
+
+def _page_title(paths: List[str]) -> str:
+    if len(paths) == 1:
+        return Path(paths[0]).name
+    return f"{Path(paths[0]).name} 외 {len(paths) - 1}개"
+
+
+def _write_shard_page(page_path: str, issues_by_file: Dict[str, list], project_path: str,
+                      context_lines: int = CONTEXT_LINES) -> str:
+    """워커: 파일 페이지 하나 기록 (해당 파일들의 Critical 상세 + 전체 이슈)"""
+    title = _page_title(list(issues_by_file))
+    critical = [i for issues in issues_by_file.values() for i in issues if i['severity'] == 'Critical']
+
+    with open(page_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(_page_head(f"TwinCAT QA - {title}", css_href="../report.css"))
+        f.write(f'''
+        <header>
+            <h1>📄 {html.escape(title)}</h1>
+            <div class="meta"><a href="../index.html" style="color: inherit;">← 전체 요약으로</a></div>
+        </header>
+''')
+        if critical:
+            f.write('<div class="section"><h2>🔴 Critical Issues</h2>')
+            f.writelines(iter_critical_issues_html(critical, project_path))
+            f.write('</div>')
+        f.write('<div class="section"><h2>📁 이슈 목록</h2><div class="file-tree">')
+        with SourceContext(project_path, context_lines) as context:
+            f.writelines(iter_file_list_html(issues_by_file, limit=None, expanded=True,
+                                             context=context if context_lines else None))
+        f.write(f'''</div></div>
+    </div>
+    <script>{FILE_LIST_SCRIPT}    </script>
+</body>
+</html>''')
+    return page_path
+
+
+def iter_shard_index_html(report: dict, pages: List[Tuple[str, List[str]]],
+                          issues_by_file: Dict[str, list], issues_by_rule: Dict[str, list]) -> Iterator[str]:
+    """분할 모드 인덱스 페이지 (요약, 파일 링크, 규칙/복잡도 표)"""
+    title = 'TwinCAT QA 상세 분석 리포트'
+    yield _page_head(title, css_href="report.css")
+    yield _summary_html(report, title)
+    yield f'''
+        <div class="section">
+            <h2>📁 파일별 이슈 ({len(issues_by_file)})</h2>
+            <div class="filter-bar">
+                <input type="text" id="file-search" placeholder="파일명 검색..." onkeyup="filterFiles()">
+                <select id="severity-filter" onchange="filterFiles()">
+                    <option value="all">모든 심각도</option>
+                    <option value="critical">Critical만</option>
+                    <option value="warning">Warning만</option>
+                    <option value="info">Info만</option>
+                </select>
+            </div>
+            <div class="file-tree">
+'''
+    for page_name, paths in pages:
+        for file_path in paths:
+            counts = severity_counts(issues_by_file[file_path])
+            file_name = file_name_html(file_path)
+            yield f'''
+                <a class="file-item" href="files/{page_name}#{_file_anchor(file_path)}" title="{escape_html(file_path)}"
+                   data-filename="{file_name}" data-critical="{counts['Critical']}"
+                   data-warning="{counts['Warning']}" data-info="{counts['Info']}">
+                    <span class="file-name">📄 {file_name}</span>
+                    <div class="file-issues">
+                        {f'<span class="issue-count critical">{counts["Critical"]}</span>' if counts['Critical'] else ''}
+                        {f'<span class="issue-count warning">{counts["Warning"]}</span>' if counts['Warning'] else ''}
+                        {f'<span class="issue-count info">{counts["Info"]}</span>' if counts['Info'] else ''}
+                    </div>
+                </a>'''
+    yield '''
+            </div>
+        </div>
+
+        <div class="section">
+            <h2>📋 규칙별 이슈 통계</h2>
+'''
+    yield from iter_rule_details_html(issues_by_rule)
+    yield '''
+        </div>
+
+        <div class="section">
+            <h2>⚠️ 코드 복잡도 분석</h2>
+'''
+    yield from iter_complexity_html(report['files'])
+    yield f'''
+        </div>
+    </div>
+    <script>{FILE_LIST_SCRIPT}    </script>
+</body>
+</html>'''
+
+
+def write_sharded_html_report(report: dict, project_path: str, output_dir,
+                              files_per_page: int = SHARD_FILES_PER_PAGE,
+                              max_workers: Optional[int] = None, context_lines: int = CONTEXT_LINES) -> Path:
+    """분할 HTML 리포트 기록: index.html + report.css + files/page-NNNN.html (파일 페이지는 병렬 기록)"""
+    output_dir = Path(output_dir)
+    (output_dir / "files").mkdir(parents=True, exist_ok=True)
+    (output_dir / "report.css").write_text(REPORT_CSS, encoding='utf-8')
+
+    issues = as_issue_table(report['issues'])
+    issues_by_file = issues.value_rows('file')
+    issues_by_rule = issues.value_rows('rule')
+
+    pages = shard_pages(issues_by_file, files_per_page)
+    index_path = output_dir / "index.html"
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(_write_shard_page, str(output_dir / "files" / page_name),
+                        {file_path: list(issues_by_file[file_path]) for file_path in paths}, project_path,
+                        context_lines)
+            for page_name, paths in pages
+        ]
+        # 파일 페이지가 워커에서 기록되는 동안 인덱스 페이지 기록
+        with open(index_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            f.writelines(iter_shard_index_html(report, pages, issues_by_file, issues_by_rule))
+        for future in futures:
+            future.result()
+
+    return index_path
+
+
+def iter_detailed_html_report(report: dict, project_path: str,
+                              context_lines: int = CONTEXT_LINES) -> Iterator[str]:
+    """상세 HTML 리포트 조각을 문서 순서대로 생성 (context_lines=0 이면 소스 컨텍스트 생략)"""
+
+    # 이슈 테이블 (목록이면 한 번 압축) 및 파일/규칙별 행 뷰
+    issues = as_issue_table(report['issues'])
+    issues_by_file = issues.value_rows('file')
+    issues_by_rule = issues.value_rows('rule')
+
+    s = report['summary']
+
+    yield _page_head('TwinCAT QA 상세 분석 리포트')
+    yield _summary_html(report, 'TwinCAT QA 상세 분석 리포트')
+    yield f'''
         <!-- 탭 네비게이션 -->
         <div class="tabs">
             <button class="tab-btn active" onclick="showTab('critical-issues')">🔴 Critical ({s['critical_count']})</button>
@@ -443,7 +744,9 @@ def generate_detailed_html_report(report: dict, project_path: str) -> str:
                 <p style="color: var(--text-secondary); margin-bottom: 20px;">
                     아래 이슈들은 런타임 오류, 데이터 손실, 시스템 불안정을 유발할 수 있습니다.
                 </p>
-                {generate_critical_issues_html(issues_by_severity.get('Critical', []), project_path)}
+'''
+    yield from iter_critical_issues_html(issues.severity_rows('Critical'), project_path)
+    yield f'''
             </div>
         </div>
 
@@ -461,7 +764,10 @@ def generate_detailed_html_report(report: dict, project_path: str) -> str:
                     </select>
                 </div>
                 <div class="file-tree" id="file-list">
-                    {generate_file_list_html(issues_by_file)}
+'''
+    with SourceContext(project_path, context_lines) as context:
+        yield from iter_file_list_html(issues_by_file, context=context if context_lines else None)
+    yield f'''
                 </div>
             </div>
         </div>
@@ -470,7 +776,9 @@ def generate_detailed_html_report(report: dict, project_path: str) -> str:
         <div id="by-rule" class="tab-content">
             <div class="section">
                 <h2>📋 규칙별 이슈 통계</h2>
-                {generate_rule_details_html(issues_by_rule)}
+'''
+    yield from iter_rule_details_html(issues_by_rule)
+    yield f'''
             </div>
         </div>
 
@@ -489,12 +797,15 @@ def generate_detailed_html_report(report: dict, project_path: str) -> str:
                         <option value="all">모든 규칙</option>
                         {generate_rule_options(issues_by_rule)}
                     </select>
-                    <input type="text" id="all-search" placeholder="검색..." onkeyup="filterAllIssues()">
-                </div>
-                <div id="all-issues-list">
-                    {generate_all_issues_html(report['issues'][:500])}
-                    {f'<p style="color: var(--text-secondary); text-align: center;">... 외 {len(report["issues"]) - 500}개 이슈 (JSON 파일에서 전체 확인 가능)</p>' if len(report['issues']) > 500 else ''}
+                    <select id="all-file-filter" onchange="filterAllIssues()">
+                        <option value="all">모든 파일</option>
+                        {generate_file_options(issues_by_file)}
+                    </select>
+                    <input type="text" id="all-search" placeholder="검색 (단어/단어 조각 앞부분 일치, 공백으로 AND)..." oninput="filterAllIssues()">
                 </div>
+'''
+    yield from iter_all_issues_html(issues)
+    yield f'''
             </div>
         </div>
 
@@ -502,7 +813,9 @@ def generate_detailed_html_report(report: dict, project_path: str) -> str:
         <div id="complexity" class="tab-content">
             <div class="section">
                 <h2>⚠️ 코드 복잡도 분석</h2>
-                {generate_complexity_html(report['files'])}
+'''
+    yield from iter_complexity_html(report['files'])
+    yield f'''
             </div>
         </div>
     </div>
@@ -517,52 +830,13 @@ def generate_detailed_html_report(report: dict, project_path: str) -> str:
             // 선택된 탭 활성화
             event.target.classList.add('active');
             document.getElementById(tabId).classList.add('active');
-        }}
-
-        function filterFiles() {{
-            const search = document.getElementById('file-search').value.toLowerCase();
-            const severity = document.getElementById('severity-filter').value;
-
-            document.querySelectorAll('.file-item').forEach(item => {{
-                const fileName = item.dataset.filename.toLowerCase();
-                const hasCritical = item.dataset.critical > 0;
-                const hasWarning = item.dataset.warning > 0;
-                const hasInfo = item.dataset.info > 0;
 
-                let show = fileName.includes(search);
-
-                if (severity === 'critical') show = show && hasCritical;
-                else if (severity === 'warning') show = show && hasWarning;
-                else if (severity === 'info') show = show && hasInfo;
-
-                item.style.display = show ? 'flex' : 'none';
-            }});
-        }}
-
-        function filterAllIssues() {{
-            const severity = document.getElementById('all-severity-filter').value;
-            const rule = document.getElementById('all-rule-filter').value;
-            const search = document.getElementById('all-search').value.toLowerCase();
-
-            document.querySelectorAll('.issue-card').forEach(card => {{
-                const cardSeverity = card.dataset.severity;
-                const cardRule = card.dataset.rule;
-                const cardText = card.textContent.toLowerCase();
-
-                let show = true;
-                if (severity !== 'all' && cardSeverity !== severity) show = false;
-                if (rule !== 'all' && cardRule !== rule) show = false;
-                if (search && !cardText.includes(search)) show = false;
-
-                card.style.display = show ? 'block' : 'none';
-            }});
-        }}
-
-        function toggleCollapse(id) {{
-            const content = document.getElementById(id);
-            content.classList.toggle('expanded');
+            // 전체 목록은 처음 열 때 데이터 로드 후 보이는 행만 렌더링
+            if (tabId === 'all-issues') filterAllIssues();
         }}
 
+{FILE_LIST_SCRIPT}
+{VIRTUAL_LIST_SCRIPT}
         function copyCode(btn) {{
             const code = btn.parentElement.querySelector('code').textContent;
             navigator.clipboard.writeText(code);
@@ -573,91 +847,51 @@ def generate_detailed_html_report(report: dict, project_path: str) -> str:
 </body>
 </html>'''
 
-    return html_content
+
+@lru_cache(maxsize=None)
+def _rule_guide_html(rule_id: str) -> str:
+    """규칙 설명/위험/수정 방법/예시 블록 (규칙당 한 번만 생성)"""
+    info = rule_info(rule_id)
+    examples = f'''
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px; margin-top: 10px;">
+                    <div>
+                        <div style="color: var(--critical-color); font-weight: bold;">❌ 잘못된 코드</div>
+                        <div class="code-block"><code>{snippet_html(info.example_bad)}</code></div>
+                    </div>
+                    <div>
+                        <div style="color: var(--success-color); font-weight: bold;">✅ 올바른 코드</div>
+                        <div class="code-block"><code>{snippet_html(info.example_good)}</code></div>
+                    </div>
+                </div>
+                ''' if info.example_bad else ''
+    return f'''<p><strong>설명:</strong> {info.description}</p>
+            <p><strong>위험:</strong> {info.risk}</p>
+
+            <div class="suggestion">
+                <div class="suggestion-title">✅ 수정 방법</div>
+                <p>{info.fix}</p>
+                {examples}
+            </div>'''
 
 
-def generate_critical_issues_html(issues: list, project_path: str) -> str:
+def iter_critical_issues_html(issues: Sequence, project_path: str) -> Iterator[str]:
     """Critical 이슈 상세 HTML"""
     if not issues:
-        return '<p>Critical 이슈가 없습니다. 👍</p>'
+        yield '<p>Critical 이슈가 없습니다. 👍</p>'
+        return
 
     # 규칙별 그룹핑
-    by_rule = defaultdict(list)
-    for issue in issues:
-        by_rule[issue['rule_id']].append(issue)
-
-    html_parts = []
-
-    rule_info = {
-        'QA001': {
-            'name': '초기화되지 않은 변수',
-            'desc': 'REAL, LREAL, 포인터 타입 변수가 초기값 없이 선언되었습니다.',
-            'risk': '예측 불가능한 값으로 인한 오동작, 시스템 불안정',
-            'fix': '변수 선언 시 초기값을 명시하세요.',
-            'example_bad': 'fTemperature : REAL;',
-            'example_good': 'fTemperature : REAL := 0.0;'
-        },
-        'QA002': {
-            'name': '위험한 타입 변환',
-            'desc': '큰 데이터 타입에서 작은 타입으로 변환 시 데이터 손실 가능성',
-            'risk': '오버플로우, 데이터 손실, 정밀도 저하',
-            'fix': 'LIMIT 함수로 범위 검증 후 변환하세요.',
-            'example_bad': 'nValue := REAL_TO_INT(fInput);',
-            'example_good': 'nValue := REAL_TO_INT(LIMIT(-32768.0, fInput, 32767.0));'
-        },
-        'QA005': {
-            'name': 'REAL 직접 비교',
-            'desc': '실수형 변수를 등호(=)로 직접 비교하고 있습니다.',
-            'risk': '부동소수점 정밀도 문제로 비교 실패',
-            'fix': '허용 오차(epsilon)를 사용한 비교로 변경하세요.',
-            'example_bad': 'IF fValue = fTarget THEN',
-            'example_good': 'IF ABS(fValue - fTarget) < 0.0001 THEN'
-        },
-        'QA006': {
-            'name': '0으로 나누기 가능성',
-            'desc': '변수로 나누기를 수행하며, 0 검사가 없습니다.',
-            'risk': '런타임 오류로 시스템 정지',
-            'fix': '나누기 전 분모가 0인지 확인하세요.',
-            'example_bad': 'fResult := fNumerator / fDenominator;',
-            'example_good': 'IF fDenominator <> 0.0 THEN\n    fResult := fNumerator / fDenominator;\nEND_IF'
-        }
-    }
+    by_rule = group_issues(issues, 'rule_id')
 
-    for rule_id in sorted(by_rule.keys()):
-        rule_issues = by_rule[rule_id]
-        info = rule_info.get(rule_id, {
-            'name': rule_id,
-            'desc': '',
-            'risk': '',
-            'fix': '',
-            'example_bad': '',
-            'example_good': ''
-        })
-
-        html_parts.append(f'''
+    for rule_id, rule_issues in by_rule.items():
+        info = rule_info(rule_id)
+
+        yield f'''
         <div class="section" style="background: rgba(220,53,69,0.1); border: 1px solid var(--critical-color);">
             <h3 style="color: var(--critical-color);">
-                {rule_id}: {info['name']} ({len(rule_issues)}건)
+                {rule_id}: {info.name} ({len(rule_issues)}건)
             </h3>
-            <p><strong>설명:</strong> {info['desc']}</p>
-            <p><strong>위험:</strong> {info['risk']}</p>
-
-            <div class="suggestion">
-                <div class="suggestion-title">✅ 수정 방법</div>
-                <p>{info['fix']}</p>
-                {f"""
-                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 10px; margin-top: 10px;">
-                    <div>
-                        <div style="color: var(--critical-color); font-weight: bold;">❌ 잘못된 코드</div>
-                        <div class="code-block"><code>{html.escape(info['example_bad'])}</code></div>
-                    </div>
-                    <div>
-                        <div style="color: var(--success-color); font-weight: bold;">✅ 올바른 코드</div>
-                        <div class="code-block"><code>{html.escape(info['example_good'])}</code></div>
-                    </div>
-                </div>
-                """ if info['example_bad'] else ''}
-            </div>
+            {_rule_guide_html(rule_id)}
 
             <h4 style="margin-top: 15px;">📍 발생 위치 ({len(rule_issues)}건)</h4>
             <table class="rule-table">
@@ -666,109 +900,116 @@ def generate_critical_issues_html(issues: list, project_path: str) -> str:
                     <th style="width: 10%;">라인</th>
                     <th style="width: 55%;">코드</th>
                 </tr>
-        ''')
+        '''
 
         for issue in rule_issues[:30]:  # 상위 30개만
-            code = html.escape(issue.get('code', '')[:100])
-            file_name = Path(issue['file']).name
-            html_parts.append(f'''
+            yield f'''
                 <tr>
-                    <td><code>{html.escape(file_name)}</code></td>
+                    <td><code>{file_name_html(issue['file'])}</code></td>
                     <td>{issue['line']}</td>
-                    <td><code style="font-size: 0.85em;">{code}</code></td>
+                    <td><code style="font-size: 0.85em;">{snippet_html(issue.get('code', ''), 100)}</code></td>
                 </tr>
-            ''')
+            '''
 
         if len(rule_issues) > 30:
-            html_parts.append(f'''
+            yield f'''
                 <tr>
                     <td colspan="3" style="text-align: center; color: var(--text-secondary);">
                         ... 외 {len(rule_issues) - 30}건 (전체 목록은 JSON 참조)
                     </td>
                 </tr>
-            ''')
+            '''
+
+        yield '</table></div>'
+
+
+def _file_anchor(file_path: str) -> str:
+    """파일 앵커 ID (프로세스와 무관하게 고정)"""
+    return 'file-' + hashlib.md5(file_path.encode('utf-8')).hexdigest()[:12]
+
+
+@lru_cache(maxsize=SNIPPET_CACHE_SIZE)
+def _issue_card_html(severity: str, rule_id: str, message: str) -> Tuple[str, str]:
+    """파일별 목록의 이슈 카드 (라인 번호 앞/뒤 조각, 코드 블록 제외) - 같은 규칙/메시지는 한 번만 렌더링"""
+    severity_class = severity.lower()
+    head = f'''
+                <div class="issue-card {severity_class}" style="margin: 5px 0;">
+                    <div class="issue-header">
+                        <span class="badge {severity_class}">{severity}</span>
+                        <span>{rule_id}</span>
+                        <span>라인 '''
+    tail = f'''</span>
+                    </div>
+                    <div>{escape_html(message)}</div>
+                    '''
+    return head, tail
 
-        html_parts.append('</table></div>')
 
-    return '\n'.join(html_parts)
+@lru_cache(maxsize=SNIPPET_CACHE_SIZE)
+def _snippet_block_html(code: str) -> str:
+    """컨텍스트가 없을 때의 한 줄 코드 블록"""
+    return f'<div class="code-block"><code>{snippet_html(code, 150)}</code></div>' if code else ''
 
 
-def generate_file_list_html(issues_by_file: dict) -> str:
-    """파일별 이슈 목록 HTML"""
-    html_parts = []
+def _context_block_html(lines: List[ContextLine], focus: int) -> str:
+    """전후 컨텍스트 코드 블록 (이슈 라인 강조, 라인별 구문 강조는 캐시 사용)"""
+    rows = [
+        f'<span class="context-line{" highlight" if number == focus else ""}">'
+        f'<span class="line-number">{number}</span>{highlight_st(text)}</span>'
+        for number, text in lines
+    ]
+    return f'<div class="code-block"><code>{"".join(rows)}</code></div>'
 
+
+def iter_file_list_html(issues_by_file: dict, limit: Optional[int] = 20, expanded: bool = False,
+                        context: Optional[SourceContext] = None) -> Iterator[str]:
+    """파일별 이슈 목록 HTML (limit=None 이면 파일당 전체 이슈, expanded 면 펼친 상태)
+
+    context 가 있으면 한 줄 코드 대신 원본 소스의 전후 라인을 보여줍니다.
+    """
     # 이슈 많은 순으로 정렬
-    sorted_files = sorted(issues_by_file.items(),
-                         key=lambda x: len([i for i in x[1] if i['severity'] == 'Critical']),
-                         reverse=True)
+    counts = {file_path: severity_counts(issues) for file_path, issues in issues_by_file.items()}
+    sorted_files = sorted(issues_by_file.items(), key=lambda x: counts[x[0]]['Critical'], reverse=True)
 
     for file_path, issues in sorted_files:
-        critical = len([i for i in issues if i['severity'] == 'Critical'])
-        warning = len([i for i in issues if i['severity'] == 'Warning'])
-        info = len([i for i in issues if i['severity'] == 'Info'])
+        critical = counts[file_path]['Critical']
+        warning = counts[file_path]['Warning']
+        info = counts[file_path]['Info']
 
-        file_name = Path(file_path).name
+        file_name = file_name_html(file_path)
 
-        html_parts.append(f'''
-        <div class="file-item" data-filename="{html.escape(file_name)}"
+        yield f'''
+        <div class="file-item" data-filename="{file_name}"
              data-critical="{critical}" data-warning="{warning}" data-info="{info}"
-             onclick="toggleCollapse('file-{hash(file_path)}')">
-            <span class="file-name">📄 {html.escape(file_name)}</span>
+             onclick="toggleCollapse('{_file_anchor(file_path)}')">
+            <span class="file-name">📄 {file_name}</span>
             <div class="file-issues">
                 {f'<span class="issue-count critical">{critical}</span>' if critical else ''}
                 {f'<span class="issue-count warning">{warning}</span>' if warning else ''}
                 {f'<span class="issue-count info">{info}</span>' if info else ''}
             </div>
         </div>
-        <div id="file-{hash(file_path)}" class="collapsible-content">
+        <div id="{_file_anchor(file_path)}" class="collapsible-content{' expanded' if expanded else ''}">
             <div style="padding: 10px 20px; background: rgba(0,0,0,0.2);">
-        ''')
+        '''
 
-        for issue in issues[:20]:
-            severity_class = issue['severity'].lower()
-            html_parts.append(f'''
-                <div class="issue-card {severity_class}" style="margin: 5px 0;">
-                    <div class="issue-header">
-                        <span class="badge {severity_class}">{issue['severity']}</span>
-                        <span>{issue['rule_id']}</span>
-                        <span>라인 {issue['line']}</span>
-                    </div>
-                    <div>{html.escape(issue['message'])}</div>
-                    {f'<div class="code-block"><code>{html.escape(issue.get("code", "")[:150])}</code></div>' if issue.get('code') else ''}
-                </div>
-            ''')
+        for issue in issues[:limit]:
+            head, tail = _issue_card_html(issue['severity'], issue['rule_id'], issue['message'])
+            code = issue.get('code', '')
+            lines = context.window(file_path, issue['line'], code) if context is not None else None
+            code_block = _context_block_html(lines, issue['line']) if lines else _snippet_block_html(code)
+            yield f"{head}{issue['line']}{tail}{code_block}</div>"
 
-        if len(issues) > 20:
-            html_parts.append(f'<p style="color: var(--text-secondary);">... 외 {len(issues) - 20}건</p>')
+        if limit is not None and len(issues) > limit:
+            yield f'<p style="color: var(--text-secondary);">... 외 {len(issues) - limit}건</p>'
 
-        html_parts.append('</div></div>')
+        yield '</div></div>'
 
-    return '\n'.join(html_parts)
 
-
-def generate_rule_details_html(issues_by_rule: dict) -> str:
+def iter_rule_details_html(issues_by_rule: dict) -> Iterator[str]:
     """규칙별 상세 HTML"""
-    rule_descriptions = {
-        'QA001': ('초기화되지 않은 변수', 'Safety', '변수 선언 시 초기값 미지정'),
-        'QA002': ('위험한 타입 변환', 'Safety', '큰 타입에서 작은 타입으로 변환'),
-        'QA003': ('대용량 배열', 'Performance', '1000개 이상 요소의 배열'),
-        'QA004': ('포인터 변수', 'Safety', '포인터 사용 - NULL 체크 필요'),
-        'QA005': ('REAL 직접 비교', 'Safety', '실수형 등호 비교'),
-        'QA006': ('0으로 나누기', 'Safety', '분모 검증 없는 나눗셈'),
-        'QA007': ('매직 넘버', 'Maintainability', '의미 불명확한 숫자 상수'),
-        'QA008': ('과도한 중첩', 'Maintainability', '4단계 이상 중첩'),
-        'QA009': ('긴 코드', 'Maintainability', '500줄 초과'),
-        'QA010': ('하드코딩된 시간', 'Maintainability', 'T#nnn 형태의 고정 시간값'),
-        'QA011': ('빈 예외 처리', 'Safety', '빈 ELSE 블록'),
-        'QA012': ('TODO/FIXME', 'Maintainability', '미완료 작업 표시'),
-        'QA013': ('주석 처리된 코드', 'Maintainability', '주석으로 비활성화된 코드'),
-        'QA014': ('높은 복잡도', 'Maintainability', '순환 복잡도 15 초과'),
-        'QA015': ('주석 부족', 'Maintainability', '코드 대비 10% 미만'),
-        'QA016': ('명명 규칙', 'Style', '헝가리안 표기법 미준수'),
-    }
-
-    html_parts = ['<table class="rule-table">']
-    html_parts.append('''
+    yield '<table class="rule-table">'
+    yield '''
         <tr>
             <th>규칙 ID</th>
             <th>이름</th>
@@ -776,27 +1017,26 @@ def generate_rule_details_html(issues_by_rule: dict) -> str:
             <th>설명</th>
             <th>건수</th>
         </tr>
-    ''')
+    '''
 
     for rule_id in sorted(issues_by_rule.keys()):
         issues = issues_by_rule[rule_id]
         severity = issues[0]['severity'] if issues else 'Info'
         severity_class = severity.lower()
 
-        name, category, desc = rule_descriptions.get(rule_id, (rule_id, 'Other', ''))
+        info = rule_info(rule_id)
 
-        html_parts.append(f'''
+        yield f'''
             <tr>
                 <td><span class="badge {severity_class}">{rule_id}</span></td>
-                <td>{name}</td>
-                <td>{category}</td>
-                <td>{desc}</td>
+                <td>{info.name}</td>
+                <td>{info.category}</td>
+                <td>{info.summary}</td>
                 <td><strong>{len(issues)}</strong></td>
             </tr>
-        ''')
+        '''
 
-    html_parts.append('</table>')
-    return '\n'.join(html_parts)
+    yield '</table>'
 
 
 def generate_rule_options(issues_by_rule: dict) -> str:
@@ -808,39 +1048,445 @@ def generate_rule_options(issues_by_rule: dict) -> str:
     return '\n'.join(options)
 
 
-def generate_all_issues_html(issues: list) -> str:
-    """전체 이슈 목록 HTML"""
-    html_parts = []
+def generate_file_options(issues_by_file: dict) -> str:
+    """파일 선택 옵션"""
+    options = []
+    for file_path in sorted(issues_by_file.keys()):
+        count = len(issues_by_file[file_path])
+        options.append(f'<option value="{escape_html(file_path)}">{file_name_html(file_path)} ({count})</option>')
+    return '\n'.join(options)
+
+
+SEVERITY_ORDER = {'Critical': 0, 'Warning': 1, 'Info': 2}
+
+# 사전 인코딩 대상 컬럼 (line 은 정수 그대로)
+ISSUE_COLUMNS = ('severity', 'rule', 'file', 'message', 'code', 'suggestion')
+
+
+def _run_ranges(column: list) -> dict:
+    """컬럼 값별 연속 구간 목록 [start, end, start, end, ...]"""
+    ranges = defaultdict(list)
+    start = 0
+    for i in range(1, len(column) + 1):
+        if i == len(column) or column[i] != column[start]:
+            ranges[column[start]].extend((start, i))
+            start = i
+    return ranges
+
+
+# 이슈 레코드 키 (ISSUE_COLUMNS 순서)
+_ISSUE_KEYS = ('severity', 'rule_id', 'file', 'message', 'code', 'suggestion')
+
+
+class IssueRows(Sequence):
+    """IssueTable 행 ID 목록 뷰 (접근할 때만 이슈 dict 로 복원)"""
+
+    def __init__(self, table: 'IssueTable', ids):
+        self.table = table
+        self.ids = ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.table.row(i) for i in self.ids[index]]
+        return self.table.row(self.ids[index])
+
+    def value_rows(self, column: str) -> Dict[str, 'IssueRows']:
+        return self.table.value_rows(column, self.ids)
+
+    def severity_counts(self) -> Dict[str, int]:
+        return self.table.severity_counts(self.ids)
+
+
+class IssueTable(Sequence):
+    """사전 인코딩 컬럼형 이슈 테이블 - (심각도, 규칙, 파일, 라인) 순 정렬
+
+    이슈 반복자를 한 번만 소비하며 문자열은 컬럼별 사전에 한 번씩만 보관하고 행은 정수 배열로 저장합니다.
+    리스트처럼 len/인덱스/슬라이스/반복이 가능하고, 행은 접근할 때 dict 로 복원됩니다.
+    """
+
+    def __init__(self):
+        self.dicts: Dict[str, List[str]] = {name: [] for name in ISSUE_COLUMNS}
+        self.cols: Dict[str, array] = {name: array('I') for name in ISSUE_COLUMNS}
+        self.cols['line'] = array('q')
+
+    @classmethod
+    def from_issues(cls, issues: Iterable[dict]) -> 'IssueTable':
+        table = cls()
+        lookups = {name: {} for name in ISSUE_COLUMNS}
+        for issue in issues:
+            values = (issue['severity'], issue['rule_id'], issue['file'], issue['message'],
+                      issue.get('code', ''), issue.get('suggestion', ''))
+            for name, value in zip(ISSUE_COLUMNS, values):
+                lookup = lookups[name]
+                index = lookup.get(value)
+                if index is None:
+                    index = lookup[value] = len(lookup)
+                    table.dicts[name].append(value)
+                table.cols[name].append(index)
+            table.cols['line'].append(issue['line'])
+        table._sort()
+        return table
+
+    def _sort(self):
+        """행을 (심각도, 규칙, 파일, 라인) 순으로 재배열 (안정 정렬)"""
+        severity_rank = [SEVERITY_ORDER.get(value, 9) for value in self.dicts['severity']]
+        rule_rank = _sorted_ranks(self.dicts['rule'])
+        file_rank = _sorted_ranks(self.dicts['file'])
+        rules, files = len(rule_rank) or 1, len(file_rank) or 1
+        lines = self.cols['line']
+        line_base = min(lines, default=0)
+        line_span = max(lines, default=0) - line_base + 1
+
+        # 네 정렬 키를 정수 하나로 묶어 행당 튜플 생성을 피함
+        severity, rule, file = self.cols['severity'], self.cols['rule'], self.cols['file']
+        keys = [
+            ((severity_rank[severity[i]] * rules + rule_rank[rule[i]]) * files + file_rank[file[i]]) * line_span
+            + lines[i] - line_base
+            for i in range(len(lines))
+        ]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        for name, column in self.cols.items():
+            self.cols[name] = array(column.typecode, (column[i] for i in order))
+
+    def __len__(self) -> int:
+        return len(self.cols['line'])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(len(self))[index]]
+        return self.row(range(len(self))[index])
+
+    def row(self, index: int) -> dict:
+        """행 → 이슈 dict"""
+        record = {key: self.dicts[name][self.cols[name][index]] for key, name in zip(_ISSUE_KEYS, ISSUE_COLUMNS)}
+        record['line'] = self.cols['line'][index]
+        return record
+
+    def value_rows(self, column: str, rows=None) -> Dict[str, IssueRows]:
+        """컬럼 값별 행 뷰 (값 정렬 순, rows 지정 시 해당 행만)"""
+        values = self.cols[column]
+        ids: Dict[int, array] = defaultdict(lambda: array('I'))
+        for row in range(len(values)) if rows is None else rows:
+            ids[values[row]].append(row)
+        names = self.dicts[column]
+        return {names[value_id]: IssueRows(self, ids[value_id])
+                for value_id in sorted(ids, key=lambda value_id: names[value_id])}
+
+    def severity_counts(self, rows=None) -> Dict[str, int]:
+        """심각도별 건수 (dict 복원 없이 ID 로 집계)"""
+        values = self.cols['severity']
+        counts = defaultdict(int)
+        for row in range(len(values)) if rows is None else rows:
+            counts[values[row]] += 1
+        return defaultdict(int, {self.dicts['severity'][value_id]: n for value_id, n in counts.items()})
+
+    def severity_rows(self, severity: str) -> IssueRows:
+        """심각도 하나의 행 뷰 (정렬상 연속 구간)"""
+        if severity not in self.dicts['severity']:
+            return IssueRows(self, range(0))
+        value_id = self.dicts['severity'].index(severity)
+        for start, stop in zip(*[iter(_run_ranges(self.cols['severity'])[value_id])] * 2):
+            return IssueRows(self, range(start, stop))
+        return IssueRows(self, range(0))
+
+    def payload(self) -> dict:
+        """브라우저용 사전 인코딩 컬럼 페이로드 + 심각도/규칙/파일 구간 인덱스 + 검색 색인
+
+        행이 정렬되어 있으므로 각 인덱스는 짧은 연속 구간 목록이 됩니다.
+        """
+        return {
+            'count': len(self),
+            'dicts': self.dicts,
+            'cols': {name: column.tolist() for name, column in self.cols.items()},
+            'index': {name: _run_ranges(self.cols[name]) for name in ('severity', 'rule', 'file')},
+            'search': build_search_index(self.dicts, self.cols, len(self)),
+            'highlight': [highlight_st(code) for code in self.dicts['code']],
+        }
+
+
+def _sorted_ranks(values: List[str]) -> List[int]:
+    """사전 값 ID → 정렬 순위"""
+    ranks = [0] * len(values)
+    for rank, value_id in enumerate(sorted(range(len(values)), key=values.__getitem__)):
+        ranks[value_id] = rank
+    return ranks
+
+
+# 이슈 dict 키 → IssueTable 컬럼
+_KEY_COLUMNS = dict(zip(_ISSUE_KEYS, ISSUE_COLUMNS))
 
+
+def group_issues(issues: Iterable[dict], key: str) -> Dict[str, Sequence]:
+    """이슈를 키 값별로 묶음 (값 정렬 순) - IssueTable/IssueRows 는 dict 복원 없이 행 ID 로 묶음"""
+    if isinstance(issues, (IssueTable, IssueRows)):
+        return issues.value_rows(_KEY_COLUMNS[key])
+    groups = defaultdict(list)
+    for issue in issues:
+        groups[issue[key]].append(issue)
+    return dict(sorted(groups.items()))
+
+
+def severity_counts(issues: Iterable[dict]) -> Dict[str, int]:
+    """심각도별 건수 (없는 심각도는 0)"""
+    if isinstance(issues, (IssueTable, IssueRows)):
+        return issues.severity_counts()
+    counts = defaultdict(int)
     for issue in issues:
-        severity_class = issue['severity'].lower()
-        html_parts.append(f'''
-        <div class="issue-card {severity_class}"
-             data-severity="{issue['severity']}"
-             data-rule="{issue['rule_id']}">
-            <div class="issue-header">
-                <div class="issue-title">
-                    <span class="badge {severity_class}">{issue['severity']}</span>
-                    <span>{issue['rule_id']}</span>
+        counts[issue['severity']] += 1
+    return counts
+
+
+def as_issue_table(issues: Iterable[dict]) -> IssueTable:
+    """이슈 목록/반복자 → IssueTable (이미 IssueTable 이면 그대로)"""
+    return issues if isinstance(issues, IssueTable) else IssueTable.from_issues(issues)
+
+
+def build_issue_payload(issues: Iterable[dict]) -> dict:
+    """전체 이슈 → 브라우저용 컬럼 페이로드"""
+    return as_issue_table(issues).payload()
+
+
+# 검색 색인 토큰: 2글자 이상 단어 (소문자), 1글자 검색어는 앞부분 일치로 처리
+_SEARCH_TOKEN_PATTERN = re.compile(r'\w{2,}')
+# 단어 조각: '_', 대소문자 경계(camelCase), 숫자 경계로 나눔 (FB_Motor → fb, motor / fTemperature → temperature)
+_SEARCH_PART_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+|[^\W\d_]+')
+
+
+def _search_tokens(text: str) -> FrozenSet[str]:
+    """단어 전체 + 단어 조각 토큰 (단어 중간 검색어도 조각 앞부분 일치로 찾음)"""
+    tokens = set()
+    for word in _SEARCH_TOKEN_PATTERN.findall(text):
+        tokens.add(word.lower())
+        for part in _SEARCH_PART_PATTERN.findall(word):
+            if len(part) >= 2:
+                tokens.add(part.lower())
+    return frozenset(tokens)
+
+
+def build_search_index(dicts: Dict[str, dict], cols: Dict[str, list], count: int) -> dict:
+    """규칙/메시지/코드/파일명/POU명 토큰 → 행 ID 역색인
+
+    토큰은 정렬 목록(앞부분 일치 시 이진 탐색), 포스팅은 오름차순 행 ID의 델타 인코딩입니다.
+    사전 항목별로 한 번만 토큰화하고, 파일명 토큰에는 POU명(확장자 제외 파일명)이 포함됩니다.
+    """
+    token_sets = {
+        'rule': [_search_tokens(text) for text in dicts['rule']],
+        'message': [_search_tokens(text) for text in dicts['message']],
+        'code': [_search_tokens(text) for text in dicts['code']],
+        'file': [_search_tokens(re.split(r'[\\/]', path)[-1]) for path in dicts['file']],
+    }
+
+    postings: Dict[str, List[int]] = defaultdict(list)
+    last_row: Dict[str, int] = {}
+    for row in range(count):
+        for column, sets in token_sets.items():
+            for token in sets[cols[column][row]]:
+                previous = last_row.get(token)
+                if previous == row:
+                    continue
+                postings[token].append(row - (previous if previous is not None else 0))
+                last_row[token] = row
+
+    tokens = sorted(postings)
+    return {'tokens': tokens, 'postings': [postings[token] for token in tokens]}
+
+
+def _json_for_script(data) -> str:
+    """<script> 태그 안에 넣을 수 있는 JSON (</script> 조기 종료 방지)"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+
+def iter_json_for_script(data: dict) -> Iterator[str]:
+    """최상위 키 단위로 나눠 직렬화한 JSON 조각 (C 인코더 사용, 메모리는 가장 큰 값 하나 분량)"""
+    yield '{'
+    for n, (key, value) in enumerate(data.items()):
+        yield (',' if n else '') + _json_for_script(key) + ':'
+        yield _json_for_script(value)
+    yield '}'
+
+
+def iter_all_issues_html(issues: Iterable[dict]) -> Iterator[str]:
+    """전체 이슈 목록 HTML (가상 스크롤 컨테이너 + 컬럼형 JSON 페이로드)"""
+    yield '''
+                <div id="all-issues-count" class="virtual-count"></div>
+                <div id="all-issues-list" class="virtual-list" onscroll="renderVisibleIssues()">
+                    <div id="all-issues-spacer"></div>
+                    <div id="all-issues-window" class="virtual-window"></div>
                 </div>
-                <span class="issue-location">📁 {html.escape(Path(issue['file']).name)} : {issue['line']}</span>
-            </div>
-            <div class="issue-message">{html.escape(issue['message'])}</div>
-            {f'<div class="code-block"><code>{html.escape(issue.get("code", ""))}</code></div>' if issue.get('code') else ''}
-            {f'<div class="suggestion"><div class="suggestion-title">💡 제안</div>{html.escape(issue.get("suggestion", ""))}</div>' if issue.get('suggestion') else ''}
-        </div>
-        ''')
+                <script type="application/json" id="issue-data">'''
+    yield from iter_json_for_script(build_issue_payload(issues))
+    yield '''</script>
+    '''
+
+
+# 전체 목록 가상 스크롤 / 인덱스 필터 스크립트 (f-string 밖에 두어 중괄호 이스케이프 불필요)
+VIRTUAL_LIST_SCRIPT = '''
+        const ROW_HEIGHT = 76;
+        let issueData = null;
+        let visibleIds = new Int32Array(0);
+        const escapedCache = {};
+
+        function loadIssueData() {
+            if (!issueData) {
+                issueData = JSON.parse(document.getElementById('issue-data').textContent);
+            }
+            return issueData;
+        }
 
-    return '\n'.join(html_parts)
+        function escapeHtml(text) {
+            return text.replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c]));
+        }
 
+        function dictValue(column, id) {
+            const key = column + ':' + id;
+            if (!(key in escapedCache)) escapedCache[key] = escapeHtml(issueData.dicts[column][id]);
+            return escapedCache[key];
+        }
+
+        function intersectRanges(a, b) {
+            const out = [];
+            let i = 0, j = 0;
+            while (i < a.length && j < b.length) {
+                const start = Math.max(a[i], b[j]);
+                const end = Math.min(a[i + 1], b[j + 1]);
+                if (start < end) out.push(start, end);
+                if (a[i + 1] < b[j + 1]) i += 2; else j += 2;
+            }
+            return out;
+        }
+
+        function indexRanges(column, value) {
+            if (value === 'all') return [0, issueData.count];
+            const id = issueData.dicts[column].indexOf(value);
+            return id < 0 ? [] : (issueData.index[column][id] || []);
+        }
+
+        const postingCache = {};
+
+        function postings(tokenId) {
+            if (!(tokenId in postingCache)) {
+                const deltas = issueData.search.postings[tokenId];
+                const ids = new Int32Array(deltas.length);
+                let id = 0;
+                for (let k = 0; k < deltas.length; k++) {
+                    id += deltas[k];
+                    ids[k] = id;
+                }
+                postingCache[tokenId] = ids;
+            }
+            return postingCache[tokenId];
+        }
+
+        function lowerBound(tokens, value) {
+            let lo = 0, hi = tokens.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (tokens[mid] < value) lo = mid + 1; else hi = mid;
+            }
+            return lo;
+        }
+
+        // 검색어마다 앞부분이 일치하는 토큰들의 포스팅 합집합을 구하고, 검색어 간에는 교집합
+        // (앞부분이 일치하는 토큰이 없으면 검색어를 포함하는 토큰으로 대체)
+        function searchIds(query) {
+            const terms = query.toLowerCase().match(/[\\p{L}\\p{N}_]+/gu);
+            if (!terms) return null;
+            const tokens = issueData.search.tokens;
+            let result = null;
+            for (const term of terms) {
+                const lo = lowerBound(tokens, term);
+                const hi = lowerBound(tokens, term + '\\uffff');
+                const marks = new Uint8Array(issueData.count);
+                if (lo < hi) {
+                    for (let t = lo; t < hi; t++) postings(t).forEach(id => { marks[id] = 1; });
+                } else {
+                    for (let t = 0; t < tokens.length; t++) {
+                        if (tokens[t].includes(term)) postings(t).forEach(id => { marks[id] = 1; });
+                    }
+                }
+                if (result) {
+                    result = result.filter(id => marks[id]);
+                } else {
+                    result = [];
+                    for (let id = 0; id < marks.length; id++) if (marks[id]) result.push(id);
+                }
+                if (!result.length) break;
+            }
+            return result;
+        }
+
+        function filterAllIssues() {
+            loadIssueData();
+            const severity = document.getElementById('all-severity-filter').value;
+            const rule = document.getElementById('all-rule-filter').value;
+            const file = document.getElementById('all-file-filter').value;
+            const found = searchIds(document.getElementById('all-search').value);
+
+            let ranges = indexRanges('severity', severity);
+            ranges = intersectRanges(ranges, indexRanges('rule', rule));
+            ranges = intersectRanges(ranges, indexRanges('file', file));
+
+            const ids = [];
+            if (found) {
+                // 정렬된 검색 결과와 필터 구간을 함께 순회
+                let r = 0;
+                for (const id of found) {
+                    while (r < ranges.length && ranges[r + 1] <= id) r += 2;
+                    if (r < ranges.length && ranges[r] <= id) ids.push(id);
+                }
+            } else {
+                for (let r = 0; r < ranges.length; r += 2) {
+                    for (let id = ranges[r]; id < ranges[r + 1]; id++) ids.push(id);
+                }
+            }
+            visibleIds = Int32Array.from(ids);
+
+            document.getElementById('all-issues-count').textContent =
+                visibleIds.length.toLocaleString() + ' / ' + issueData.count.toLocaleString() + '건';
+            document.getElementById('all-issues-spacer').style.height = (visibleIds.length * ROW_HEIGHT) + 'px';
+            document.getElementById('all-issues-list').scrollTop = 0;
+            renderVisibleIssues();
+        }
 
-def generate_complexity_html(files: list) -> str:
+        function renderVisibleIssues() {
+            if (!issueData) return;
+            const list = document.getElementById('all-issues-list');
+            const first = Math.max(0, Math.floor(list.scrollTop / ROW_HEIGHT) - 5);
+            const last = Math.min(visibleIds.length, Math.ceil((list.scrollTop + list.clientHeight) / ROW_HEIGHT) + 5);
+            const cols = issueData.cols;
+            const parts = [];
+            for (let k = first; k < last; k++) {
+                const id = visibleIds[k];
+                const severity = issueData.dicts.severity[cols.severity[id]];
+                const cls = severity.toLowerCase();
+                const file = issueData.dicts.file[cols.file[id]];
+                parts.push(
+                    '<div class="virtual-row ' + cls + '" title="' + dictValue('suggestion', cols.suggestion[id]) + '">' +
+                    '<div class="row-head"><span class="badge ' + cls + '">' + severity + '</span>' +
+                    '<span>' + dictValue('rule', cols.rule[id]) + '</span>' +
+                    '<span class="issue-location" title="' + dictValue('file', cols.file[id]) + '">📁 ' +
+                    escapeHtml(file.split(/[\\\\/]/).pop()) + ' : ' + cols.line[id] + '</span></div>' +
+                    '<div>' + dictValue('message', cols.message[id]) + '</div>' +
+                    '<div class="row-code">' + issueData.highlight[cols.code[id]] + '</div></div>'
+                );
+            }
+            const win = document.getElementById('all-issues-window');
+            win.style.top = (first * ROW_HEIGHT) + 'px';
+            win.innerHTML = parts.join('');
+        }
+'''
+
+
+def iter_complexity_html(files: list) -> Iterator[str]:
     """복잡도 분석 HTML"""
     # 복잡도 높은 순 정렬
     complex_files = sorted([f for f in files if f.get('complexity', 0) > 0],
                           key=lambda x: x.get('complexity', 0), reverse=True)[:30]
 
-    html_parts = ['''
+    yield '''
         <p style="color: var(--text-secondary); margin-bottom: 15px;">
             순환 복잡도(Cyclomatic Complexity)가 높은 파일은 테스트와 유지보수가 어렵습니다.
             일반적으로 15 이하를 권장합니다.
@@ -854,7 +1500,7 @@ def generate_complexity_html(files: list) -> str:
                 <th>이슈수</th>
                 <th>상태</th>
             </tr>
-    ''']
+    '''
 
     for f in complex_files:
         complexity = f.get('complexity', 0)
@@ -865,7 +1511,7 @@ def generate_complexity_html(files: list) -> str:
         else:
             status = '<span style="color: var(--success-color);">🟢 정상</span>'
 
-        html_parts.append(f'''
+        yield f'''
             <tr>
                 <td>{html.escape(f.get('name', ''))}</td>
                 <td>{f.get('pou_type', '')}</td>
@@ -874,10 +1520,9 @@ def generate_complexity_html(files: list) -> str:
                 <td>{f.get('issue_count', 0)}</td>
                 <td>{status}</td>
             </tr>
-        ''')
+        '''
 
-    html_parts.append('</table>')
-    return '\n'.join(html_parts)
+    yield '</table>'
 
 
 def generate_detailed_markdown(report: dict) -> str:
@@ -903,14 +1548,12 @@ def generate_detailed_markdown(report: dict) -> str:
     md.append("")
 
     # Critical 이슈 상세
-    critical_issues = [i for i in report['issues'] if i['severity'] == 'Critical']
+    critical_issues = as_issue_table(report['issues']).severity_rows('Critical')
     if critical_issues:
         md.append("## 🔴 Critical Issues 상세")
         md.append("")
 
-        by_rule = defaultdict(list)
-        for issue in critical_issues:
-            by_rule[issue['rule_id']].append(issue)
+        by_rule = group_issues(critical_issues, 'rule_id')
 
         for rule_id in sorted(by_rule.keys()):
             issues = by_rule[rule_id]
@@ -947,26 +1590,32 @@ if __name__ == "__main__":
     json_path = r"D:\01. Vscode\Twincat\features\twincat-code-qa-tool\output\single_project_qa_report.json"
     project_path = r"D:\00.Comapre\pollux_hcds_ald_mirror_ffff\Src_Diff\PLC\PM1\PM1"
 
-    if len(sys.argv) > 1:
-        json_path = sys.argv[1]
+    # --sharded[=N]: 인덱스 + 파일 N개 단위 페이지로 분할 출력
+    # --context=N: 이슈 전후 소스 라인 수 (0 이면 생략)
+    files_per_page = None
+    context_lines = CONTEXT_LINES
+    args = []
+    for arg in sys.argv[1:]:
+        if arg.startswith('--sharded'):
+            files_per_page = int(arg.split('=', 1)[1]) if '=' in arg else SHARD_FILES_PER_PAGE
+        elif arg.startswith('--context='):
+            context_lines = int(arg.split('=', 1)[1])
+        else:
+            args.append(arg)
+
+    if args:
+        json_path = args[0]
 
     print("상세 리포트 생성 중...")
 
-    # 리포트 로드
+    # 리포트 로드 (소스 컨텍스트는 리포트에 기록된 프로젝트 경로 우선)
     report = load_report(json_path)
+    if Path(report.get('project_path', '')).is_dir():
+        project_path = report['project_path']
 
-    # HTML 리포트 생성
-    html_content = generate_detailed_html_report(report, project_path)
-    html_path = Path(json_path).parent / "qa_detailed_report.html"
-    with open(html_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    print(f"HTML 리포트: {html_path}")
-
-    # 상세 Markdown 생성
-    md_content = generate_detailed_markdown(report)
-    md_path = Path(json_path).parent / "qa_detailed_report.md"
-    with open(md_path, 'w', encoding='utf-8') as f:
-        f.write(md_content)
-    print(f"Markdown 리포트: {md_path}")
+    # 상세 HTML/Markdown 을 동시에 생성
+    from report_pipeline import PipelineOptions, run_pipeline
+    run_pipeline(report, Path(json_path).parent, ('html', 'detailed-md'),
+                 options=PipelineOptions(project_path, context_lines, files_per_page))
 
     print("\n완료!")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT 솔루션 구조 파싱
+.sln → .tsproj → .plcproj 참조를 따라가 솔루션에 포함된 PLC 프로젝트 목록 수집
+"""
+
+import os
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from project_files import discover_files
+
+# .sln 프로젝트 항목: Project("{타입}") = "이름", "상대 경로", "{GUID}"
+_SLN_PROJECT = re.compile(r'^Project\("\{[^}]*\}"\)\s*=\s*"([^"]*)",\s*"([^"]*)"', re.MULTILINE)
+
+# .tsproj 의 PLC 프로젝트 참조 (독립 프로젝트 파일 .xti 는 _Config/PLC 아래에 저장됨)
+_XTI_FOLDER = ('_Config', 'PLC')
+
+
+@dataclass
+class PlcProject:
+    """솔루션에 포함된 PLC 프로젝트 하나"""
+    name: str
+    plcproj: Path
+    tsproj: Optional[Path] = None
+
+    @property
+    def root(self) -> Path:
+        """분석 대상 폴더 (.plcproj 가 있는 폴더)"""
+        return self.plcproj.parent
+
+
+def _resolve(base_dir: Path, rel_path: str) -> Path:
+    """솔루션 파일 안의 Windows 상대 경로 → 절대 경로"""
+    return Path(os.path.normpath(base_dir.joinpath(*re.split(r'[\\/]', rel_path))))
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _tsproj_references(path: Path) -> Iterator[tuple]:
+    """.tsproj/.xti 에서 (PLC 이름, .plcproj 경로) 추출 (설정 파일이 커서 iterparse 로 훑음)"""
+    try:
+        for _, elem in ET.iterparse(path, events=('end',)):
+            if _local_name(elem.tag) == 'Project':
+                name = elem.get('Name', '')
+                if elem.get('PrjFilePath'):
+                    yield name, _resolve(path.parent, elem.get('PrjFilePath'))
+                elif elem.get('File', '').lower().endswith('.xti') and path.suffix.lower() == '.tsproj':
+                    xti = _resolve(path.parent.joinpath(*_XTI_FOLDER), elem.get('File'))
+                    if xti.exists():
+                        yield from _tsproj_references(xti)
+            elem.clear()
+    except (ET.ParseError, OSError) as e:
+        print(f"    경고: {path} 파싱 실패 - {e}")
+
+
+def _projects_from_tsproj(tsproj: Path) -> List[PlcProject]:
+    projects = []
+    for name, plcproj in _tsproj_references(tsproj):
+        if plcproj.exists():
+            projects.append(PlcProject(name or plcproj.stem, plcproj, tsproj))
+        else:
+            print(f"    경고: {tsproj.name} 의 PLC 프로젝트 {plcproj} 없음")
+    return projects
+
+
+def _projects_from_sln(sln: Path) -> List[PlcProject]:
+    content = sln.read_text(encoding='utf-8-sig', errors='ignore')
+    projects = []
+    for name, rel_path in _SLN_PROJECT.findall(content):
+        path = _resolve(sln.parent, rel_path)
+        suffix = path.suffix.lower()
+        if suffix == '.tsproj' and path.exists():
+            projects.extend(_projects_from_tsproj(path))
+        elif suffix == '.plcproj' and path.exists():
+            projects.append(PlcProject(name, path))
+    return projects
+
+
+def find_plc_projects(path) -> List[PlcProject]:
+    """.sln/.tsproj/.plcproj 파일 또는 폴더 → PLC 프로젝트 목록 (중복 제거, 이름 중복 시 번호 부여)
+
+    폴더를 주면 최상위의 .sln 을 먼저 찾고, 없으면 트리 안의 .plcproj 를 모두 모읍니다.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if path.is_file() and suffix == '.sln':
+        projects = _projects_from_sln(path)
+    elif path.is_file() and suffix == '.tsproj':
+        projects = _projects_from_tsproj(path)
+    elif path.is_file() and suffix == '.plcproj':
+        projects = [PlcProject(path.stem, path)]
+    elif path.is_dir():
+        solutions = sorted(path.glob('*.sln'))
+        if solutions:
+            projects = [project for sln in solutions for project in _projects_from_sln(sln)]
+        else:
+            projects = [PlcProject(item.path.stem, item.path) for item in discover_files(path, ('.plcproj',))]
+    else:
+        raise ValueError(f"솔루션/프로젝트 경로가 아닙니다: {path}")
+
+    unique: List[PlcProject] = []
+    seen_paths = set()
+    seen_names: Dict[str, int] = {}
+    for project in projects:
+        key = os.path.normcase(str(project.plcproj.resolve()))
+        if key in seen_paths:
+            continue
+        seen_paths.add(key)
+        seen_names[project.name] = seen_names.get(project.name, 0) + 1
+        if seen_names[project.name] > 1:
+            project.name = f"{project.name}#{seen_names[project.name]}"
+        unique.append(project)
+    return unique
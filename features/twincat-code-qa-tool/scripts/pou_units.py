@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+POU 분석 단위 분리
+POU 본문과 Method/Action/Property(Get/Set)/Transition 을 각각의 분석 단위로 나눔
+한 번의 순차 스캔으로 섹션 스트림(Declaration/ST, extract_section 과 동일)과 단위별 라인 구간을 함께 수집
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# 단위 종류 (본문은 POU/GVL/DUT 최상위 선언+구현)
+BODY = 'BODY'
+UNIT_KINDS = {
+    'Method': 'METHOD',
+    'Action': 'ACTION',
+    'Property': 'PROPERTY',
+    'Get': 'GET',
+    'Set': 'SET',
+    'Transition': 'TRANSITION',
+}
+
+# 본문 이름을 정하는 최상위 태그
+_ROOT_TAGS = ('POU', 'GVL', 'DUT')
+
+# 단위 태그 열기/닫기, 최상위 태그, 섹션 CDATA 시작을 한 패턴으로 찾음 (CDATA 안은 건너뜀)
+_TOKEN = re.compile(
+    r'<(/?)(Method|Action|Property|Get|Set|Transition|POU|GVL|DUT)\b([^>]*)>'
+    r'|<(Declaration|ST)><!\[CDATA\['
+)
+_NAME = re.compile(r'\bName="([^"]*)"')
+
+
+@dataclass
+class CodeUnit:
+    """분석 단위 하나 - 섹션 스트림 안의 라인 구간 (시작은 0부터)"""
+    kind: str
+    name: str  # 파일 내 정규화 이름 (FB_Motor, FB_Motor.M_Start, FB_Motor.P_Speed.Get)
+    decl_start: int = 0
+    decl_lines: int = 0
+    st_start: int = 0
+    st_lines: int = 0
+
+    @property
+    def is_body(self) -> bool:
+        return self.kind == BODY
+
+
+def unit_at(units: List[CodeUnit], section: str, line: int) -> Optional[CodeUnit]:
+    """섹션 스트림 라인 번호(1부터) → 해당 단위 (section: Declaration/ST)"""
+    for unit in units:
+        start, count = (unit.decl_start, unit.decl_lines) if section == 'Declaration' else (unit.st_start, unit.st_lines)
+        if count and start < line <= start + count:
+            return unit
+    return None
+
+
+@dataclass
+class SourceUnits:
+    """파일 하나의 섹션 스트림 + 분석 단위 (본문이 첫 번째)"""
+    declaration: str
+    st_code: str
+    units: List[CodeUnit] = field(default_factory=list)
+    _lines: Dict[str, List[str]] = field(default_factory=dict, repr=False)
+
+    def lines(self, section: str) -> List[str]:
+        """섹션 스트림 라인 목록 (한 번만 분할)"""
+        lines = self._lines.get(section)
+        if lines is None:
+            lines = self._lines[section] = (self.declaration if section == 'Declaration' else self.st_code).split('\n')
+        return lines
+
+    def unit_lines(self, unit: CodeUnit, section: str) -> List[str]:
+        """단위의 섹션 라인 (해당 섹션이 없으면 빈 목록)"""
+        start, count = (unit.decl_start, unit.decl_lines) if section == 'Declaration' else (unit.st_start, unit.st_lines)
+        return self.lines(section)[start:start + count] if count else []
+
+    def unit_at(self, section: str, line: int) -> Optional[CodeUnit]:
+        return unit_at(self.units, section, line)
+
+
+def split_units(content: str) -> SourceUnits:
+    """TcPOU/TcGVL/TcDUT XML → 섹션 스트림 + 분석 단위 (한 번의 스캔)
+
+    섹션 블록은 문서 순서대로 '\\n' 으로 이어 붙이므로 스트림은 extract_section 결과와 같고,
+    각 블록은 그 블록을 감싼 가장 안쪽 단위(없으면 본문)에 속합니다.
+    """
+    body = CodeUnit(BODY, '')
+    units = [body]
+    stack = [body]
+    blocks: Dict[str, List[str]] = {'Declaration': [], 'ST': []}
+    next_line = {'Declaration': 0, 'ST': 0}
+    pos = 0
+    while True:
+        match = _TOKEN.search(content, pos)
+        if match is None:
+            break
+        section = match.group(4)
+        if section:
+            start = match.end()
+            end = content.find(f']]></{section}>', start)
+            if end < 0:
+                break
+            block = content[start:end]
+            lines = block.count('\n') + 1
+            unit = stack[-1]
+            if section == 'Declaration':
+                if not unit.decl_lines:
+                    unit.decl_start = next_line[section]
+                unit.decl_lines += lines
+            else:
+                if not unit.st_lines:
+                    unit.st_start = next_line[section]
+                unit.st_lines += lines
+            blocks[section].append(block)
+            next_line[section] += lines
+            pos = end + len(section) + 6
+            continue
+
+        closing, tag, attrs = match.group(1), match.group(2), match.group(3)
+        pos = match.end()
+        if tag in _ROOT_TAGS:
+            if not closing and not body.name:
+                name = _NAME.search(attrs)
+                body.name = name.group(1) if name else ''
+            continue
+        if closing:
+            if len(stack) > 1 and stack[-1].kind == UNIT_KINDS[tag]:
+                stack.pop()
+            continue
+        if attrs.rstrip().endswith('/'):
+            continue
+        name = _NAME.search(attrs)
+        parent = stack[-1]
+        unit_name = name.group(1) if name else tag
+        unit = CodeUnit(UNIT_KINDS[tag], f"{parent.name}.{unit_name}" if parent.name else unit_name)
+        units.append(unit)
+        stack.append(unit)
+
+    return SourceUnits('\n'.join(blocks['Declaration']), '\n'.join(blocks['ST']),
+                       [unit for unit in units if unit.is_body or unit.decl_lines or unit.st_lines])
+
+
+def unit_digest(declaration: str, st_code: str) -> str:
+    """단위 내용 지문 (선언부 + 구현부)"""
+    return hashlib.md5(f"{declaration}\0{st_code}".encode('utf-8')).hexdigest()
+
+
+class UnitCache:
+    """분석 단위별 결과 캐시 - 내용이 같은 단위는 규칙을 다시 실행하지 않음
+
+    키는 (파일, 파일 유형, 단위 이름, 내용 지문). 분석 한 번이 끝나면 prune() 으로 이번에 쓰지 않은 항목을 버립니다.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str, str, str], object] = {}
+        self._used: set = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str, str, str]):
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._used.add(key)
+        return value
+
+    def put(self, key: Tuple[str, str, str, str], value):
+        self._entries[key] = value
+        self._used.add(key)
+
+    def prune(self):
+        """이번 분석에서 쓰지 않은 항목 제거 (사라졌거나 바뀐 단위)"""
+        self._entries = {key: value for key, value in self._entries.items() if key in self._used}
+        self._used = set()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT 프로젝트 파일 탐색
+os.scandir 한 번의 트리 순회로 모든 대상 확장자를 수집 (확장자별 rglob 반복 순회 대체)
+빌드 생성 폴더(_Boot, _CompileInfo 등)와 .twincatqaignore 패턴에 걸리는 폴더는 내려가지 않음
+.plcproj 가 있으면 그 <Compile Include> 항목만 분석 대상으로 사용 (프로젝트에서 빠진 파일/백업 제외)
+"""
+
+import os
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from fnmatch import translate
+from pathlib import Path
+from typing import Iterable, List, Optional
+from urllib.parse import unquote
+
+# 분석 대상이 아닌 생성/캐시 폴더 (이름 비교, 대소문자 무시)
+EXCLUDED_DIRS = frozenset(name.lower() for name in (
+    '_Boot', '_CompileInfo', '_Libraries', '_Deployment', '.git', '.vs', '.svn',
+))
+
+# 프로젝트 루트의 무시 패턴 파일
+IGNORE_FILE = '.twincatqaignore'
+
+# 파일 목록 출처
+MODE_PLCPROJ = 'plcproj'  # .plcproj 의 Compile 항목
+MODE_WALK = 'walk'  # 폴더 순회 (프로젝트 파일이 없을 때)
+
+
+@dataclass
+class DiscoveredFile:
+    """탐색된 파일 (크기/수정 시각은 scandir 항목에서 - Windows 에서는 추가 stat 호출 없음)"""
+    path: Path
+    rel_path: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class FileListing:
+    """분석 대상 파일 목록과 출처"""
+    files: List[DiscoveredFile]
+    mode: str  # plcproj, walk
+    project_files: List[str] = field(default_factory=list)  # 목록을 읽은 .plcproj (루트 기준)
+    missing: List[str] = field(default_factory=list)  # Compile 항목에 있지만 디스크에 없는 파일
+
+    def to_dict(self) -> dict:
+        """리포트 discovery 블록"""
+        return {"mode": self.mode, "project_files": self.project_files, "missing_files": self.missing}
+
+
+class IgnoreRules:
+    """.twincatqaignore 패턴 (gitignore 방식의 부분 집합, 대소문자 무시)
+
+    - 빈 줄과 '#' 으로 시작하는 줄은 무시
+    - '/' 가 없는 패턴은 모든 깊이의 파일/폴더 이름과 비교 (예: *_Test.TcPOU, Backup)
+    - '/' 가 있는 패턴은 루트 기준 상대 경로와 비교 (예: POUs/Generated/*, /Simulation)
+    - '/' 로 끝나는 패턴은 폴더에만 적용, 걸린 폴더는 하위 전체를 건너뜀
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self.patterns: List[str] = []
+        name_any, name_dir, path_any, path_dir = [], [], [], []
+        for raw in patterns:
+            pattern = raw.strip()
+            if not pattern or pattern.startswith('#'):
+                continue
+            self.patterns.append(pattern)
+            dir_only = pattern.endswith('/')
+            pattern = pattern.rstrip('/').lower()
+            if '/' in pattern:
+                (path_dir if dir_only else path_any).append(translate(pattern.lstrip('/')))
+            else:
+                (name_dir if dir_only else name_any).append(translate(pattern))
+        # 종류별 패턴을 정규식 하나로 묶어 항목당 최대 두 번만 비교
+        self._file_name = self._combine(name_any)
+        self._file_path = self._combine(path_any)
+        self._dir_name = self._combine(name_any + name_dir)
+        self._dir_path = self._combine(path_any + path_dir)
+
+    @staticmethod
+    def _combine(regexes: List[str]):
+        return re.compile('|'.join(regexes)).match if regexes else None
+
+    @classmethod
+    def load(cls, root: Path) -> 'IgnoreRules':
+        """루트의 .twincatqaignore 읽기 (없으면 빈 규칙)"""
+        try:
+            text = (root / IGNORE_FILE).read_text(encoding='utf-8-sig', errors='ignore')
+        except OSError:
+            return cls()
+        return cls(text.splitlines())
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def ignored(self, name: str, rel_posix: str, is_dir: bool) -> bool:
+        """항목 제외 여부 (rel_posix: '/' 구분 상대 경로)"""
+        by_name, by_path = (self._dir_name, self._dir_path) if is_dir else (self._file_name, self._file_path)
+        return bool((by_name and by_name(name.lower())) or (by_path and by_path(rel_posix.lower())))
+
+
+def discover_files(root, extensions: Iterable[str], ignore: Optional[IgnoreRules] = None) -> List[DiscoveredFile]:
+    """트리 한 번 순회로 확장자가 맞는 파일 수집 (상대 경로 순 정렬, 확장자 대소문자 무시)
+
+    ignore 를 주지 않으면 루트의 .twincatqaignore 를 읽습니다.
+    심볼릭 링크 폴더는 따라가지 않고, 읽을 수 없는 폴더는 건너뜁니다 (rglob 과 동일).
+    """
+    root = Path(root)
+    suffixes = {ext.lower() for ext in extensions}
+    rules = IgnoreRules.load(root) if ignore is None else ignore
+    found: List[DiscoveredFile] = []
+    # (폴더 경로, 루트 기준 상대 경로 조각)
+    stack = [(str(root), ())]
+    while stack:
+        directory, parts = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+        except OSError:
+            continue
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                if name.lower() in EXCLUDED_DIRS:
+                    continue
+                if rules and rules.ignored(name, '/'.join(parts + (name,)), True):
+                    continue
+                stack.append((entry.path, parts + (name,)))
+                continue
+            if os.path.splitext(name)[1].lower() not in suffixes:
+                continue
+            if rules and rules.ignored(name, '/'.join(parts + (name,)), False):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            found.append(DiscoveredFile(
+                path=Path(entry.path),
+                rel_path=os.path.join(*parts, name),
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+            ))
+    found.sort(key=lambda item: item.rel_path)
+    return found
+
+
+def plcproj_compile_items(plcproj: Path) -> List[str]:
+    """.plcproj 의 <Compile Include> 경로 (MSBuild 이스케이프 해제, Windows 구분자 그대로)
+
+    TwinCAT 프로젝트 파일은 라이브러리 참조/배포 설정까지 담아 커질 수 있어 iterparse 로 훑고 바로 버립니다.
+    """
+    items = []
+    for _, elem in ET.iterparse(plcproj, events=('end',)):
+        if elem.tag.rsplit('}', 1)[-1] == 'Compile' and elem.get('Include'):
+            items.append(unquote(elem.get('Include')))
+        elem.clear()
+    return items
+
+
+def discover_project_files(root, extensions: Iterable[str], ignore: Optional[IgnoreRules] = None) -> FileListing:
+    """분석 대상 파일 목록 - 루트에 .plcproj 가 있으면 Compile 항목, 없으면 폴더 순회
+
+    Compile 항목에도 .twincatqaignore 는 적용합니다. 프로젝트 파일을 읽을 수 없으면 폴더 순회로 대체.
+    """
+    root = Path(root)
+    suffixes = {ext.lower() for ext in extensions}
+    rules = IgnoreRules.load(root) if ignore is None else ignore
+    try:
+        with os.scandir(root) as entries:
+            projects = sorted(entry.name for entry in entries
+                              if entry.name.lower().endswith('.plcproj') and entry.is_file())
+    except OSError:
+        projects = []
+
+    listing = FileListing([], MODE_PLCPROJ, projects)
+    seen = set()
+    for project in projects:
+        try:
+            items = plcproj_compile_items(root / project)
+        except (ET.ParseError, OSError) as e:
+            print(f"    경고: {project} 읽기 실패 - {e}")
+            return FileListing(discover_files(root, extensions, rules), MODE_WALK)
+        for item in items:
+            parts = tuple(part for part in re.split(r'[\\/]', item) if part and part != '.')
+            if not parts or os.path.splitext(parts[-1])[1].lower() not in suffixes:
+                continue
+            rel_path = os.path.join(*parts)
+            if rel_path in seen:
+                continue
+            seen.add(rel_path)
+            if rules and (rules.ignored(parts[-1], '/'.join(parts), False)
+                          or any(rules.ignored(parts[i], '/'.join(parts[:i + 1]), True) for i in range(len(parts) - 1))):
+                continue
+            path = root.joinpath(*parts)
+            try:
+                stat = path.stat()
+            except OSError:
+                listing.missing.append(rel_path)
+                continue
+            listing.files.append(DiscoveredFile(path, rel_path, stat.st_size, stat.st_mtime_ns))
+
+    if not projects:
+        return FileListing(discover_files(root, extensions, rules), MODE_WALK)
+    listing.files.sort(key=lambda item: item.rel_path)
+    return listing
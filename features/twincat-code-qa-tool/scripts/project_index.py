@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT 프로젝트 인덱스
+파일 목록, 해시, 선언부/구현부, 변수 테이블을 한 번의 읽기로 수집
+"""
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from pou_units import CodeUnit, split_units
+from project_files import DiscoveredFile, discover_files
+from source_encoding import EncodingCache
+from st_declaration import VariableTable, build_variable_table
+
+INDEX_EXTENSIONS = ('.TcPOU', '.TcGVL', '.TcDUT', '.plcproj')
+
+_SECTION_TAGS = {
+    section: (f'<{section}><![CDATA[', f']]></{section}>')
+    for section in ('Declaration', 'ST')
+}
+
+
+def extract_section(content: str, section: str) -> str:
+    """XML에서 섹션(Declaration/ST) 추출 (블록이 여럿이면 '\\n' 으로 연결)
+
+    DOTALL 정규식 대신 str.find 로 여는/닫는 태그를 찾으므로 닫히지 않은 CDATA 가 있어도 선형 시간.
+    """
+    open_tag, close_tag = _SECTION_TAGS[section]
+    blocks = []
+    pos = content.find(open_tag)
+    while pos >= 0:
+        start = pos + len(open_tag)
+        end = content.find(close_tag, start)
+        if end < 0:
+            break
+        blocks.append(content[start:end])
+        pos = content.find(open_tag, end + len(close_tag))
+    return '\n'.join(blocks)
+
+
+@dataclass
+class IndexedFile:
+    """인덱싱된 파일"""
+    rel_path: str
+    path: Path
+    size: int
+    digest: str
+    mtime_ns: int = 0
+    encoding: str = "utf-8"
+    declaration: str = ""
+    st_code: str = ""
+    units: List[CodeUnit] = field(default_factory=list)  # 본문 + Method/Action/Property/Transition 라인 구간
+    _variables: Optional[VariableTable] = None
+
+    @property
+    def variables(self) -> VariableTable:
+        """변수 테이블 (최초 접근 시 파싱)"""
+        if self._variables is None:
+            self._variables = build_variable_table(self.declaration)
+        return self._variables
+
+
+class ProjectIndex:
+    """프로젝트 트리 인덱스"""
+
+    def __init__(self, root: str, encodings: Optional[EncodingCache] = None):
+        self.root = Path(root)
+        self.files: Dict[str, IndexedFile] = {}
+        self.built = False
+        # 경로별 감지 인코딩 (분석 세션이 주면 단일 분석과 공유)
+        self.encodings = encodings if encodings is not None else EncodingCache()
+
+    def discover(self) -> List[DiscoveredFile]:
+        """인덱싱 대상 파일 (트리 한 번 순회, 생성 폴더와 .twincatqaignore 제외)"""
+        return discover_files(self.root, INDEX_EXTENSIONS)
+
+    def list_files(self) -> List[Path]:
+        """인덱싱 대상 파일 목록"""
+        return [item.path for item in self.discover()]
+
+    def stale_files(self) -> List[Path]:
+        """새로 인덱싱해야 할 파일 (신규 또는 크기/수정 시각 변경), 사라진 파일은 제거"""
+        stale = []
+        current: Dict[str, IndexedFile] = {}
+        for item in self.discover():
+            known = self.files.get(item.rel_path)
+            if known is not None and known.size == item.size and known.mtime_ns == item.mtime_ns:
+                current[item.rel_path] = known
+                continue
+            stale.append(item.path)
+        self.files = current
+        return stale
+
+    def index_file(self, file_path: Path) -> IndexedFile:
+        """파일 한 번 읽기로 해시 + 인코딩 감지 + 섹션/단위 추출"""
+        mtime_ns = file_path.stat().st_mtime_ns
+        data = file_path.read_bytes()
+        content, encoding = self.encodings.decode(str(file_path), len(data), mtime_ns, data)
+        source = split_units(content)
+        return IndexedFile(
+            rel_path=str(file_path.relative_to(self.root)),
+            path=file_path,
+            size=len(data),
+            digest=hashlib.md5(data).hexdigest(),
+            mtime_ns=mtime_ns,
+            encoding=encoding,
+            declaration=source.declaration,
+            st_code=source.st_code,
+            units=source.units,
+        )
+
+    def build(self, max_workers: Optional[int] = None) -> 'ProjectIndex':
+        """트리 스캔 및 인덱싱 (이미 인덱싱된 경우 변경된 파일만 다시 읽음)"""
+        build_indexes([self], max_workers)
+        return self
+
+    def fingerprint(self) -> str:
+        """트리 내용 지문 (경로 + 해시)"""
+        digest = hashlib.md5()
+        for rel_path in sorted(self.files):
+            digest.update(f"{rel_path}\0{self.files[rel_path].digest}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, rel_path: str) -> Optional[IndexedFile]:
+        return self.files.get(rel_path)
+
+
+def build_indexes(indexes: Sequence[ProjectIndex], max_workers: Optional[int] = None) -> Sequence[ProjectIndex]:
+    """여러 프로젝트 트리를 하나의 스레드 풀에서 동시에 스캔/해시"""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        listings = list(pool.map(lambda index: index.stale_files(), indexes))
+        futures = [
+            (index, pool.submit(index.index_file, file_path))
+            for index, files in zip(indexes, listings)
+            for file_path in files
+        ]
+        for index, future in futures:
+            try:
+                indexed = future.result()
+            except OSError as e:
+                print(f"    경고: 파일 읽기 실패 - {e}")
+                continue
+            index.files[indexed.rel_path] = indexed
+    for index in indexes:
+        index.built = True
+    return indexes
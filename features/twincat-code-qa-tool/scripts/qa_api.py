@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT QA 분석 API
+CLI 스크립트와 웹 애플리케이션이 공통으로 사용하는 버전 관리되는 진입점 및 결과 타입
+"""
+
+import threading
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from analyze_real_project import TwinCATQAAnalyzer
+from analyze_single_project import TwinCATSingleProjectAnalyzer
+from pou_units import UnitCache
+from project_index import ProjectIndex
+from source_encoding import EncodingCache
+
+# 결과 스키마 버전 (키 추가는 minor, 키 변경/삭제는 major 증가)
+API_VERSION = "1.4"
+
+
+class IssueRecord(TypedDict, total=False):
+    """QA 이슈 레코드 (단일 분석은 category 포함)"""
+    rule_id: str
+    severity: str
+    category: str
+    file: str
+    line: int
+    message: str
+    code: str
+    suggestion: str
+    unit: str  # Method/Action/Property/Transition 안의 이슈만
+    unit_line: int
+
+
+class UnitRecord(TypedDict):
+    """분석 단위 레코드 (POU 본문, Method/Action/Property/Transition)"""
+    name: str
+    kind: str
+    lines_of_code: int
+    complexity: int
+    max_nesting: int
+    variable_count: int
+    issue_count: int
+
+
+class FileRecord(TypedDict, total=False):
+    """단일 분석 파일 레코드"""
+    path: str
+    type: str
+    pou_type: str
+    name: str
+    lines: int
+    complexity: int
+    issue_count: int
+    units: List[UnitRecord]  # 단위가 둘 이상인 POU 만
+
+
+class FileChangeRecord(TypedDict):
+    """비교 분석 파일 변경 레코드"""
+    path: str
+    type: str
+    old_size: int
+    new_size: int
+    old_path: str
+    similarity: float
+
+
+class VariableChangeRecord(TypedDict):
+    """비교 분석 변수 변경 레코드"""
+    file: str
+    name: str
+    type: str
+    scope: str
+    old_name: str
+    old_type: str
+    new_type: str
+    old_value: str
+    new_value: str
+
+
+@dataclass
+class IssueCounts:
+    """심각도별 이슈 수"""
+    total: int = 0
+    critical: int = 0
+    warning: int = 0
+    info: int = 0
+
+
+@dataclass
+class SingleProjectSummary:
+    """단일 프로젝트 요약"""
+    total_files: int
+    pou_count: int
+    gvl_count: int
+    dut_count: int
+    total_lines: int
+    issues: IssueCounts
+
+
+@dataclass
+class SingleProjectResult:
+    """단일 프로젝트 분석 결과"""
+    project_path: str
+    generated_at: str
+    summary: SingleProjectSummary
+    issues_by_category: Dict[str, int]
+    issues_by_rule: Dict[str, Dict]
+    files: List[FileRecord]
+    issues: List[IssueRecord]
+    profile: Dict = field(default_factory=dict)  # 단계/파일/규칙별 분석 시간 (1.1~, 이전 리포트는 빈 dict)
+    skipped_checks: List[Dict] = field(default_factory=list)  # 시간 예산/라인 길이로 건너뛴 검사 (1.2~)
+    discovery: Dict = field(default_factory=dict)  # 파일 목록 출처 (plcproj/walk) 와 없는 파일 (1.3~)
+    api_version: str = API_VERSION
+    analysis_type: str = "single"
+
+    @classmethod
+    def from_dict(cls, report: Dict) -> 'SingleProjectResult':
+        """분석기 리포트 dict → 결과 객체"""
+        s = report['summary']
+        return cls(
+            project_path=report['project_path'],
+            generated_at=report['generated_at'],
+            summary=SingleProjectSummary(
+                total_files=s['total_files'],
+                pou_count=s['total_pou'],
+                gvl_count=s['total_gvl'],
+                dut_count=s['total_dut'],
+                total_lines=s['total_lines'],
+                issues=IssueCounts(s['total_issues'], s['critical_count'], s['warning_count'], s['info_count']),
+            ),
+            issues_by_category=dict(s.get('by_category', {})),
+            issues_by_rule=report['issues_by_rule'],
+            files=report['files'],
+            issues=report['issues'],
+            profile=report.get('profile', {}),
+            skipped_checks=report.get('skipped_checks', []),
+            discovery=report.get('discovery', {}),
+            api_version=report.get('api_version', API_VERSION),
+        )
+
+    def to_dict(self) -> Dict:
+        """분석기 리포트와 동일한 레이아웃 + api_version"""
+        s = self.summary
+        return {
+            "api_version": self.api_version,
+            "analysis_type": self.analysis_type,
+            "generated_at": self.generated_at,
+            "project_path": self.project_path,
+            "summary": {
+                "total_files": s.total_files,
+                "total_pou": s.pou_count,
+                "total_gvl": s.gvl_count,
+                "total_dut": s.dut_count,
+                "total_lines": s.total_lines,
+                "total_issues": s.issues.total,
+                "critical_count": s.issues.critical,
+                "warning_count": s.issues.warning,
+                "info_count": s.issues.info,
+                "by_category": self.issues_by_category,
+            },
+            "files": self.files,
+            "issues_by_rule": self.issues_by_rule,
+            "issues": self.issues,
+            **({"profile": self.profile} if self.profile else {}),
+            **({"skipped_checks": self.skipped_checks} if self.skipped_checks else {}),
+            **({"discovery": self.discovery} if self.discovery else {}),
+        }
+
+    def critical_issues(self, limit: Optional[int] = None) -> List[IssueRecord]:
+        """Critical 이슈 (limit 개까지)"""
+        critical = [i for i in self.issues if i['severity'] == 'Critical']
+        return critical[:limit] if limit is not None else critical
+
+    def most_complex_files(self, limit: int = 20) -> List[FileRecord]:
+        """복잡도 높은 순 파일"""
+        return sorted(self.files, key=lambda f: f['complexity'], reverse=True)[:limit]
+
+
+@dataclass
+class CompareSummary:
+    """비교 분석 요약"""
+    total_changes: int
+    added_files: int
+    deleted_files: int
+    modified_files: int
+    renamed_files: int
+    variable_changes: int
+    issues: IssueCounts
+
+
+@dataclass
+class CompareResult:
+    """Source & Target 비교 분석 결과"""
+    source_path: str
+    target_path: str
+    generated_at: str
+    summary: CompareSummary
+    file_changes: List[FileChangeRecord]
+    variable_changes: List[VariableChangeRecord]
+    qa_issues: List[IssueRecord]
+    profile: Dict = field(default_factory=dict)  # 단계별 분석 시간
+    skipped_checks: List[Dict] = field(default_factory=list)  # 시간 예산/라인 길이로 건너뛴 검사 (1.2~)
+    api_version: str = API_VERSION
+    analysis_type: str = "compare"
+
+    @classmethod
+    def from_dict(cls, report: Dict) -> 'CompareResult':
+        """분석기 리포트 dict → 결과 객체"""
+        s = report['summary']
+        return cls(
+            source_path=report['source_folder'],
+            target_path=report['target_folder'],
+            generated_at=report['generated_at'],
+            summary=CompareSummary(
+                total_changes=s['total_files_changed'],
+                added_files=s['files_added'],
+                deleted_files=s['files_deleted'],
+                modified_files=s['files_modified'],
+                renamed_files=s.get('files_renamed', 0),
+                variable_changes=s['total_variable_changes'],
+                issues=IssueCounts(s['total_qa_issues'], s['critical_issues'], s['warning_issues'], s['info_issues']),
+            ),
+            file_changes=report['file_changes'],
+            variable_changes=report['variable_changes'],
+            qa_issues=report['qa_issues'],
+            profile=report.get('profile', {}),
+            skipped_checks=report.get('skipped_checks', []),
+            api_version=report.get('api_version', API_VERSION),
+        )
+
+    def to_dict(self) -> Dict:
+        """분석기 리포트와 동일한 레이아웃 + api_version"""
+        s = self.summary
+        return {
+            "api_version": self.api_version,
+            "analysis_type": self.analysis_type,
+            "generated_at": self.generated_at,
+            "source_folder": self.source_path,
+            "target_folder": self.target_path,
+            "summary": {
+                "total_files_changed": s.total_changes,
+                "files_added": s.added_files,
+                "files_deleted": s.deleted_files,
+                "files_modified": s.modified_files,
+                "files_renamed": s.renamed_files,
+                "total_variable_changes": s.variable_changes,
+                "total_qa_issues": s.issues.total,
+                "critical_issues": s.issues.critical,
+                "warning_issues": s.issues.warning,
+                "info_issues": s.issues.info,
+            },
+            "file_changes": self.file_changes,
+            "variable_changes": self.variable_changes,
+            "qa_issues": self.qa_issues,
+            **({"profile": self.profile} if self.profile else {}),
+            **({"skipped_checks": self.skipped_checks} if self.skipped_checks else {}),
+        }
+
+
+def load_result(report: Dict):
+    """저장된 리포트 dict → 결과 객체 (분석 종류 자동 판별)"""
+    if 'project_path' in report:
+        return SingleProjectResult.from_dict(report)
+    return CompareResult.from_dict(report)
+
+
+def analyze_project(project_path: str, profile_rules: bool = False,
+                    encodings: Optional[EncodingCache] = None,
+                    unit_cache: Optional[UnitCache] = None) -> SingleProjectResult:
+    """단일 프로젝트 분석 (profile_rules: 규칙별 시간/정규식 호출 수까지 측정, encodings: 감지 인코딩 캐시,
+    unit_cache: 단위별 규칙 결과 캐시)"""
+    analyzer = TwinCATSingleProjectAnalyzer(project_path, profile_rules, encodings=encodings, unit_cache=unit_cache)
+    return SingleProjectResult.from_dict(analyzer.analyze())
+
+
+def compare_projects(source_path: str, target_path: str,
+                     source_index: Optional[ProjectIndex] = None,
+                     target_index: Optional[ProjectIndex] = None) -> CompareResult:
+    """Source & Target 비교 분석 (인덱스를 넘기면 재사용)"""
+    analyzer = TwinCATQAAnalyzer(source_path, target_path, old_index=source_index, new_index=target_index)
+    return CompareResult.from_dict(analyzer.analyze())
+
+
+@dataclass
+class AnalysisSession:
+    """프로세스 내 분석 세션 - 프로젝트 인덱스와 결과를 캐시하여 반복 분석 시 변경 파일만 다시 읽음
+
+    캐시 키는 모두 resolve() 한 절대 경로 (끝의 경로 구분자, 상대 경로 표기 차이로 캐시가 나뉘지 않음).
+    잠금은 프로젝트별이라 서로 다른 프로젝트 분석은 동시에 진행되고, 같은 프로젝트 요청만 순서대로 처리합니다.
+    """
+    indexes: Dict[str, ProjectIndex] = field(default_factory=dict)
+    single_results: Dict[str, Tuple[str, SingleProjectResult]] = field(default_factory=dict)
+    compare_results: Dict[Tuple[str, str], Tuple[str, str, CompareResult]] = field(default_factory=dict)
+    encodings: EncodingCache = field(default_factory=EncodingCache)  # 인덱스와 단일 분석이 공유
+    unit_caches: Dict[str, UnitCache] = field(default_factory=dict)  # 프로젝트별 단위 결과 (바뀐 Method 만 재분석)
+    project_locks: Dict[str, threading.RLock] = field(default_factory=dict)
+    lock: threading.RLock = field(default_factory=threading.RLock)  # project_locks 목록 보호용
+
+    @staticmethod
+    def key(path: str) -> str:
+        """캐시/잠금 키 (절대 경로)"""
+        return str(Path(path).resolve())
+
+    def _project_lock(self, key: str) -> threading.RLock:
+        with self.lock:
+            lock = self.project_locks.get(key)
+            if lock is None:
+                lock = self.project_locks[key] = threading.RLock()
+            return lock
+
+    def index(self, path: str) -> ProjectIndex:
+        """경로의 최신 인덱스 (변경된 파일만 다시 인덱싱)"""
+        key = self.key(path)
+        with self._project_lock(key):
+            index = self.indexes.get(key)
+            if index is None:
+                index = self.indexes[key] = ProjectIndex(key, self.encodings)
+            return index.build()
+
+    def analyze_project(self, project_path: str, profile_rules: bool = False) -> SingleProjectResult:
+        """단일 프로젝트 분석 (내용이 그대로면 캐시된 결과 반환, 규칙 프로파일 요청 시 없는 결과는 재분석)"""
+        key = self.key(project_path)
+        with self._project_lock(key):
+            fingerprint = self.index(key).fingerprint()
+            cached = self.single_results.get(key)
+            if cached and cached[0] == fingerprint and (not profile_rules or cached[1].profile.get('rules')):
+                return cached[1]
+            unit_cache = self.unit_caches.setdefault(key, UnitCache())
+            result = analyze_project(key, profile_rules, self.encodings, unit_cache)
+            self.single_results[key] = (fingerprint, result)
+            return result
+
+    def compare_projects(self, source_path: str, target_path: str) -> CompareResult:
+        """Source & Target 비교 (두 인덱스 모두 그대로면 캐시된 결과 반환)"""
+        keys = (self.key(source_path), self.key(target_path))
+        with ExitStack() as stack:
+            # 두 프로젝트 잠금을 항상 같은 순서로 잡아 교차 비교 요청끼리 교착되지 않게 함
+            for key in sorted(set(keys)):
+                stack.enter_context(self._project_lock(key))
+            source_index = self.index(keys[0])
+            target_index = self.index(keys[1])
+            fingerprints = (source_index.fingerprint(), target_index.fingerprint())
+            cached = self.compare_results.get(keys)
+            if cached and cached[:2] == fingerprints:
+                return cached[2]
+            result = compare_projects(keys[0], keys[1], source_index, target_index)
+            self.compare_results[keys] = (*fingerprints, result)
+            return result
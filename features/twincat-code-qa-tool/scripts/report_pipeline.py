@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT QA 리포트 파이프라인
+분석 결과를 한 번만 읽고 여러 출력 형식(JSON, Markdown, 상세 HTML/Markdown, CSV, SARIF)을 워커 풀에서 동시에 생성
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+import analyze_real_project
+import analyze_single_project
+from generate_detailed_report import (SHARD_FILES_PER_PAGE, generate_detailed_markdown,
+                                      write_detailed_html_report, write_sharded_html_report)
+from report_store import load_report_file, store_path_for, write_report_store
+from sarif_export import write_report_sarif
+from source_context import CONTEXT_LINES
+
+
+@dataclass(frozen=True)
+class PipelineOptions:
+    """렌더러 공통 옵션"""
+    project_path: str = ""  # 상세 HTML 소스 컨텍스트 루트 (비우면 리포트의 project_path)
+    context_lines: int = CONTEXT_LINES
+    files_per_page: Optional[int] = None  # 지정 시 상세 HTML 을 분할 출력
+
+
+@dataclass(frozen=True)
+class Renderer:
+    """출력 형식 하나"""
+    name: str
+    file_name: str  # 출력 파일명 ({stem} 은 리포트 이름으로 치환)
+    kinds: FrozenSet[str]  # 지원 리포트 종류 (single, compare)
+    render: Callable[[Dict, Path, PipelineOptions], Path]
+
+
+# 파이프라인이 렌더링하는 리포트 종류
+PIPELINE_KINDS = ('single', 'compare')
+
+
+def report_kind(report: Dict) -> str:
+    """리포트 종류 (analysis_type 우선, 없으면 키 구성으로 판별) - 지원하지 않는 종류는 ValueError"""
+    kind = report.get('analysis_type')
+    if not kind:
+        if 'base_folder' in report:
+            kind = 'three_way'
+        elif 'variants' in report:
+            kind = 'batch'
+        elif 'project_path' in report and 'issues' in report:
+            kind = 'single'
+        elif 'source_folder' in report and 'qa_issues' in report:
+            kind = 'compare'
+        else:
+            kind = 'unknown'
+    if kind not in PIPELINE_KINDS:
+        raise ValueError(f"리포트 파이프라인이 지원하지 않는 리포트 종류: {kind} (지원: {', '.join(PIPELINE_KINDS)})")
+    return kind
+
+
+def report_issues(report: Dict) -> Iterable[Dict]:
+    """리포트의 QA 이슈 (단일: issues, 비교: qa_issues)"""
+    return report['issues'] if 'issues' in report else report['qa_issues']
+
+
+# === 렌더러 (워커에서 이름으로 찾으므로 모듈 수준 함수) ===
+
+def render_json(report: Dict, path: Path, options: PipelineOptions) -> Path:
+    """JSON 리포트 + 옆의 .tcqa (JSON 보다 나중에 기록해야 최신으로 인정됨)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    write_report_store(report, store_path_for(path))
+    return path
+
+
+def render_markdown(report: Dict, path: Path, options: PipelineOptions) -> Path:
+    """분석기 요약 Markdown"""
+    analyzer = analyze_single_project if report_kind(report) == 'single' else analyze_real_project
+    path.write_text(analyzer.generate_markdown_report(report), encoding='utf-8')
+    return path
+
+
+def render_detailed_html(report: Dict, path: Path, options: PipelineOptions) -> Path:
+    """상세 HTML (files_per_page 지정 시 path 폴더에 분할 출력)"""
+    project_path = options.project_path or report['project_path']
+    if options.files_per_page:
+        return write_sharded_html_report(report, project_path, path.with_suffix(''), options.files_per_page,
+                                         context_lines=options.context_lines)
+    return write_detailed_html_report(report, project_path, path, options.context_lines)
+
+
+def render_detailed_markdown(report: Dict, path: Path, options: PipelineOptions) -> Path:
+    """상세 Markdown (Critical 이슈 상세)"""
+    path.write_text(generate_detailed_markdown(report), encoding='utf-8')
+    return path
+
+
+# CSV 컬럼 (이슈 레코드 키)
+CSV_COLUMNS = ('severity', 'rule_id', 'category', 'file', 'line', 'message', 'code', 'suggestion')
+
+
+def render_csv(report: Dict, path: Path, options: PipelineOptions) -> Path:
+    """이슈 CSV (Excel 에서 한글이 깨지지 않도록 BOM 포함, 행 단위 기록)"""
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        writer.writerows([issue.get(column, '') for column in CSV_COLUMNS] for issue in report_issues(report))
+    return path
+
+
+def render_sarif(report: Dict, path: Path, options: PipelineOptions) -> Path:
+    """SARIF 2.1.0 (코드 리뷰 도구 연동)"""
+    return write_report_sarif(report, path)
+
+
+RENDERERS: Dict[str, Renderer] = {renderer.name: renderer for renderer in (
+    Renderer('json', '{stem}.json', frozenset({'single', 'compare'}), render_json),
+    Renderer('markdown', '{stem}.md', frozenset({'single', 'compare'}), render_markdown),
+    Renderer('html', 'qa_detailed_report.html', frozenset({'single'}), render_detailed_html),
+    Renderer('detailed-md', 'qa_detailed_report.md', frozenset({'single'}), render_detailed_markdown),
+    Renderer('csv', '{stem}_issues.csv', frozenset({'single', 'compare'}), render_csv),
+    Renderer('sarif', '{stem}.sarif', frozenset({'single', 'compare'}), render_sarif),
+)}
+
+
+def supported_formats(report: Dict, formats: Sequence[str]) -> List[str]:
+    """리포트 종류가 지원하는 형식만 (알 수 없는 형식은 오류)"""
+    unknown = [name for name in formats if name not in RENDERERS]
+    if unknown:
+        raise ValueError(f"알 수 없는 출력 형식: {', '.join(unknown)} (지원: {', '.join(RENDERERS)})")
+    kind = report_kind(report)
+    return [name for name in formats if kind in RENDERERS[name].kinds]
+
+
+# 워커 프로세스별 리포트/옵션 (initializer 로 한 번만 전달)
+_REPORT: Optional[Dict] = None
+_OPTIONS: Optional[PipelineOptions] = None
+
+
+def _init_worker(report: Dict, options: PipelineOptions):
+    global _REPORT, _OPTIONS
+    _REPORT = report
+    _OPTIONS = options
+
+
+def _render(name: str, path: str) -> tuple:
+    """워커: 렌더러 하나 실행 → (형식, 출력 경로, 소요 시간)"""
+    started = time.perf_counter()
+    output = RENDERERS[name].render(_REPORT, Path(path), _OPTIONS)
+    return name, str(output), time.perf_counter() - started
+
+
+def run_pipeline(report: Dict, output_dir, formats: Sequence[str], stem: Optional[str] = None,
+                 options: PipelineOptions = PipelineOptions(), max_workers: Optional[int] = None) -> Dict[str, Path]:
+    """리포트 하나 → 여러 형식 동시 출력 (전체 시간 ≈ 가장 느린 렌더러)
+
+    형식이 하나뿐이거나 사용할 수 있는 CPU 가 하나면 현재 프로세스에서 차례로 실행합니다.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = stem or ('single_project_qa_report' if report_kind(report) == 'single' else 'qa_report')
+    jobs = [
+        (name, str(output_dir / RENDERERS[name].file_name.format(stem=stem)))
+        for name in supported_formats(report, formats)
+    ]
+
+    outputs: Dict[str, Path] = {}
+    workers = min(max_workers or len(jobs), os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        _init_worker(report, options)
+        results = (_render(name, path) for name, path in jobs)
+        for name, path, elapsed in results:
+            outputs[name] = Path(path)
+            print(f"  - {name}: {path} ({elapsed:.2f}s)")
+        return outputs
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(report, options)) as pool:
+        futures = [pool.submit(_render, name, path) for name, path in jobs]
+        for future in futures:
+            name, path, elapsed = future.result()
+            outputs[name] = Path(path)
+            print(f"  - {name}: {path} ({elapsed:.2f}s)")
+    return outputs
+
+
+# 저장된 리포트를 입력으로 받을 때의 기본 형식 (JSON 은 입력 자체이므로 제외)
+DEFAULT_FORMATS = ('markdown', 'html', 'detailed-md', 'csv', 'sarif')
+
+
+if __name__ == "__main__":
+    # 사용법: python report_pipeline.py <report.json|.tcqa> [--formats=a,b,...] [--sharded[=N]] [--context=N]
+    options = {}
+    formats = DEFAULT_FORMATS
+    args = []
+    for arg in sys.argv[1:]:
+        if arg.startswith('--formats='):
+            formats = tuple(name for name in arg.split('=', 1)[1].split(',') if name)
+        elif arg.startswith('--sharded'):
+            options['files_per_page'] = int(arg.split('=', 1)[1]) if '=' in arg else SHARD_FILES_PER_PAGE
+        elif arg.startswith('--context='):
+            options['context_lines'] = int(arg.split('=', 1)[1])
+        else:
+            args.append(arg)
+
+    if not args:
+        print("사용법: python report_pipeline.py <report.json|.tcqa> [--formats=markdown,html,detailed-md,csv,sarif] "
+              "[--sharded[=N]] [--context=N]")
+        sys.exit(1)
+
+    input_path = Path(args[0])
+    print(f"[리포트 파이프라인] {input_path}")
+    started = time.perf_counter()
+    report = load_report_file(input_path)
+    print(f"  로드: {time.perf_counter() - started:.2f}s")
+
+    try:
+        run_pipeline(report, input_path.parent, formats, stem=input_path.stem, options=PipelineOptions(**options))
+    except ValueError as e:
+        print(f"오류: {e}")
+        sys.exit(1)
+    print(f"완료 ({time.perf_counter() - started:.2f}s)")
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT QA 리포트 저장 형식 (.tcqa)
+JSON 리포트와 같은 내용을 테이블별 사전 인코딩 컬럼으로 저장하여 필요한 테이블/컬럼/행만 읽음
+
+파일 레이아웃 (정수는 모두 little-endian):
+    MAGIC                 8바이트 b'TCQARPT1'
+    컬럼 블록 (컬럼마다)
+        사전 블록         zlib 압축 UTF-8 JSON 배열 (컬럼의 고유 값, 첫 등장 순)
+        ID 블록           행 수 x uint32 사전 인덱스 (키가 없는 행은 0xFFFFFFFF), 압축하지 않음 → 행 단위 임의 접근
+    푸터                  UTF-8 JSON
+                          {"format": 1, "keys": [최상위 키 순서], "meta": {테이블이 아닌 값},
+                           "tables": {테이블: {"rows": n, "columns": {컬럼: [사전 오프셋, 사전 길이, ID 오프셋]}}}}
+    푸터 길이             uint32
+    MAGIC
+
+테이블은 최상위 값 중 dict 목록(issues, files, file_changes, variable_changes, qa_issues 등)이고,
+나머지(summary, generated_at, ...)는 푸터의 meta 에 그대로 들어갑니다.
+"""
+
+import codecs
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+STORE_SUFFIX = '.tcqa'
+STORE_FORMAT_VERSION = 1
+
+MAGIC = b'TCQARPT1'
+MISSING = 0xFFFFFFFF
+
+_TRAILER = struct.Struct('<I8s')
+_ID = struct.Struct('<I')
+
+# 테이블 → 읽을 컬럼 (None 이면 전체 컬럼)
+TableProjection = Dict[str, Optional[Sequence[str]]]
+
+# 테이블 → 행 반복자를 받아 저장할 값을 돌려주는 함수 (행 목록을 메모리에 만들지 않음)
+TableConsumers = Dict[str, Callable[[Iterator[Dict[str, Any]]], Any]]
+
+# JSON 스트리밍 읽기 단위
+READ_CHUNK_SIZE = 1 << 20
+
+_JSON_DELIMITERS = frozenset(' \t\r\n,:]}')
+
+
+def _is_table(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(row, dict) for row in value)
+
+
+def _dump(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _id_array(data=b'') -> array:
+    ids = array('I')
+    ids.frombytes(data)
+    if sys.byteorder == 'big':
+        ids.byteswap()
+    return ids
+
+
+def _encode_column(rows: List[Dict], column: str):
+    """컬럼 → (고유 값 목록, ID 배열)"""
+    values: List[Any] = []
+    lookup: Dict[Any, int] = {}
+    ids = array('I')
+    for row in rows:
+        if column not in row:
+            ids.append(MISSING)
+            continue
+        value = row[column]
+        # 1 / 1.0 / True 를 구분하고, 목록/딕셔너리 값은 JSON 텍스트로 비교
+        key = (type(value), _dump(value) if isinstance(value, (list, dict)) else value)
+        index = lookup.get(key)
+        if index is None:
+            index = lookup[key] = len(values)
+            values.append(value)
+        ids.append(index)
+    if sys.byteorder == 'big':
+        ids.byteswap()
+    return values, ids
+
+
+def write_report_store(report: Dict, path) -> Path:
+    """리포트 dict → .tcqa 파일"""
+    path = Path(path)
+    tables = {key: value for key, value in report.items() if _is_table(value)}
+    footer: Dict[str, Any] = {
+        "format": STORE_FORMAT_VERSION,
+        "keys": list(report),
+        "meta": {key: value for key, value in report.items() if key not in tables},
+        "tables": {},
+    }
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        for name, rows in tables.items():
+            columns = {}
+            for column in dict.fromkeys(key for row in rows for key in row):
+                values, ids = _encode_column(rows, column)
+                dictionary = zlib.compress(_dump(values))
+                dict_offset = f.tell()
+                f.write(dictionary)
+                columns[column] = [dict_offset, len(dictionary), f.tell()]
+                f.write(ids.tobytes())
+            footer["tables"][name] = {"rows": len(rows), "columns": columns}
+
+        data = _dump(footer)
+        f.write(data)
+        f.write(_TRAILER.pack(len(data), MAGIC))
+    return path
+
+
+class ReportStore:
+    """.tcqa 리더 - 테이블/컬럼 단위 선택 읽기와 행 단위 임의 접근"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._map = None
+        size = self.path.stat().st_size
+        if size < len(MAGIC) + _TRAILER.size:
+            self.close()
+            raise ValueError(f"TwinCAT QA 리포트 저장 파일이 아닙니다: {self.path}")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"TwinCAT QA 리포트 저장 파일이 아닙니다: {self.path}")
+        footer_len, magic = _TRAILER.unpack_from(self._map, size - _TRAILER.size)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"손상된 리포트 저장 파일입니다: {self.path}")
+        footer_start = size - _TRAILER.size - footer_len
+        footer = json.loads(self._map[footer_start:footer_start + footer_len].decode('utf-8'))
+        if footer["format"] > STORE_FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"지원하지 않는 리포트 저장 형식 버전: {footer['format']}")
+
+        self.meta: Dict[str, Any] = footer["meta"]
+        self._keys: List[str] = footer["keys"]
+        self._tables: Dict[str, Dict] = footer["tables"]
+        self._dictionaries: Dict[tuple, List[Any]] = {}
+
+    def close(self):
+        if self._map is not None and not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'ReportStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def tables(self) -> List[str]:
+        return list(self._tables)
+
+    def row_count(self, table: str) -> int:
+        return self._tables[table]["rows"]
+
+    def columns(self, table: str) -> List[str]:
+        return list(self._tables[table]["columns"])
+
+    def _dictionary(self, table: str, column: str) -> List[Any]:
+        """컬럼 사전 (최초 접근 시 압축 해제)"""
+        key = (table, column)
+        if key not in self._dictionaries:
+            offset, length, _ = self._tables[table]["columns"][column]
+            self._dictionaries[key] = json.loads(zlib.decompress(self._map[offset:offset + length]))
+        return self._dictionaries[key]
+
+    def _ids(self, table: str, column: str, start: int, stop: int) -> array:
+        ids_offset = self._tables[table]["columns"][column][2]
+        return _id_array(self._map[ids_offset + start * 4:ids_offset + stop * 4])
+
+    def _selected(self, table: str, columns: Optional[Sequence[str]]) -> List[str]:
+        available = self._tables[table]["columns"]
+        return list(available) if columns is None else [c for c in columns if c in available]
+
+    def column(self, table: str, column: str) -> List[Any]:
+        """컬럼 전체 값 (키가 없는 행은 None)"""
+        dictionary = self._dictionary(table, column)
+        return [dictionary[i] if i != MISSING else None
+                for i in self._ids(table, column, 0, self.row_count(table))]
+
+    def row(self, table: str, index: int, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """행 하나 (컬럼마다 ID 4바이트만 읽음)"""
+        if not 0 <= index < self.row_count(table):
+            raise IndexError(f"{table}[{index}]")
+        record = {}
+        for column in self._selected(table, columns):
+            ids_offset = self._tables[table]["columns"][column][2]
+            value_id = _ID.unpack_from(self._map, ids_offset + index * 4)[0]
+            if value_id != MISSING:
+                record[column] = self._dictionary(table, column)[value_id]
+        return record
+
+    def rows(self, table: str, columns: Optional[Sequence[str]] = None,
+             start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """행 범위 [start, stop) 를 선택 컬럼만으로 생성"""
+        total = self.row_count(table)
+        stop = total if stop is None else min(stop, total)
+        start = min(max(start, 0), stop)
+        selected = [
+            (column, self._dictionary(table, column), self._ids(table, column, start, stop))
+            for column in self._selected(table, columns)
+        ]
+        for n in range(stop - start):
+            yield {column: dictionary[ids[n]] for column, dictionary, ids in selected if ids[n] != MISSING}
+
+    def to_dict(self, tables: Optional[TableProjection] = None,
+                consumers: Optional[TableConsumers] = None) -> Dict[str, Any]:
+        """리포트 dict 복원 (tables 지정 시 해당 테이블/컬럼만, 나머지 테이블은 생략)
+
+        consumers 에 있는 테이블은 행 목록 대신 consumer(행 반복자) 결과를 저장합니다.
+        """
+        consumers = consumers or {}
+        report = {}
+        for key in self._keys:
+            if key in self.meta:
+                report[key] = self.meta[key]
+            elif tables is None or key in tables:
+                rows = self.rows(key, tables[key] if tables else None)
+                report[key] = consumers[key](rows) if key in consumers else list(rows)
+        return report
+
+
+class JsonReportStream:
+    """JSON 리포트 스트리밍 리더 - 최상위 객체를 키 단위로 읽고, 지정한 배열은 요소 단위로 생성
+
+    값 하나는 json 의 C 디코더(raw_decode)로 읽고, 버퍼에는 아직 소비하지 않은 부분만 남깁니다.
+    """
+
+    def __init__(self, path, chunk_size: int = READ_CHUNK_SIZE):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder('utf-8-sig')()
+        self._file = None
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _read(self, size: int) -> bool:
+        """size 바이트 더 읽어 버퍼에 붙임 (소비한 앞부분은 버림), 이미 파일 끝이면 False"""
+        if self._eof:
+            return False
+        data = self._file.read(size)
+        self._eof = not data
+        self._buffer = self._buffer[self._pos:] + self._utf8.decode(data, final=self._eof)
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """공백을 건너뛴 다음 글자 (파일 끝이면 '')"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._read(self.chunk_size):
+                return self._buffer[self._pos:self._pos + 1]
+
+    def _expect(self, chars: str) -> str:
+        char = self._peek()
+        if not char or char not in chars:
+            raise ValueError(f"JSON 형식 오류 ({self.path}): '{chars}' 필요, '{char}' 발견")
+        self._pos += 1
+        return char
+
+    def _value(self) -> Any:
+        """값 하나 디코딩 (버퍼 끝에서 잘린 값이면 더 읽고 다시 시도)"""
+        self._peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # 숫자는 버퍼 끝에서 잘려도 ('12' / '1.' 등) 디코딩되므로 뒤에 구분자가 올 때만 확정
+                if (end < len(self._buffer) and self._buffer[end] in _JSON_DELIMITERS) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._read(size)
+            size = max(size, len(self._buffer))  # 큰 값은 읽기 단위를 늘려 재시도 횟수 제한
+
+    def _array(self) -> Iterator[Any]:
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._expect(',]') == ']':
+                return
+
+    def items(self, stream_keys: Sequence[str] = ()) -> Iterator[Tuple[str, Any]]:
+        """(키, 값) 생성 - stream_keys 의 배열 값은 요소 반복자 (다음 키 전에 소비되지 않은 요소는 건너뜀)"""
+        with open(self.path, 'rb') as self._file:
+            self._expect('{')
+            if self._peek() == '}':
+                return
+            while True:
+                key = self._value()
+                self._expect(':')
+                if key in stream_keys and self._peek() == '[':
+                    elements = self._array()
+                    yield key, elements
+                    for _ in elements:
+                        pass
+                else:
+                    yield key, self._value()
+                if self._expect(',}') == '}':
+                    return
+
+
+def store_path_for(json_path) -> Path:
+    """JSON 리포트 옆의 .tcqa 경로"""
+    return Path(json_path).with_suffix(STORE_SUFFIX)
+
+
+def _fresh_store(path: Path) -> Optional[Path]:
+    """읽을 .tcqa (직접 받았거나 JSON 보다 나중에 기록된 옆 파일) - 없으면 None"""
+    store = path if path.suffix == STORE_SUFFIX else store_path_for(path)
+    if store.exists() and (store == path or not path.exists()
+                           or store.stat().st_mtime_ns >= path.stat().st_mtime_ns):
+        return store
+    return None
+
+
+def load_report_meta(path, keys: Sequence[str], stop_keys: Sequence[str] = ()) -> Dict[str, Any]:
+    """리포트 메타 값 중 keys 만 읽음 (JSON 은 stop_keys 테이블에 닿으면 멈춤 - 분석기는 메타를 테이블보다 먼저 기록)"""
+    path = Path(path)
+    store = _fresh_store(path)
+    if store is not None:
+        with ReportStore(store) as reader:
+            return {key: reader.meta[key] for key in keys if key in reader.meta}
+
+    meta = {}
+    items = JsonReportStream(path).items(stream_keys=tuple(stop_keys))
+    for key, value in items:
+        if key in stop_keys:
+            break
+        if key in keys:
+            meta[key] = value
+    items.close()
+    return meta
+
+
+def load_report_file(path, tables: Optional[TableProjection] = None,
+                     consumers: Optional[TableConsumers] = None) -> Dict[str, Any]:
+    """리포트 로드 - .tcqa 를 직접 받거나 JSON 옆에 최신 .tcqa 가 있으면 필요한 컬럼만 읽음
+
+    consumers 에 있는 테이블은 행 반복자로 넘겨 (JSON 도 요소 단위 스트리밍) 그 결과를 저장합니다.
+    """
+    store = _fresh_store(Path(path))
+    if store is not None:
+        with ReportStore(store) as reader:
+            return reader.to_dict(tables, consumers)
+
+    if not consumers:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    report = {}
+    for key, value in JsonReportStream(path).items(stream_keys=tuple(consumers)):
+        report[key] = consumers[key](value) if key in consumers else value
+    return report
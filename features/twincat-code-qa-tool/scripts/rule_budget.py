@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+QA 규칙 실행 예산
+비정상적으로 긴 라인(생성 코드의 대형 배열 초기화 등)이 정규식 규칙을 붙잡아 전체 분석이 멈추지 않도록
+라인 규칙에 넘기는 라인 길이를 제한하고, 파일마다 규칙별 누적 시간이 예산을 넘으면 그 파일의 나머지 검사를 건너뜀
+(시간은 긴 라인에서만 잼 - 보통 라인의 규칙 호출은 측정 없이 바로 실행)
+"""
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Set
+
+# 파일 하나에서 규칙 하나가 쓸 수 있는 누적 시간 (초)
+RULE_TIME_BUDGET = 2.0
+
+# 라인 규칙에 넘기는 최대 라인 길이 (넘는 부분은 잘라서 검사)
+MAX_RULE_LINE_LENGTH = 2000
+
+# 이 길이 이상인 라인만 규칙 호출 시간을 재어 예산에 누적 (짧은 라인은 호출 한 번이 예산에 비해 무시할 만큼 짧음)
+TIMED_LINE_LENGTH = 256
+
+# 건너뜀 사유
+SKIP_TIME_BUDGET = 'time_budget'
+SKIP_LINE_LENGTH = 'line_length'
+
+
+@dataclass
+class SkippedCheck:
+    """건너뛰거나 일부만 검사한 (파일, 규칙) 기록"""
+    file: str
+    rule_id: str  # 라인 길이 제한은 모든 라인 규칙에 해당하므로 빈 문자열
+    reason: str  # time_budget, line_length
+    line: int = 0  # line_length: 잘린 라인 번호
+    elapsed_s: float = 0.0  # time_budget: 예산 초과 시점 누적 시간
+    length: int = 0  # line_length: 원래 라인 길이
+
+
+class RuleBudget:
+    """파일 단위 규칙 시간 예산 + 라인 길이 제한
+
+    시간은 규칙 호출이 끝난 뒤 누적하므로 실행 중인 정규식을 중단하지는 않습니다.
+    대신 라인 길이 제한으로 호출 한 번의 시간을 묶어 두고, 예산을 넘긴 규칙은 같은 파일에서 다시 호출하지 않습니다.
+    규칙마다 라인별로 시간을 재면 그 자체가 부담이므로 timed_line_length 이상인 라인만 재고 누적합니다
+    (uses_budget() 으로 라인마다 판단).
+    """
+
+    def __init__(self, seconds: float = RULE_TIME_BUDGET, max_line_length: int = MAX_RULE_LINE_LENGTH,
+                 timed_line_length: int = TIMED_LINE_LENGTH):
+        self.seconds = seconds
+        self.max_line_length = max_line_length
+        self.timed_line_length = timed_line_length
+        self.skipped: List[SkippedCheck] = []
+        self.file = ""
+        self.spent: Dict[str, float] = {}
+        self.exhausted: Set[str] = set()  # 현재 파일에서 예산을 넘긴 규칙
+
+    def start_file(self, path: str):
+        """새 파일 검사 시작 (규칙별 누적 시간 초기화)"""
+        self.file = path
+        self.spent.clear()
+        self.exhausted.clear()
+
+    def uses_budget(self, line: str) -> bool:
+        """이 라인의 규칙 호출을 재어 예산에 누적할지 (긴 라인, 또는 현재 파일에서 예산을 넘긴 규칙이 있을 때)"""
+        return len(line) >= self.timed_line_length or bool(self.exhausted)
+
+    def charge(self, rule_id: str, elapsed: float):
+        """규칙 호출 시간 누적 (예산을 넘으면 현재 파일에서 해당 규칙 중단)"""
+        spent = self.spent[rule_id] = self.spent.get(rule_id, 0.0) + elapsed
+        if spent > self.seconds:
+            self.exhausted.add(rule_id)
+            self.skipped.append(SkippedCheck(self.file, rule_id, SKIP_TIME_BUDGET, elapsed_s=round(spent, 6)))
+
+    def cap_line(self, line: str, line_num: int) -> str:
+        """라인 규칙에 넘길 라인 (길이 제한을 넘으면 잘라내고 기록)"""
+        if len(line) <= self.max_line_length:
+            return line
+        self.skipped.append(SkippedCheck(self.file, "", SKIP_LINE_LENGTH, line=line_num, length=len(line)))
+        return line[:self.max_line_length]
+
+    def to_records(self) -> List[Dict]:
+        """리포트 skipped_checks 테이블"""
+        return [asdict(check) for check in self.skipped]
+
+
+def skipped_checks_markdown(records: List[Dict], limit: int = 50) -> List[str]:
+    """리포트 skipped_checks → Markdown 섹션 라인 (없으면 빈 목록)"""
+    if not records:
+        return []
+    md = ["## ⏭️ 건너뛴 검사", "", "| 파일 | 규칙 | 사유 | 상세 |", "|------|------|------|------|"]
+    for check in records[:limit]:
+        if check['reason'] == SKIP_TIME_BUDGET:
+            detail = f"누적 {check['elapsed_s']:.2f}s 로 예산 초과 - 이후 라인 미검사"
+        else:
+            detail = f"{check['line']}행 {check['length']:,}자 - 앞 {MAX_RULE_LINE_LENGTH:,}자까지만 검사"
+        md.append(f"| {Path(check['file']).name} | {check['rule_id'] or '라인 규칙 전체'} | {check['reason']} | {detail} |")
+    if len(records) > limit:
+        md.append(f"| ... | | | *외 {len(records) - limit}개* |")
+    md.append("")
+    return md
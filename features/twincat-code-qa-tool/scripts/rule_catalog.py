@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT QA 규칙 카탈로그
+리포트(HTML/Markdown/SARIF)가 공통으로 사용하는 규칙 이름, 분류, 설명, 수정 예시
+"""
+
+from dataclasses import dataclass
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class RuleInfo:
+    """QA 규칙 메타데이터"""
+    rule_id: str
+    name: str
+    category: str        # Safety, Performance, Maintainability, Style, Other
+    severity: str        # 기본 심각도 (Critical, Warning, Info)
+    summary: str         # 한 줄 설명 (규칙 표)
+    detail: str = ""     # 상세 설명 (Critical 상세)
+    risk: str = ""
+    fix: str = ""
+    example_bad: str = ""
+    example_good: str = ""
+
+    @property
+    def description(self) -> str:
+        return self.detail or self.summary
+
+
+RULE_CATALOG: Dict[str, RuleInfo] = {rule.rule_id: rule for rule in (
+    RuleInfo(
+        'QA001', '초기화되지 않은 변수', 'Safety', 'Critical', '변수 선언 시 초기값 미지정',
+        detail='REAL, LREAL, 포인터 타입 변수가 초기값 없이 선언되었습니다.',
+        risk='예측 불가능한 값으로 인한 오동작, 시스템 불안정',
+        fix='변수 선언 시 초기값을 명시하세요.',
+        example_bad='fTemperature : REAL;',
+        example_good='fTemperature : REAL := 0.0;',
+    ),
+    RuleInfo(
+        'QA002', '위험한 타입 변환', 'Safety', 'Critical', '큰 타입에서 작은 타입으로 변환',
+        detail='큰 데이터 타입에서 작은 타입으로 변환 시 데이터 손실 가능성',
+        risk='오버플로우, 데이터 손실, 정밀도 저하',
+        fix='LIMIT 함수로 범위 검증 후 변환하세요.',
+        example_bad='nValue := REAL_TO_INT(fInput);',
+        example_good='nValue := REAL_TO_INT(LIMIT(-32768.0, fInput, 32767.0));',
+    ),
+    RuleInfo('QA003', '대용량 배열', 'Performance', 'Warning', '1000개 이상 요소의 배열'),
+    RuleInfo('QA004', '포인터 변수', 'Safety', 'Warning', '포인터 사용 - NULL 체크 필요'),
+    RuleInfo(
+        'QA005', 'REAL 직접 비교', 'Safety', 'Critical', '실수형 등호 비교',
+        detail='실수형 변수를 등호(=)로 직접 비교하고 있습니다.',
+        risk='부동소수점 정밀도 문제로 비교 실패',
+        fix='허용 오차(epsilon)를 사용한 비교로 변경하세요.',
+        example_bad='IF fValue = fTarget THEN',
+        example_good='IF ABS(fValue - fTarget) < 0.0001 THEN',
+    ),
+    RuleInfo(
+        'QA006', '0으로 나누기 가능성', 'Safety', 'Critical', '분모 검증 없는 나눗셈',
+        detail='변수로 나누기를 수행하며, 0 검사가 없습니다.',
+        risk='런타임 오류로 시스템 정지',
+        fix='나누기 전 분모가 0인지 확인하세요.',
+        example_bad='fResult := fNumerator / fDenominator;',
+        example_good='IF fDenominator <> 0.0 THEN\n    fResult := fNumerator / fDenominator;\nEND_IF',
+    ),
+    RuleInfo('QA007', '매직 넘버', 'Maintainability', 'Warning', '의미 불명확한 숫자 상수'),
+    RuleInfo('QA008', '과도한 중첩', 'Maintainability', 'Warning', '4단계 이상 중첩'),
+    RuleInfo('QA009', '긴 코드', 'Maintainability', 'Warning', '500줄 초과'),
+    RuleInfo('QA010', '하드코딩된 시간', 'Maintainability', 'Warning', 'T#nnn 형태의 고정 시간값'),
+    RuleInfo('QA011', '빈 예외 처리', 'Safety', 'Warning', '빈 ELSE 블록'),
+    RuleInfo('QA012', 'TODO/FIXME', 'Maintainability', 'Info', '미완료 작업 표시'),
+    RuleInfo('QA013', '주석 처리된 코드', 'Maintainability', 'Info', '주석으로 비활성화된 코드'),
+    RuleInfo('QA014', '높은 복잡도', 'Maintainability', 'Warning', '순환 복잡도 15 초과'),
+    RuleInfo('QA015', '주석 부족', 'Maintainability', 'Info', '코드 대비 10% 미만'),
+    RuleInfo('QA016', '명명 규칙', 'Style', 'Info', '헝가리안 표기법 미준수'),
+)}
+
+
+def rule_info(rule_id: str) -> RuleInfo:
+    """규칙 메타데이터 (카탈로그에 없는 규칙은 ID만 채운 기본값)"""
+    info = RULE_CATALOG.get(rule_id)
+    if info is None:
+        info = RuleInfo(rule_id, rule_id, 'Other', 'Info', '')
+    return info
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT QA SARIF 2.1.0 내보내기
+이슈를 하나씩 받아 결과(result)를 바로 기록하고, 실제로 나온 규칙만 카탈로그에서 한 번씩 기술
+(results 를 먼저 쓰고 tool/규칙 목록은 끝에 기록하므로 메모리는 규칙 수와 지문 수에만 비례)
+이슈의 섹션 기준 라인은 프로젝트 소스의 CDATA 인덱스로 실제 파일 라인으로 바꿔 기록
+"""
+
+import hashlib
+import json
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path, PurePosixPath, PureWindowsPath
+from typing import Dict, Iterable, Optional, TextIO
+from urllib.parse import quote
+
+from report_store import load_report_file, load_report_meta
+from rule_catalog import RuleInfo, rule_info
+from source_context import SourceContext
+
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+TOOL_NAME = "TwinCAT QA"
+
+# 아티팩트 경로 기준 ID (originalUriBaseIds 에 프로젝트 루트 URI 기록)
+ROOT_URI_BASE_ID = "PROJECTROOT"
+
+# QA 심각도 → SARIF level
+SARIF_LEVELS = {'Critical': 'error', 'Warning': 'warning', 'Info': 'note'}
+
+# 스트리밍 기록 시 파일 버퍼 크기
+WRITE_BUFFER_SIZE = 1 << 20
+
+# SARIF 변환에 필요한 이슈 컬럼 (.tcqa 에서는 이 컬럼만 읽음)
+SARIF_ISSUE_COLUMNS = ('severity', 'rule_id', 'file', 'line', 'message', 'code', 'suggestion', 'unit')
+SARIF_TABLES = {'issues': SARIF_ISSUE_COLUMNS, 'qa_issues': SARIF_ISSUE_COLUMNS}
+
+# 아티팩트 루트를 정하는 리포트 메타 키 (단일: 프로젝트, 비교: Target)
+ROOT_KEYS = ('project_path', 'target_folder')
+
+_DRIVE_PATH = re.compile(r'^[A-Za-z]:[\\/]')
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+@lru_cache(maxsize=1 << 16)
+def artifact_uri(file_path: str) -> str:
+    """리포트 파일 경로 → 루트 기준 상대 URI (Windows 구분자 정규화, 공백/한글 퍼센트 인코딩)"""
+    return quote(file_path.replace('\\', '/'), safe='/')
+
+
+def root_uri(root: str) -> Optional[str]:
+    """프로젝트 루트 경로 → file URI (SARIF 기준 URI 는 '/' 로 끝나야 함), 상대 경로면 None"""
+    if not root:
+        return None
+    if _DRIVE_PATH.match(root):
+        uri = PureWindowsPath(root).as_uri()
+    elif root.startswith('/'):
+        uri = PurePosixPath(root).as_uri()
+    else:
+        return None
+    return uri if uri.endswith('/') else uri + '/'
+
+
+def rule_descriptor(info: RuleInfo) -> Dict:
+    """카탈로그 규칙 → SARIF reportingDescriptor"""
+    descriptor = {
+        "id": info.rule_id,
+        "name": info.name,
+        "shortDescription": {"text": info.summary or info.name},
+        "fullDescription": {"text": info.description or info.name},
+        "defaultConfiguration": {"level": SARIF_LEVELS.get(info.severity, 'note')},
+        "properties": {"category": info.category, "tags": [info.category]},
+    }
+    help_lines = [line for line in (
+        info.risk and f"위험: {info.risk}",
+        info.fix and f"수정: {info.fix}",
+        info.example_bad and f"잘못된 예:\n{info.example_bad}",
+        info.example_good and f"올바른 예:\n{info.example_good}",
+    ) if line]
+    if help_lines:
+        descriptor["help"] = {"text": '\n\n'.join(help_lines)}
+    return descriptor
+
+
+class SarifWriter:
+    """SARIF 로그 스트리밍 기록기
+
+    write_results() 로 이슈를 요소 단위로 기록하고 (여러 번 호출 가능), finish() 에서
+    결과가 참조한 규칙 기술자와 실행 정보를 기록합니다.
+    root 를 주면 이슈 라인(Declaration/ST 섹션 기준)을 소스 파일 라인으로 바꿔 region 에 기록하고,
+    바꿀 수 없으면 region 없이 properties.sectionLine 에만 남깁니다.
+    """
+
+    def __init__(self, f: TextIO, root: str = ''):
+        self.f = f
+        self.rule_index: Dict[str, int] = {}
+        self.fingerprints: Dict[str, int] = {}  # 지문 해시별 나온 횟수 (같은 코드 라인 구분 번호)
+        self.result_count = 0
+        self.context = SourceContext(root) if root and Path(root).is_dir() else None
+        self.f.write(f'{{"$schema":"{SARIF_SCHEMA}","version":"{SARIF_VERSION}","runs":[{{"results":[')
+
+    def _rule_index(self, rule_id: str) -> int:
+        index = self.rule_index.get(rule_id)
+        if index is None:
+            index = self.rule_index[rule_id] = len(self.rule_index)
+        return index
+
+    def result(self, issue: Dict) -> Dict:
+        """이슈 → SARIF result"""
+        rule_id = issue['rule_id']
+        code = issue.get('code', '')
+        line = issue.get('line', 0)
+        properties = {}
+        location = {"artifactLocation": {"uri": artifact_uri(issue['file']), "uriBaseId": ROOT_URI_BASE_ID}}
+        if line > 0:
+            section, file_line = self.context.file_line(issue['file'], line, code) if self.context else ('', 0)
+            if file_line:
+                location["region"] = {"startLine": file_line, "snippet": {"text": code}}
+                properties["section"] = section
+            properties["sectionLine"] = line
+        entry = {"physicalLocation": location}
+        # 라인이 밀려도 같은 이슈로 인식되도록 규칙/파일/코드 기준 지문 (단위 안 이슈는 단위 이름 포함)
+        key = f"{rule_id}\0{issue['file']}\0{code}"
+        if issue.get('unit'):
+            # Method/Action/Property/Transition 이름 (FB_Motor.M_Start)
+            entry["logicalLocations"] = [{"fullyQualifiedName": issue['unit'], "kind": "member"}]
+            key = f"{rule_id}\0{issue['file']}\0{issue['unit']}\0{code}"
+        # 같은 파일/단위의 같은 코드 라인은 나온 순서 번호로 구분 (primaryLocationLineHash 의 ':N' 과 같은 방식)
+        digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+        occurrence = self.fingerprints[digest] = self.fingerprints.get(digest, 0) + 1
+        result = {
+            "ruleId": rule_id,
+            "ruleIndex": self._rule_index(rule_id),
+            "level": SARIF_LEVELS.get(issue['severity'], 'note'),
+            "message": {"text": issue['message']},
+            "locations": [entry],
+            "partialFingerprints": {
+                "twincatQa/v1": f"{digest}:{occurrence}",
+            },
+        }
+        if issue.get('suggestion'):
+            properties["suggestion"] = issue['suggestion']
+        if properties:
+            result["properties"] = properties
+        return result
+
+    def write_results(self, issues: Iterable[Dict]) -> int:
+        """이슈 반복자를 소비하며 결과 기록 → 기록한 건수 (load_report_file 의 consumer 로 사용 가능)"""
+        count = 0
+        write = self.f.write
+        for issue in issues:
+            write(('\n' if self.result_count + count == 0 else ',\n') + _dumps(self.result(issue)))
+            count += 1
+        self.result_count += count
+        return count
+
+    def finish(self, root: str = '', properties: Optional[Dict] = None, version: str = ''):
+        """규칙 기술자(결과에서 참조한 순서) + 도구/루트/실행 정보 기록"""
+        driver = {"name": TOOL_NAME, "rules": [rule_descriptor(rule_info(rule_id)) for rule_id in self.rule_index]}
+        if version:
+            driver["version"] = version
+        run = {"tool": {"driver": driver}, "columnKind": "unicodeCodePoints"}
+        uri = root_uri(root)
+        if uri:
+            run["originalUriBaseIds"] = {ROOT_URI_BASE_ID: {"uri": uri}}
+        if properties:
+            run["properties"] = properties
+        # 이미 연 run 객체에 나머지 속성을 이어 붙임
+        self.f.write('\n],' + _dumps(run)[1:] + ']}\n')
+        if self.context:
+            self.context.close()
+
+
+def _run_properties(report: Dict) -> Dict:
+    """리포트 메타 → run.properties"""
+    keys = ('analysis_type', 'generated_at', 'project_path', 'source_folder', 'target_folder')
+    return {key: report[key] for key in keys if key in report}
+
+
+def _report_root(report: Dict) -> str:
+    """아티팩트 기준 루트 (단일: 프로젝트, 비교: Target)"""
+    return report.get(ROOT_KEYS[0]) or report.get(ROOT_KEYS[1], '')
+
+
+def write_report_sarif(report: Dict, path) -> Path:
+    """메모리의 분석 리포트 dict → SARIF 파일"""
+    path = Path(path)
+    issues = report['issues'] if 'issues' in report else report['qa_issues']
+    root = _report_root(report)
+    with open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        writer = SarifWriter(f, root)
+        writer.write_results(issues)
+        writer.finish(root, _run_properties(report), report.get('api_version', ''))
+    return path
+
+
+def convert_report_file(report_path, sarif_path=None) -> Path:
+    """저장된 리포트(.json/.tcqa) → SARIF 파일
+
+    이슈 배열은 요소 단위로 읽어 바로 기록하므로 이슈 목록 전체를 메모리에 올리지 않습니다.
+    라인 변환에 쓸 루트는 이슈보다 먼저 메타만 읽어 정합니다.
+    """
+    report_path = Path(report_path)
+    sarif_path = Path(sarif_path) if sarif_path else report_path.with_suffix('.sarif')
+    root = _report_root(load_report_meta(report_path, ROOT_KEYS, stop_keys=tuple(SARIF_TABLES)))
+    with open(sarif_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        writer = SarifWriter(f, root)
+        report = load_report_file(report_path, SARIF_TABLES,
+                                  consumers={'issues': writer.write_results, 'qa_issues': writer.write_results})
+        writer.finish(_report_root(report), _run_properties(report), report.get('api_version', ''))
+    return sarif_path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python sarif_export.py <report.json|report.tcqa> [output.sarif]")
+        sys.exit(1)
+
+    output = convert_report_file(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"SARIF 리포트: {output}")
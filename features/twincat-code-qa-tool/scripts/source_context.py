@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+이슈 전후 소스 컨텍스트
+파일당 한 번 mmap + 라인 오프셋 인덱스를 만들고, 이후 컨텍스트 조회는 필요한 라인만 잘라 디코딩
+(인코딩은 BOM/XML 선언으로 정하고, UTF-8 로 읽히지 않는 라인이 나오면 CP949 로 전환)
+"""
+
+import mmap
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from source_encoding import FALLBACK_ENCODING, UTF8, sniff_encoding
+
+# 이슈 라인 전후로 보여줄 라인 수
+CONTEXT_LINES = 3
+
+# 동시에 열어 두는 파일 수 (이슈가 파일 순으로 정렬되어 있어 작아도 충분)
+MAX_OPEN_FILES = 64
+
+# 이슈 라인 번호의 기준 섹션 (분석기는 섹션별 CDATA 를 '\n' 으로 이어 라인 번호를 매김)
+CONTEXT_SECTIONS = ('ST', 'Declaration')
+
+# (섹션 기준 라인 번호, 라인 텍스트)
+ContextLine = Tuple[int, str]
+
+
+class SourceFile:
+    """mmap 된 소스 파일 + 라인 시작 오프셋 + 섹션별 CDATA 구간"""
+
+    __slots__ = ('path', '_file', '_map', '_size', 'encoding', 'line_starts', 'sections', 'section_lines')
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._size = self._file.seek(0, 2)
+        # 빈 파일은 mmap 할 수 없으므로 빈 bytes 로 대체
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else b''
+        self.encoding = sniff_encoding(self._map[:256])[0] or UTF8
+        self.line_starts = self._index_lines()
+        self.sections: Dict[str, List[Tuple[int, int, int]]] = {}
+        self.section_lines: Dict[str, int] = {}  # 섹션 전체 라인 수
+        for section in CONTEXT_SECTIONS:
+            self.sections[section], self.section_lines[section] = self._index_section(section)
+
+    def _index_lines(self) -> array:
+        """라인 시작 바이트 오프셋 (한 번의 스캔)"""
+        starts = array('q', [0])
+        find = self._map.find
+        pos = find(b'\n')
+        while pos >= 0:
+            starts.append(pos + 1)
+            pos = find(b'\n', pos + 1)
+        return starts
+
+    def _line_of(self, offset: int) -> int:
+        """바이트 오프셋 → 0부터 시작하는 파일 라인 인덱스"""
+        return bisect_right(self.line_starts, offset) - 1
+
+    def _index_section(self, section: str) -> Tuple[List[Tuple[int, int, int]], int]:
+        """섹션 CDATA 블록별 (내용 시작, 내용 끝, 섹션 내 시작 라인) + 섹션 전체 라인 수"""
+        open_tag = f'<{section}><![CDATA['.encode()
+        close_tag = f']]></{section}>'.encode()
+        blocks = []
+        first_line = 0
+        pos = self._map.find(open_tag)
+        while pos >= 0:
+            start = pos + len(open_tag)
+            end = self._map.find(close_tag, start)
+            if end < 0:
+                break
+            blocks.append((start, end, first_line))
+            # 블록은 '\n' 으로 이어지므로 블록 내 개행 수 + 1 라인을 차지
+            first_line += self._line_of(end) - self._line_of(start) + 1
+            pos = self._map.find(open_tag, end + len(close_tag))
+        return blocks, first_line
+
+    def _locate(self, section: str, line: int) -> Optional[Tuple[int, int, int]]:
+        """섹션 기준 라인 번호(1부터) → (0부터 시작하는 파일 라인 인덱스, CDATA 내용 시작, 끝)"""
+        if not 0 < line <= self.section_lines.get(section, 0):
+            return None
+        blocks = self.sections[section]
+        index = 0
+        while index + 1 < len(blocks) and blocks[index + 1][2] < line:
+            index += 1
+        start, end, first_line = blocks[index]
+        return self._line_of(start) + (line - 1 - first_line), start, end
+
+    def file_line(self, section: str, line: int) -> int:
+        """섹션 기준 라인 번호(1부터) → 파일 라인 번호(1부터, 섹션 범위 밖이면 0)"""
+        located = self._locate(section, line)
+        return located[0] + 1 if located else 0
+
+    def section_line(self, section: str, line: int) -> Optional[str]:
+        """섹션 기준 라인 번호(1부터) → 해당 라인 텍스트 (CDATA 경계 밖은 잘라냄)"""
+        located = self._locate(section, line)
+        if located is None:
+            return None
+        file_line, start, end = located
+        line_start = max(self.line_starts[file_line], start)
+        line_end = end
+        if file_line + 1 < len(self.line_starts):
+            line_end = min(self.line_starts[file_line + 1] - 1, end)
+        data = self._map[line_start:line_end]
+        try:
+            text = data.decode(self.encoding)
+        except UnicodeDecodeError:
+            # 선언 없는(또는 잘못 선언된) CP949 파일 - 이후 라인도 CP949 로 읽음
+            self.encoding = FALLBACK_ENCODING if self.encoding == UTF8 else self.encoding
+            text = data.decode(self.encoding, errors='ignore')
+        return text.rstrip('\r')
+
+    def window(self, section: str, line: int, radius: int = CONTEXT_LINES) -> List[ContextLine]:
+        """섹션 라인 전후 radius 라인"""
+        last = min(line + radius, self.section_lines.get(section, 0))
+        return [
+            (number, text)
+            for number in range(max(1, line - radius), last + 1)
+            if (text := self.section_line(section, number)) is not None
+        ]
+
+    def close(self):
+        if self._size:
+            self._map.close()
+        self._file.close()
+
+
+class SourceContext:
+    """프로젝트 루트 기준 이슈 컨텍스트 조회 (최근 사용 파일만 열어 둠)"""
+
+    def __init__(self, root: str, radius: int = CONTEXT_LINES, max_open: int = MAX_OPEN_FILES):
+        self.root = Path(root)
+        self.radius = radius
+        self.max_open = max_open
+        self._files: 'OrderedDict[str, Optional[SourceFile]]' = OrderedDict()
+
+    def source(self, rel_path: str) -> Optional[SourceFile]:
+        """상대 경로 → 인덱싱된 소스 (없거나 읽을 수 없으면 None)"""
+        if rel_path in self._files:
+            self._files.move_to_end(rel_path)
+            return self._files[rel_path]
+        try:
+            # Windows 에서 생성된 리포트 경로('\\')도 허용
+            source = SourceFile(self.root / rel_path.replace('\\', '/'))
+        except (OSError, ValueError):
+            source = None
+        self._files[rel_path] = source
+        if len(self._files) > self.max_open:
+            _, evicted = self._files.popitem(last=False)
+            if evicted is not None:
+                evicted.close()
+        return source
+
+    def _match(self, rel_path: str, line: int, code: str) -> Tuple[Optional[SourceFile], str]:
+        """이슈 (파일, 라인, 코드) → (소스, 이슈 섹션) - 맞는 섹션이 없으면 섹션은 빈 문자열
+
+        이슈에는 섹션 정보가 없으므로 라인 텍스트가 코드 조각과 일치하는 섹션을 사용합니다.
+        일치하는 섹션이 없으면 코드 조각으로 시작하는 섹션을 사용합니다 (라인 길이 제한으로 잘린 조각,
+        예전 리포트의 잘린 QA013 조각).
+        """
+        if line < 1 or not code:
+            return None, ''
+        source = self.source(rel_path)
+        if source is None:
+            return None, ''
+        texts = {section: source.section_line(section, line) for section in CONTEXT_SECTIONS}
+        for matches in (str.__eq__, str.startswith):
+            for section, text in texts.items():
+                if text is not None and matches(text.strip(), code):
+                    return source, section
+        return source, ''
+
+    def window(self, rel_path: str, line: int, code: str = '') -> List[ContextLine]:
+        """이슈 (파일, 라인, 코드) → 전후 컨텍스트 (파일 단위 이슈(line 0)나 맞는 섹션이 없으면 빈 목록)"""
+        source, section = self._match(rel_path, line, code)
+        return source.window(section, line, self.radius) if section else []
+
+    def file_line(self, rel_path: str, line: int, code: str = '') -> Tuple[str, int]:
+        """이슈 (파일, 섹션 라인, 코드) → (섹션, 파일 라인 번호) - 맞는 섹션이 없으면 ('', 0)"""
+        source, section = self._match(rel_path, line, code)
+        return (section, source.file_line(section, line)) if section else ('', 0)
+
+    def close(self):
+        for source in self._files.values():
+            if source is not None:
+                source.close()
+        self._files.clear()
+
+    def __enter__(self) -> 'SourceContext':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT 소스 인코딩 감지
+BOM / XML 선언을 먼저 보고, 없으면 UTF-8 → CP949(EUC-KR 상위 집합) 순으로 엄격 디코딩
+(예전 프로젝트의 한글 주석이 errors='ignore' 로 사라져 주석 기반 규칙이 오동작하던 문제)
+파일은 bytes 로 한 번만 읽고 BOM 은 memoryview 로 건너뛰어 복사 없이 디코딩
+"""
+
+import codecs
+import re
+from typing import Dict, Optional, Tuple
+
+UTF8 = 'utf-8'
+
+# 선언/BOM 이 없고 UTF-8 도 아닐 때 시도하는 인코딩 (한국어 Windows 기본, EUC-KR 포함)
+FALLBACK_ENCODING = 'cp949'
+
+_BOMS = (
+    (codecs.BOM_UTF8, UTF8),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+# XML 선언은 파일 앞부분에만 있으므로 이 길이까지만 확인
+_PROLOG_BYTES = 256
+_PROLOG = re.compile(rb'^\s*<\?xml[^>]*?\bencoding\s*=\s*["\']([A-Za-z0-9._:-]+)["\']')
+
+# EUC-KR 계열 선언은 CP949 로 읽음 (확장 완성형 한글까지 포함)
+_ALIASES = {'euc_kr': FALLBACK_ENCODING, 'ks_c_5601': FALLBACK_ENCODING, 'ks_c_5601_1987': FALLBACK_ENCODING}
+
+
+def _normalize(name: str) -> Optional[str]:
+    """인코딩 이름 → Python 코덱 이름 (모르는 이름은 None)"""
+    try:
+        codec = codecs.lookup(name).name.replace('-', '_')
+    except LookupError:
+        return None
+    if codec in _ALIASES:
+        return _ALIASES[codec]
+    return UTF8 if codec == 'utf_8' else codec.replace('_', '-')
+
+
+def sniff_encoding(head: bytes) -> Tuple[Optional[str], int]:
+    """파일 앞부분 → (BOM/선언 인코딩, BOM 길이) - 단서가 없으면 (None, 0)"""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+    match = _PROLOG.match(head[:_PROLOG_BYTES])
+    if match:
+        return _normalize(match.group(1).decode('ascii')), 0
+    return None, 0
+
+
+def decode_source(data: bytes, known: Optional[str] = None) -> Tuple[str, str]:
+    """bytes → (텍스트, 인코딩)
+
+    known: 같은 파일(크기/수정 시각 동일)에서 이전에 감지한 인코딩 - 맞으면 감지 생략.
+    BOM 이 있으면 BOM 인코딩만 사용. 그 외에는 선언 인코딩, UTF-8, CP949 순으로 엄격 디코딩하고
+    모두 실패하면 기존 동작(UTF-8, 깨진 바이트 무시)으로 읽습니다.
+    """
+    declared, bom = sniff_encoding(data[:_PROLOG_BYTES])
+    view = memoryview(data)[bom:] if bom else data
+    if bom:
+        candidates = (declared,)
+    else:
+        # 선언은 UTF-8 인데 실제로는 CP949 인 파일이 많아 선언 뒤에도 UTF-8 → CP949 순서 유지
+        candidates = tuple(dict.fromkeys(c for c in (known, declared, UTF8, FALLBACK_ENCODING) if c))
+    for encoding in candidates:
+        try:
+            return str(view, encoding), encoding
+        except (UnicodeDecodeError, LookupError):
+            continue
+    return str(view, candidates[0] if bom else UTF8, 'ignore'), candidates[0] if bom else UTF8
+
+
+class EncodingCache:
+    """경로별 감지 인코딩 (분석 세션 동안 유지, 크기/수정 시각이 같을 때만 재사용)"""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[int, int, str]] = {}
+
+    def decode(self, path: str, size: int, mtime_ns: int, data: bytes) -> Tuple[str, str]:
+        """파일 bytes → (텍스트, 인코딩), 감지 결과 기록"""
+        cached = self._entries.get(path)
+        known = cached[2] if cached and cached[0] == size and cached[1] == mtime_ns else None
+        text, encoding = decode_source(data, known)
+        self._entries[path] = (size, mtime_ns, encoding)
+        return text, encoding
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT ST 선언부 파서
+VAR 블록 단위 변수 테이블 생성 (스코프, 타입, 초기값, 주소, 속성, 위치)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 변수 블록 시작 키워드 → 스코프
+VAR_BLOCK_KEYWORDS = {
+    'VAR', 'VAR_INPUT', 'VAR_OUTPUT', 'VAR_IN_OUT', 'VAR_GLOBAL',
+    'VAR_TEMP', 'VAR_STAT', 'VAR_INST', 'VAR_EXTERNAL', 'VAR_CONFIG',
+}
+
+# 구조체/공용체 멤버 블록
+MEMBER_BLOCK_KEYWORDS = {'STRUCT': 'END_STRUCT', 'UNION': 'END_UNION'}
+
+# 블록 헤더 한정자 (VAR CONSTANT, VAR_GLOBAL RETAIN 등)
+BLOCK_QUALIFIERS = {'CONSTANT', 'RETAIN', 'PERSISTENT', 'NON_RETAIN'}
+
+# 외부에서 값이 주어지는 스코프 (초기값 검사 제외 대상)
+EXTERNAL_SCOPES = {'VAR_INPUT', 'VAR_IN_OUT', 'VAR_EXTERNAL'}
+
+
+@dataclass(slots=True)
+class VariableDecl:
+    """변수 선언 정보"""
+    name: str
+    var_type: str
+    scope: str  # VAR, VAR_INPUT, VAR_OUTPUT, VAR_GLOBAL, STRUCT ...
+    initial_value: str = ""
+    address: str = ""  # AT %I* 등
+    qualifiers: Tuple[str, ...] = ()  # CONSTANT, RETAIN, PERSISTENT
+    attributes: Tuple[str, ...] = ()  # {attribute '...'} 프라그마
+    line: int = 0  # 선언부 기준 라인 번호 (1부터)
+
+    @property
+    def base_type(self) -> str:
+        """타입의 첫 키워드 (ARRAY, POINTER, REAL 등)"""
+        end = 0
+        while end < len(self.var_type) and (self.var_type[end].isalnum() or self.var_type[end] == '_'):
+            end += 1
+        return self.var_type[:end].upper()
+
+
+# 변수 테이블: 대문자 변수명 → 선언 (ST 식별자는 대소문자 구분 없음)
+VariableTable = Dict[str, VariableDecl]
+
+
+@dataclass(slots=True)
+class _Token:
+    kind: str  # word, punct, string, pragma, address
+    text: str
+    start: int
+    end: int
+    line: int
+
+
+def _tokenize(text: str) -> Iterator[_Token]:
+    """선언부 토큰화 (주석 제외, 단일 패스)"""
+    i = 0
+    n = len(text)
+    line = 1
+    while i < n:
+        c = text[i]
+
+        if c == '\n':
+            line += 1
+            i += 1
+            continue
+        if c.isspace():
+            i += 1
+            continue
+
+        # // 라인 주석
+        if c == '/' and text.startswith('//', i):
+            end = text.find('\n', i)
+            i = n if end < 0 else end
+            continue
+
+        # (* 블록 주석 *) - 중첩 허용
+        if c == '(' and text.startswith('(*', i):
+            depth = 0
+            while i < n:
+                if text.startswith('(*', i):
+                    depth += 1
+                    i += 2
+                elif text.startswith('*)', i):
+                    depth -= 1
+                    i += 2
+                    if depth == 0:
+                        break
+                else:
+                    if text[i] == '\n':
+                        line += 1
+                    i += 1
+            continue
+
+        start = i
+        start_line = line
+
+        # {프라그마}
+        if c == '{':
+            end = text.find('}', i)
+            end = n if end < 0 else end + 1
+            line += text.count('\n', i, end)
+            i = end
+            yield _Token('pragma', text[start + 1:end - 1].strip(), start, end, start_line)
+            continue
+
+        # 문자열 리터럴 ('...', "...", $ 이스케이프)
+        if c in '\'"':
+            i += 1
+            while i < n and text[i] != c:
+                if text[i] == '$':
+                    i += 1
+                elif text[i] == '\n':
+                    line += 1
+                i += 1
+            i = min(i + 1, n)
+            yield _Token('string', text[start:i], start, i, start_line)
+            continue
+
+        # %I*, %IX0.0, %QW10 등 직접 주소
+        if c == '%':
+            i += 1
+            while i < n and (text[i].isalnum() or text[i] in '.*_'):
+                i += 1
+            yield _Token('address', text[start:i], start, i, start_line)
+            continue
+
+        # 식별자, 숫자, 타입 리터럴 (E_State.IDLE, 16#FF, T#1s500ms, 1.5E3)
+        if c.isalnum() or c == '_':
+            i += 1
+            while i < n:
+                ch = text[i]
+                if ch.isalnum() or ch in '_#':
+                    i += 1
+                elif ch == '.' and i + 1 < n and text[i + 1] != '.' and text[i - 1] != '.':
+                    i += 1
+                else:
+                    break
+            yield _Token('word', text[start:i], start, i, start_line)
+            continue
+
+        # 연산자/구두점 (:=, .., 단일 문자)
+        two = text[i:i + 2]
+        if two in (':=', '..', '=>'):
+            i += 2
+        else:
+            i += 1
+        yield _Token('punct', text[start:i], start, i, start_line)
+
+
+def _join_tokens(tokens: List[_Token]) -> str:
+    """토큰 재조합 (원본에서 떨어져 있던 토큰 사이는 공백 하나)"""
+    parts = []
+    prev_end = -1
+    for tok in tokens:
+        if parts and tok.start != prev_end:
+            parts.append(' ')
+        parts.append(tok.text)
+        prev_end = tok.end
+    return ''.join(parts)
+
+
+def _parse_statement(tokens: List[_Token], scope: str, qualifiers: Tuple[str, ...],
+                     attributes: Tuple[str, ...]) -> List[VariableDecl]:
+    """'a, b AT %I* : TYPE := init' 구문 → 변수 선언 목록"""
+    colon = next((k for k, t in enumerate(tokens) if t.kind == 'punct' and t.text == ':'), -1)
+    if colon <= 0:
+        return []
+
+    names: List[_Token] = []
+    address = ""
+    head = tokens[:colon]
+    k = 0
+    while k < len(head):
+        tok = head[k]
+        if tok.kind == 'word' and tok.text.upper() == 'AT':
+            address = _join_tokens(head[k + 1:])
+            break
+        if tok.kind == 'word':
+            names.append(tok)
+        k += 1
+    if not names:
+        return []
+
+    # 최상위 ':=' 에서 타입/초기값 분리
+    tail = tokens[colon + 1:]
+    depth = 0
+    assign = len(tail)
+    for k, tok in enumerate(tail):
+        if tok.kind != 'punct':
+            continue
+        if tok.text in '([':
+            depth += 1
+        elif tok.text in ')]':
+            depth -= 1
+        elif tok.text == ':=' and depth == 0:
+            assign = k
+            break
+
+    var_type = _join_tokens(tail[:assign])
+    initial_value = _join_tokens(tail[assign + 1:])
+
+    return [
+        VariableDecl(
+            name=tok.text,
+            var_type=var_type,
+            scope=scope,
+            initial_value=initial_value,
+            address=address,
+            qualifiers=qualifiers,
+            attributes=attributes,
+            line=tok.line,
+        )
+        for tok in names
+    ]
+
+
+def parse_declarations(declaration: str) -> List[VariableDecl]:
+    """선언부 전체를 한 번에 파싱하여 선언 순서대로 반환"""
+    result: List[VariableDecl] = []
+
+    scope: Optional[str] = None
+    block_end = ''
+    qualifiers: Tuple[str, ...] = ()
+    in_header = False
+    pending_attrs: List[str] = []
+    statement: List[_Token] = []
+    depth = 0
+
+    for tok in _tokenize(declaration):
+        upper = tok.text.upper() if tok.kind == 'word' else ''
+
+        # 블록 밖: 블록 시작 키워드만 확인
+        if scope is None:
+            if upper in VAR_BLOCK_KEYWORDS:
+                scope, block_end = upper, 'END_VAR'
+            elif upper in MEMBER_BLOCK_KEYWORDS:
+                scope, block_end = 'STRUCT', MEMBER_BLOCK_KEYWORDS[upper]
+            else:
+                continue
+            qualifiers = ()
+            in_header = True
+            pending_attrs = []
+            statement = []
+            depth = 0
+            continue
+
+        # 블록 헤더 한정자
+        if in_header and upper in BLOCK_QUALIFIERS:
+            qualifiers += (upper,)
+            continue
+        in_header = False
+
+        if upper == block_end and not statement:
+            scope = None
+            continue
+
+        if tok.kind == 'pragma':
+            if not statement:
+                pending_attrs.append(tok.text)
+            continue
+
+        if tok.kind == 'punct':
+            if tok.text in '([':
+                depth += 1
+            elif tok.text in ')]':
+                depth -= 1
+            elif tok.text == ';' and depth <= 0:
+                result.extend(_parse_statement(statement, scope, qualifiers, tuple(pending_attrs)))
+                statement = []
+                pending_attrs = []
+                depth = 0
+                continue
+
+        statement.append(tok)
+
+    return result
+
+
+def build_variable_table(declaration: str) -> VariableTable:
+    """선언부 → 변수 테이블 (대문자 변수명 키)"""
+    return {decl.name.upper(): decl for decl in parse_declarations(declaration)}
+
+
+def diff_variable_tables(old: VariableTable,
+                         new: VariableTable) -> Iterator[Tuple[str, Optional[VariableDecl], Optional[VariableDecl]]]:
+    """정렬된 키 기준 병합으로 변경된 변수만 반환 (old 또는 new 가 None 이면 추가/삭제)"""
+    old_keys = sorted(old)
+    new_keys = sorted(new)
+    i = j = 0
+    while i < len(old_keys) or j < len(new_keys):
+        if j >= len(new_keys) or (i < len(old_keys) and old_keys[i] < new_keys[j]):
+            yield old_keys[i], old[old_keys[i]], None
+            i += 1
+        elif i >= len(old_keys) or new_keys[j] < old_keys[i]:
+            yield new_keys[j], None, new[new_keys[j]]
+            j += 1
+        else:
+            key = old_keys[i]
+            old_decl, new_decl = old[key], new[key]
+            if (old_decl.var_type, old_decl.initial_value, old_decl.scope, old_decl.address) != \
+                    (new_decl.var_type, new_decl.initial_value, new_decl.scope, new_decl.address):
+                yield key, old_decl, new_decl
+            i += 1
+            j += 1
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IEC 61131-3 ST 구문 강조
+정규식 없이 한 번의 문자 스캔으로 토큰을 나누고, 코드 조각별 HTML 결과를 캐시
+"""
+
+import html
+from functools import lru_cache
+from typing import Iterator, Optional, Tuple
+
+from st_declaration import VAR_BLOCK_KEYWORDS
+
+# 강조 결과 캐시 크기 (같은 라인이 수백 파일에 반복되는 리포트 대비)
+HIGHLIGHT_CACHE_SIZE = 1 << 16
+
+# 제어문/선언 키워드
+ST_KEYWORDS = frozenset({
+    'IF', 'THEN', 'ELSIF', 'ELSE', 'END_IF', 'CASE', 'OF', 'END_CASE',
+    'FOR', 'TO', 'BY', 'DO', 'END_FOR', 'WHILE', 'END_WHILE', 'REPEAT', 'UNTIL', 'END_REPEAT',
+    'EXIT', 'CONTINUE', 'RETURN', 'JMP',
+    'AND', 'OR', 'XOR', 'NOT', 'MOD', 'AND_THEN', 'OR_ELSE',
+    'END_VAR', 'CONSTANT', 'RETAIN', 'PERSISTENT', 'NON_RETAIN', 'AT',
+    'PROGRAM', 'END_PROGRAM', 'FUNCTION', 'END_FUNCTION', 'FUNCTION_BLOCK', 'END_FUNCTION_BLOCK',
+    'METHOD', 'END_METHOD', 'PROPERTY', 'END_PROPERTY', 'ACTION', 'END_ACTION',
+    'INTERFACE', 'END_INTERFACE', 'TYPE', 'END_TYPE', 'STRUCT', 'END_STRUCT', 'UNION', 'END_UNION',
+    'EXTENDS', 'IMPLEMENTS', 'ABSTRACT', 'FINAL', 'PUBLIC', 'PRIVATE', 'PROTECTED', 'INTERNAL',
+    'THIS', 'SUPER', 'ARRAY', 'POINTER', 'REFERENCE', 'REF', 'ADR', 'SIZEOF',
+}) | VAR_BLOCK_KEYWORDS
+
+# 기본 데이터 타입
+ST_TYPES = frozenset({
+    'BOOL', 'BIT', 'BYTE', 'WORD', 'DWORD', 'LWORD',
+    'SINT', 'USINT', 'INT', 'UINT', 'DINT', 'UDINT', 'LINT', 'ULINT',
+    'REAL', 'LREAL', 'STRING', 'WSTRING', 'TIME', 'LTIME',
+    'DATE', 'TIME_OF_DAY', 'TOD', 'DATE_AND_TIME', 'DT',
+    'ANY', 'ANY_NUM', 'ANY_INT', 'ANY_REAL', 'ANY_BIT',
+})
+
+# 값 리터럴 키워드
+ST_LITERALS = frozenset({'TRUE', 'FALSE', 'NULL'})
+
+# 토큰 종류 → CSS 클래스 (None 이면 감싸지 않음)
+TOKEN_CLASSES = {
+    'keyword': 'st-kw',
+    'type': 'st-type',
+    'number': 'st-num',
+    'string': 'st-str',
+    'comment': 'st-cmt',
+    'pragma': 'st-pragma',
+    'address': 'st-addr',
+}
+
+_WORD_EXTRA = '_'
+_NUMBER_EXTRA = '_#.'
+_TYPED_LITERAL_EXTRA = '_#.:-'  # T#1s500ms, D#2024-01-01, TOD#12:00:00
+
+
+def _scan_word(code: str, i: int, extra: str) -> int:
+    """영숫자 + extra 문자가 이어지는 끝 위치"""
+    n = len(code)
+    while i < n and (code[i].isalnum() or code[i] in extra):
+        i += 1
+    return i
+
+
+def tokenize_st(code: str) -> Iterator[Tuple[Optional[str], str]]:
+    """ST 코드 → (종류, 원문) 토큰 (공백/연산자/식별자는 종류 None, 원문을 모두 이으면 입력과 같음)"""
+    i = 0
+    n = len(code)
+    while i < n:
+        c = code[i]
+        start = i
+
+        # // 라인 주석
+        if c == '/' and code.startswith('//', i):
+            end = code.find('\n', i)
+            i = n if end < 0 else end
+            yield 'comment', code[start:i]
+            continue
+
+        # (* 블록 주석 *) - 중첩 허용, 잘린 조각은 끝까지 주석
+        if c == '(' and code.startswith('(*', i):
+            depth = 0
+            while i < n:
+                if code.startswith('(*', i):
+                    depth += 1
+                    i += 2
+                elif code.startswith('*)', i):
+                    depth -= 1
+                    i += 2
+                    if depth == 0:
+                        break
+                else:
+                    i += 1
+            yield 'comment', code[start:i]
+            continue
+
+        # {프라그마}
+        if c == '{':
+            end = code.find('}', i)
+            i = n if end < 0 else end + 1
+            yield 'pragma', code[start:i]
+            continue
+
+        # 문자열 리터럴 ('...', "...", $ 이스케이프)
+        if c == '\'' or c == '"':
+            i += 1
+            while i < n and code[i] != c:
+                i += 2 if code[i] == '$' else 1
+            i = min(i + 1, n)
+            yield 'string', code[start:i]
+            continue
+
+        # 숫자 (16#FF, 2#1010_0000, 1.5E-3)
+        if c.isdigit():
+            i = _scan_word(code, i, _NUMBER_EXTRA)
+            while i < n - 1 and code[i] in '+-' and code[i - 1] in 'eE' and code[i + 1].isdigit():
+                i = _scan_word(code, i + 1, _NUMBER_EXTRA)
+            yield 'number', code[start:i]
+            continue
+
+        # 식별자/키워드, 형식 리터럴 (T#5s, INT#10)
+        if c.isalpha() or c == '_':
+            i = _scan_word(code, i, _WORD_EXTRA)
+            if i < n and code[i] == '#':
+                i = _scan_word(code, i, _TYPED_LITERAL_EXTRA)
+                yield 'number', code[start:i]
+                continue
+            word = code[start:i].upper()
+            if word in ST_KEYWORDS:
+                yield 'keyword', code[start:i]
+            elif word in ST_TYPES:
+                yield 'type', code[start:i]
+            elif word in ST_LITERALS:
+                yield 'number', code[start:i]
+            else:
+                yield None, code[start:i]
+            continue
+
+        # 직접 주소 (%IX0.0, %MW10, %I*)
+        if c == '%':
+            i = _scan_word(code, i + 1, '.*')
+            yield 'address', code[start:i]
+            continue
+
+        # 공백/연산자/구두점은 다음 특수 문자까지 한 덩어리
+        i += 1
+        while i < n and not (code[i].isalnum() or code[i] in '_/({\'"%'):
+            i += 1
+        yield None, code[start:i]
+
+
+@lru_cache(maxsize=HIGHLIGHT_CACHE_SIZE)
+def highlight_st(code: str) -> str:
+    """ST 코드 → 이스케이프 + <span class="st-*"> 강조 HTML (코드 조각별 캐시)"""
+    parts = []
+    plain = []  # 강조 없는 연속 토큰은 모아서 한 번에 이스케이프
+    for kind, text in tokenize_st(code):
+        css_class = TOKEN_CLASSES.get(kind)
+        if css_class is None:
+            plain.append(text)
+            continue
+        if plain:
+            parts.append(html.escape(''.join(plain)))
+            plain.clear()
+        parts.append(f'<span class="{css_class}">{html.escape(text)}</span>')
+    if plain:
+        parts.append(html.escape(''.join(plain)))
+    return ''.join(parts)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TwinCAT 코드 유사도 분석
+MinHash/LSH 기반 이름 변경(rename) 및 이동(move) 감지
+"""
+
+import hashlib
+import random
+import re
+from collections import defaultdict
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Set, Tuple
+
+# MinHash 파라미터 (16밴드 x 4행 → 유사도 약 0.5 이상에서 후보 검출)
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+SHINGLE_SIZE = 3
+
+# 이름 변경으로 판단하는 최소 Jaccard 유사도
+RENAME_THRESHOLD = 0.7
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(0x7C3)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(NUM_PERM)]
+
+_COMMENT_PATTERN = re.compile(r'//[^\n]*|\(\*.*?\*\)', re.DOTALL)
+_TOKEN_PATTERN = re.compile(r"\w+|'[^']*'|:=|<>|<=|>=|[^\s\w]")
+
+
+def normalize_tokens(code: str) -> List[str]:
+    """주석/공백 제거 후 대문자 토큰 목록 (ST는 대소문자 구분 없음)"""
+    return _TOKEN_PATTERN.findall(_COMMENT_PATTERN.sub(' ', code).upper())
+
+
+def shingles(tokens: List[str], size: int = SHINGLE_SIZE) -> FrozenSet[int]:
+    """토큰 n-gram 해시 집합"""
+    if len(tokens) < size:
+        grams: Iterable[Tuple[str, ...]] = [tuple(tokens)] if tokens else []
+    else:
+        grams = (tuple(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+    return frozenset(
+        int.from_bytes(hashlib.blake2b('\x1f'.join(g).encode('utf-8'), digest_size=8).digest(), 'little')
+        for g in grams
+    )
+
+
+def minhash(shingle_set: FrozenSet[int]) -> Tuple[int, ...]:
+    """MinHash 시그니처"""
+    if not shingle_set:
+        return tuple([_MERSENNE_PRIME] * NUM_PERM)
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in shingle_set) for a, b in _PERMUTATIONS)
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    """Jaccard 유사도"""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class LSHIndex:
+    """MinHash 밴드 버킷 인덱스 (후보 쌍만 비교하여 O(n^2) 회피)"""
+
+    def __init__(self):
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], List[Hashable]] = defaultdict(list)
+
+    def add(self, key: Hashable, signature: Tuple[int, ...]):
+        for band in range(LSH_BANDS):
+            start = band * LSH_ROWS
+            self.buckets[(band, signature[start:start + LSH_ROWS])].append(key)
+
+    def candidates(self, signature: Tuple[int, ...]) -> Set[Hashable]:
+        result: Set[Hashable] = set()
+        for band in range(LSH_BANDS):
+            start = band * LSH_ROWS
+            result.update(self.buckets.get((band, signature[start:start + LSH_ROWS]), ()))
+        return result
+
+
+def pair_renames(deleted: Dict[Hashable, FrozenSet[int]],
+                 added: Dict[Hashable, FrozenSet[int]],
+                 threshold: float = RENAME_THRESHOLD) -> List[Tuple[Hashable, Hashable, float]]:
+    """삭제/추가 항목을 유사도 순으로 1:1 매칭 → [(삭제 키, 추가 키, 유사도)]"""
+    if not deleted or not added:
+        return []
+
+    index = LSHIndex()
+    for key, shingle_set in deleted.items():
+        index.add(key, minhash(shingle_set))
+
+    scored: List[Tuple[float, Hashable, Hashable]] = []
+    for new_key, new_set in added.items():
+        for old_key in index.candidates(minhash(new_set)):
+            score = jaccard(deleted[old_key], new_set)
+            if score >= threshold:
+                scored.append((score, old_key, new_key))
+
+    # 높은 유사도부터 탐욕적 매칭 (동점은 키 순서로 고정)
+    scored.sort(key=lambda x: (-x[0], str(x[1]), str(x[2])))
+    used_old: Set[Hashable] = set()
+    used_new: Set[Hashable] = set()
+    pairs = []
+    for score, old_key, new_key in scored:
+        if old_key in used_old or new_key in used_new:
+            continue
+        used_old.add(old_key)
+        used_new.add(new_key)
+        pairs.append((old_key, new_key, score))
+    return pairs
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+합성 TwinCAT 프로젝트 생성기
+실제 프로젝트 없이 벤치마크를 재현할 수 있도록 규모/이슈 밀도/중첩/대형 CASE 를 조절한 .TcPOU/.TcGVL/.TcDUT 트리 생성
+(같은 시드면 항상 같은 트리, 파일마다 독립 시드라 비교용 Target 트리도 일부 파일만 바꿔 생성)
+"""
+
+import json
+import random
+import shutil
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# 생성 조건 기록 파일 (같은 조건이면 기존 트리 재사용)
+SPEC_FILE = "synthetic_spec.json"
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """합성 프로젝트 생성 조건"""
+    files: int = 1000
+    issue_density: float = 0.1  # 위반 코드가 들어가는 구현부 문장 비율 (0~1)
+    lines_per_pou: int = 200  # POU 구현부 목표 라인 수
+    nesting_depth: int = 3  # 제어문 블록 최대 중첩 깊이
+    case_branches: int = 20  # 일반 CASE 분기 수
+    giant_case_ratio: float = 0.02  # 대형 CASE (분기 수 x50) 를 갖는 POU 비율
+    gvl_ratio: float = 0.05
+    dut_ratio: float = 0.15
+    folders: int = 20  # POU 를 나눠 담을 하위 폴더 수
+    seed: int = 42
+
+
+@dataclass
+class SyntheticProject:
+    """생성 결과 요약"""
+    root: str
+    files: int = 0
+    lines: int = 0
+    bytes: int = 0
+
+
+# === 코드 조각 ===
+
+# 규칙 위반 문장 (규칙 ID → 구현부 라인들)
+VIOLATIONS: Dict[str, Tuple[str, ...]] = {
+    'QA002': ("nValue{n} := DINT_TO_INT(nCounter{n});",),
+    'QA005': ("IF fActual{n} = fTarget{n} THEN", "    bEqual{n} := TRUE;", "END_IF"),
+    'QA006': ("fRatio{n} := fSum{n} / nCount{n};",),
+    'QA007': ("nLimit{n} := {big};",),
+    'QA010': ("tonDelay{n}(IN := bStart{n}, PT := T#{ms}MS);",),
+    'QA011': ("IF bFlag{n} THEN nState{n} := 1; ELSE; END_IF",),
+    'QA012': ("// TODO: 파라미터 튜닝 필요 ({n})",),
+    'QA013': ("// nOld{n} := nOld{n} + 1;",),
+}
+
+# 위반 없는 문장
+CLEAN_STATEMENTS = (
+    "nCounter{n} := nCounter{n} + 1;",
+    "bOutput{n} := bInput{n} AND NOT bFault{n};",
+    "fFiltered{n} := fFiltered{n} + (fRaw{n} - fFiltered{n}) * fGain;",
+    "// 상태 갱신 ({n})",
+    "nIndex{n} := MIN(nIndex{n} + 1, MAX_INDEX);",
+    "stData.bValid := bReady{n};",
+)
+
+# 선언부 변수 (정상, 위반 규칙 ID 또는 None)
+DECLARATIONS: Tuple[Tuple[str, Optional[str]], ...] = (
+    ("    nCounter{n} : INT := 0;", None),
+    ("    bReady{n} : BOOL := FALSE;", None),
+    ("    fGain{n} : REAL := 0.5;", None),
+    ("    tonDelay{n} : TON;", None),
+    ("    fSpeed{n} : REAL;", 'QA001'),
+    ("    aBuffer{n} : ARRAY[0..4999] OF INT;", 'QA003'),
+    ("    pData{n} : POINTER TO BYTE;", 'QA004'),
+    ("    counter{n} : INT := 0;", 'QA016'),
+)
+
+XML_HEAD = '<?xml version="1.0" encoding="utf-8"?>\n<TcPlcObject Version="1.1.0.1">\n'
+XML_TAIL = '</TcPlcObject>\n'
+
+
+def _guid(rng: random.Random) -> str:
+    value = '%032x' % rng.getrandbits(128)
+    return f"{{{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}}}"
+
+
+def _statement(rng: random.Random, spec: SyntheticSpec, n: int) -> List[str]:
+    """구현부 문장 하나 (issue_density 확률로 위반 문장)"""
+    if rng.random() < spec.issue_density:
+        lines = VIOLATIONS[rng.choice(sorted(VIOLATIONS))]
+    else:
+        lines = (rng.choice(CLEAN_STATEMENTS),)
+    return [line.format(n=n, big=rng.randint(100, 99999), ms=rng.randint(10, 5000)) for line in lines]
+
+
+def _block(rng: random.Random, spec: SyntheticSpec, depth: int, budget: int) -> List[str]:
+    """중첩 제어문 블록 (depth 단계까지 IF/FOR/WHILE 를 겹침)"""
+    lines: List[str] = []
+    indent = '    ' * depth
+    while len(lines) < budget:
+        n = rng.randint(0, 99)
+        if depth < spec.nesting_depth and rng.random() < 0.25:
+            inner = _block(rng, spec, depth + 1, max(2, budget // 3))
+            kind = rng.choice(('IF', 'FOR', 'WHILE'))
+            if kind == 'IF':
+                head, tail = f"IF bEnable{n} AND nCounter{n} > {rng.randint(0, 99)} THEN", "END_IF"
+            elif kind == 'FOR':
+                head, tail = f"FOR nIndex{n} := 0 TO MAX_INDEX DO", "END_FOR"
+            else:
+                head, tail = f"WHILE nIndex{n} < MAX_INDEX DO", "END_WHILE"
+            lines += [indent + head] + inner + [indent + tail]
+        else:
+            lines += [indent + line for line in _statement(rng, spec, n)]
+    return lines
+
+
+def _case(rng: random.Random, spec: SyntheticSpec, branches: int) -> List[str]:
+    """상태 머신 CASE 문"""
+    lines = ["CASE nStep OF"]
+    for branch in range(branches):
+        lines.append(f"    {branch}:")
+        lines += ['        ' + line for line in _statement(rng, spec, branch % 100)]
+        lines.append(f"        nStep := {(branch + 1) % branches};")
+    lines += ["ELSE", "    nStep := 0;", "END_CASE"]
+    return lines
+
+
+def _declaration_lines(rng: random.Random, spec: SyntheticSpec, count: int) -> List[str]:
+    """VAR 블록 변수 (issue_density 확률로 위반 선언)"""
+    clean = [decl for decl, rule in DECLARATIONS if rule is None]
+    violating = [decl for decl, rule in DECLARATIONS if rule is not None]
+    return [
+        (rng.choice(violating) if rng.random() < spec.issue_density else rng.choice(clean)).format(n=n)
+        for n in range(count)
+    ]
+
+
+def pou_xml(rng: random.Random, spec: SyntheticSpec, name: str) -> str:
+    """FUNCTION_BLOCK/PROGRAM POU 하나"""
+    pou_type = 'PROGRAM' if name.startswith('PRG_') else 'FUNCTION_BLOCK'
+    declaration = [
+        f"{pou_type} {name}",
+        "VAR_INPUT",
+        "    bEnable : BOOL;",
+        "END_VAR",
+        "VAR",
+        "    nStep : INT := 0;",
+        *_declaration_lines(rng, spec, rng.randint(10, 30)),
+        "END_VAR",
+        "VAR CONSTANT",
+        "    MAX_INDEX : INT := 9;",
+        "END_VAR",
+    ]
+    body = [f"// {name} 구현부", ""]
+    body += _case(rng, spec, spec.case_branches * (50 if rng.random() < spec.giant_case_ratio else 1))
+    body += _block(rng, spec, 0, max(spec.lines_per_pou - len(body), 1))
+    return (
+        XML_HEAD
+        + f'  <POU Name="{name}" Id="{_guid(rng)}" SpecialFunc="None">\n'
+        + '    <Declaration><![CDATA[\n' + '\n'.join(declaration) + '\n]]></Declaration>\n'
+        + '    <Implementation>\n      <ST><![CDATA[\n' + '\n'.join(body) + '\n]]></ST>\n    </Implementation>\n'
+        + '  </POU>\n'
+        + XML_TAIL
+    )
+
+
+def gvl_xml(rng: random.Random, spec: SyntheticSpec, name: str) -> str:
+    """전역 변수 목록 하나"""
+    declaration = ["{attribute 'qualified_only'}", "VAR_GLOBAL",
+                   *_declaration_lines(rng, spec, rng.randint(30, 80)), "END_VAR"]
+    return (
+        XML_HEAD
+        + f'  <GVL Name="{name}" Id="{_guid(rng)}">\n'
+        + '    <Declaration><![CDATA[\n' + '\n'.join(declaration) + '\n]]></Declaration>\n'
+        + '  </GVL>\n'
+        + XML_TAIL
+    )
+
+
+def dut_xml(rng: random.Random, spec: SyntheticSpec, name: str) -> str:
+    """열거형(E_) 또는 구조체(ST_) 하나"""
+    if name.startswith('E_'):
+        members = rng.randint(4, 20)
+        declaration = ["{attribute 'qualified_only'}", "{attribute 'strict'}", f"TYPE {name} :", "("]
+        declaration += [f"    STATE_{i} := {i}{',' if i < members - 1 else ''}" for i in range(members)]
+        declaration += [") := STATE_0;", "END_TYPE"]
+    else:
+        declaration = [f"TYPE {name} :", "STRUCT",
+                       *_declaration_lines(rng, spec, rng.randint(5, 25)), "END_STRUCT", "END_TYPE"]
+    return (
+        XML_HEAD
+        + f'  <DUT Name="{name}" Id="{_guid(rng)}">\n'
+        + '    <Declaration><![CDATA[\n' + '\n'.join(declaration) + '\n]]></Declaration>\n'
+        + '  </DUT>\n'
+        + XML_TAIL
+    )
+
+
+def file_plan(spec: SyntheticSpec) -> List[Tuple[str, str]]:
+    """파일 번호 순서의 (상대 경로, 종류) 목록"""
+    gvl_count = int(spec.files * spec.gvl_ratio)
+    dut_count = int(spec.files * spec.dut_ratio)
+    plan = []
+    for i in range(spec.files):
+        if i < gvl_count:
+            plan.append((f"GVLs/GVL_Module{i:05d}.TcGVL", 'GVL'))
+        elif i < gvl_count + dut_count:
+            prefix = 'E_State' if i % 2 else 'ST_Data'
+            plan.append((f"DUTs/{prefix}{i:05d}.TcDUT", 'DUT'))
+        else:
+            folder = i % max(spec.folders, 1)
+            prefix = 'PRG_' if i % 25 == 0 else 'FB_'
+            plan.append((f"POUs/Module{folder:03d}/{prefix}Unit{i:05d}.TcPOU", 'POU'))
+    return plan
+
+
+def render_file(spec: SyntheticSpec, rel_path: str, kind: str, seed_key: str) -> str:
+    """파일 하나 내용 (seed_key 로 파일별 독립 난수)"""
+    rng = random.Random(f"{spec.seed}:{seed_key}")
+    name = Path(rel_path).stem
+    if kind == 'POU':
+        return pou_xml(rng, spec, name)
+    if kind == 'GVL':
+        return gvl_xml(rng, spec, name)
+    return dut_xml(rng, spec, name)
+
+
+def _write(root: Path, rel_path: str, content: str, project: SyntheticProject):
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = content.encode('utf-8')
+    path.write_bytes(data)
+    project.files += 1
+    project.lines += content.count('\n')
+    project.bytes += len(data)
+
+
+def _reuse(root: Path, marker: Dict) -> Optional[SyntheticProject]:
+    """같은 조건으로 이미 생성된 트리면 그 요약, 다른 조건의 합성 트리면 지우고 None
+
+    생성 기록이 없는 비어 있지 않은 폴더는 실제 프로젝트일 수 있으므로 건드리지 않고 오류.
+    """
+    if not root.exists():
+        return None
+    try:
+        stored = json.loads((root / SPEC_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        if any(root.iterdir()):
+            raise ValueError(f"합성 프로젝트 폴더가 아닙니다 (비어 있지 않음): {root}")
+        return None
+    if stored.get('spec') == marker:
+        return SyntheticProject(str(root), **stored['project'])
+    shutil.rmtree(root)
+    return None
+
+
+def _save_marker(root: Path, marker: Dict, project: SyntheticProject):
+    summary = {'files': project.files, 'lines': project.lines, 'bytes': project.bytes}
+    (root / SPEC_FILE).write_text(json.dumps({'spec': marker, 'project': summary}, indent=2), encoding='utf-8')
+
+
+def generate_project(root, spec: SyntheticSpec = SyntheticSpec()) -> SyntheticProject:
+    """합성 프로젝트 생성 (같은 조건으로 만든 트리가 있으면 재사용)"""
+    root = Path(root)
+    marker = asdict(spec)
+    existing = _reuse(root, marker)
+    if existing:
+        return existing
+    project = SyntheticProject(str(root))
+    for index, (rel_path, kind) in enumerate(file_plan(spec)):
+        _write(root, rel_path, render_file(spec, rel_path, kind, str(index)), project)
+    _save_marker(root, marker, project)
+    return project
+
+
+def generate_revision(root, spec: SyntheticSpec = SyntheticSpec(), change_ratio: float = 0.1) -> SyntheticProject:
+    """비교용 Target 트리 - generate_project 트리에서 change_ratio 만큼 파일을 수정/삭제/이름 변경하고 새 파일 추가
+
+    변경 대상 중 10% 는 삭제, 10% 는 같은 내용으로 이름만 변경, 나머지는 내용 재생성.
+    """
+    root = Path(root)
+    marker = {**asdict(spec), 'change_ratio': change_ratio}
+    existing = _reuse(root, marker)
+    if existing:
+        return existing
+    project = SyntheticProject(str(root))
+    plan = file_plan(spec)
+    for index, (rel_path, kind) in enumerate(plan):
+        rng = random.Random(f"{spec.seed}:{index}:change")
+        if rng.random() >= change_ratio:
+            _write(root, rel_path, render_file(spec, rel_path, kind, str(index)), project)
+            continue
+        action = rng.random()
+        if action < 0.1:
+            continue
+        if action < 0.2:
+            path = Path(rel_path)
+            renamed = str(path.with_name(f"{path.stem}_Renamed{path.suffix}").as_posix())
+            _write(root, renamed, render_file(spec, rel_path, kind, str(index)), project)
+        else:
+            _write(root, rel_path, render_file(spec, rel_path, kind, f"{index}:rev"), project)
+    for extra in range(int(spec.files * change_ratio * 0.1)):
+        rel_path = f"POUs/Added/FB_Added{extra:05d}.TcPOU"
+        _write(root, rel_path, render_file(spec, rel_path, 'POU', f"added:{extra}"), project)
+    _save_marker(root, marker, project)
+    return project
+
+
+if __name__ == "__main__":
+    # 사용법: python synthetic_project.py <출력 폴더> [파일 수] [이슈 밀도]
+    if len(sys.argv) < 2:
+        print("사용법: python synthetic_project.py <출력 폴더> [파일 수] [이슈 밀도]")
+        sys.exit(1)
+
+    spec = SyntheticSpec(
+        files=int(sys.argv[2]) if len(sys.argv) > 2 else SyntheticSpec.files,
+        issue_density=float(sys.argv[3]) if len(sys.argv) > 3 else SyntheticSpec.issue_density,
+    )
+    project = generate_project(sys.argv[1], spec)
+    print(f"합성 프로젝트: {project.root} ({project.files}개 파일, {project.lines:,}줄, {project.bytes:,} bytes)")
@@ -14,8 +14,8 @@ from pathlib import Path
 
 # 상위 디렉토리의 분석 모듈 임포트
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from analyze_single_project import TwinCATSingleProjectAnalyzer
-from analyze_real_project import TwinCATProjectComparer
+from qa_api import API_VERSION, AnalysisSession
+from report_store import ReportStore, load_report_file, store_path_for, write_report_store
 
 app = Flask(__name__)
 app.config['JSON_AS_ASCII'] = False
@@ -24,6 +24,9 @@ app.config['JSON_AS_ASCII'] = False
 OUTPUT_DIR = Path(__file__).parent.parent / "output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# 프로세스 내 분석 세션 (프로젝트 인덱스/결과 캐시)
+session = AnalysisSession()
+
 
 @app.route('/')
 def index():
@@ -44,37 +47,43 @@ def analyze_single():
         if not os.path.exists(project_path):
             return jsonify({'success': False, 'error': f'경로가 존재하지 않습니다: {project_path}'})
 
-        # 분석 실행
-        analyzer = TwinCATSingleProjectAnalyzer(project_path)
-        report = analyzer.analyze()
+        # 분석 실행 (세션 캐시 사용, profile_rules 면 규칙별 시간까지 측정)
+        result = session.analyze_project(project_path, bool(data.get('profile_rules')))
 
         # 결과 저장
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         json_path = OUTPUT_DIR / f"single_analysis_{timestamp}.json"
+        report = result.to_dict()
         with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        write_report_store(report, store_path_for(json_path))
 
         # 요약 정보 생성
+        s = result.summary
         summary = {
             'success': True,
+            'api_version': API_VERSION,
             'analysis_type': 'single',
             'project_path': project_path,
-            'timestamp': report['timestamp'],
+            'timestamp': result.generated_at,
             'summary': {
-                'total_files': report['summary']['total_files'],
-                'pou_count': report['summary']['pou_count'],
-                'gvl_count': report['summary']['gvl_count'],
-                'dut_count': report['summary']['dut_count'],
-                'total_lines': report['summary']['total_lines'],
-                'total_issues': report['summary']['total_issues'],
-                'critical_count': report['summary']['critical_count'],
-                'warning_count': report['summary']['warning_count'],
-                'info_count': report['summary']['info_count'],
+                'total_files': s.total_files,
+                'pou_count': s.pou_count,
+                'gvl_count': s.gvl_count,
+                'dut_count': s.dut_count,
+                'total_lines': s.total_lines,
+                'total_issues': s.issues.total,
+                'critical_count': s.issues.critical,
+                'warning_count': s.issues.warning,
+                'info_count': s.issues.info,
             },
-            'issues_by_category': report['issues_by_category'],
-            'issues_by_rule': report['issues_by_rule'],
-            'critical_issues': report['issues'][:100],  # 상위 100개만
-            'high_complexity_files': report['files'][:20],  # 복잡도 높은 파일 20개
+            'issues_by_category': result.issues_by_category,
+            'issues_by_rule': result.issues_by_rule,
+            'critical_issues': result.critical_issues(100),  # 상위 100개만
+            'high_complexity_files': result.most_complex_files(20),  # 복잡도 높은 파일 20개
+            'profile': result.profile,  # 단계/규칙/느린 파일별 분석 시간
+            'skipped_checks': result.skipped_checks[:100],  # 건너뛴 검사 100개
+            'discovery': result.discovery,  # 파일 목록 출처 (plcproj Compile 항목/폴더 탐색)
             'result_file': str(json_path)
         }
 
@@ -101,37 +110,43 @@ def analyze_compare():
         if not os.path.exists(target_path):
             return jsonify({'success': False, 'error': f'Target 경로가 존재하지 않습니다: {target_path}'})
 
-        # 비교 분석 실행
-        comparer = TwinCATProjectComparer(source_path, target_path)
-        report = comparer.compare()
+        # 비교 분석 실행 (세션 캐시 사용 - 변경된 파일만 다시 인덱싱)
+        result = session.compare_projects(source_path, target_path)
 
         # 결과 저장
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         json_path = OUTPUT_DIR / f"compare_analysis_{timestamp}.json"
+        report = result.to_dict()
         with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        write_report_store(report, store_path_for(json_path))
 
         # 요약 정보 생성
+        s = result.summary
         summary = {
             'success': True,
+            'api_version': API_VERSION,
             'analysis_type': 'compare',
             'source_path': source_path,
             'target_path': target_path,
-            'timestamp': report['timestamp'],
+            'timestamp': result.generated_at,
             'summary': {
-                'total_changes': report['summary']['total_changes'],
-                'added_files': report['summary']['added_files'],
-                'deleted_files': report['summary']['deleted_files'],
-                'modified_files': report['summary']['modified_files'],
-                'variable_changes': report['summary']['variable_changes'],
-                'total_issues': report['summary']['total_issues'],
-                'critical_count': report['summary']['critical_count'],
-                'warning_count': report['summary']['warning_count'],
-                'info_count': report['summary']['info_count'],
+                'total_changes': s.total_changes,
+                'added_files': s.added_files,
+                'deleted_files': s.deleted_files,
+                'modified_files': s.modified_files,
+                'renamed_files': s.renamed_files,
+                'variable_changes': s.variable_changes,
+                'total_issues': s.issues.total,
+                'critical_count': s.issues.critical,
+                'warning_count': s.issues.warning,
+                'info_count': s.issues.info,
             },
-            'file_changes': report['file_changes'][:50],  # 변경 파일 50개
-            'variable_changes': report['variable_changes'][:30],  # 변수 변경 30개
-            'qa_issues': report['qa_issues'][:100],  # QA 이슈 100개
+            'file_changes': result.file_changes[:50],  # 변경 파일 50개
+            'variable_changes': result.variable_changes[:30],  # 변수 변경 30개
+            'qa_issues': result.qa_issues[:100],  # QA 이슈 100개
+            'profile': result.profile,  # 단계별 분석 시간
+            'skipped_checks': result.skipped_checks[:100],  # 건너뛴 검사 100개
             'result_file': str(json_path)
         }
 
@@ -216,15 +231,42 @@ def get_history():
 
 @app.route('/api/report/<filename>')
 def get_report(filename):
-    """저장된 리포트 조회"""
+    """저장된 리포트 조회
+
+    쿼리 파라미터 (.tcqa 가 있을 때 해당 부분만 읽음):
+    - table: 테이블 하나의 행만 반환 (issues, files, file_changes, variable_changes, qa_issues)
+    - columns: 쉼표로 구분한 컬럼 목록
+    - offset, limit: 행 범위
+    """
     try:
         file_path = OUTPUT_DIR / filename
-        if not file_path.exists():
+        store_path = store_path_for(file_path)
+        if not file_path.exists() and not store_path.exists():
             return jsonify({'success': False, 'error': '파일을 찾을 수 없습니다.'})
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
+        table = request.args.get('table')
+        columns = request.args.get('columns')
+        columns = columns.split(',') if columns else None
+
+        if table:
+            offset = request.args.get('offset', 0, type=int)
+            limit = request.args.get('limit', 100, type=int)
+            if store_path.exists():
+                with ReportStore(store_path) as store:
+                    if table not in store.tables:
+                        return jsonify({'success': False, 'error': f'테이블이 없습니다: {table}'})
+                    total = store.row_count(table)
+                    rows = list(store.rows(table, columns, offset, offset + limit))
+            else:
+                all_rows = load_report_file(file_path).get(table, [])
+                total = len(all_rows)
+                rows = [
+                    {k: v for k, v in row.items() if columns is None or k in columns}
+                    for row in all_rows[offset:offset + limit]
+                ]
+            return jsonify({'success': True, 'table': table, 'total': total, 'offset': offset, 'rows': rows})
+
+        data = load_report_file(file_path)
         return jsonify({'success': True, 'data': data})
 
     except Exception as e: